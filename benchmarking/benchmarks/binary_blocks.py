@@ -0,0 +1,71 @@
+"""
+This module contains code used for benchmarking the transfer of binary
+blocks of data to and from VISA instruments. The instrument is simulated by
+a handle that keeps the bytes in memory, so that the benchmarks measure the
+overhead of QCoDeS and not of the VISA backend.
+"""
+import numpy as np
+
+from qcodes.instrument.visa import VisaInstrument, binary_block_header
+
+
+class MemoryVisaHandle:
+    """
+    The part of the API of a pyvisa resource that is used for binary
+    blocks, reading from ``response`` and discarding what is written
+    """
+    read_termination = ''
+
+    def __init__(self):
+        self.response = memoryview(b'')
+        self.timeout = None
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+    def write_raw(self, message):
+        return len(message)
+
+    def read_bytes(self, count):
+        data = bytes(self.response[:count])
+        self.response = self.response[count:]
+        return data
+
+
+class MemoryVisaInstrument(VisaInstrument):
+    def set_address(self, address):
+        self.visa_handle = MemoryVisaHandle()
+
+
+class BinaryBlock:
+    """
+    This benchmark measures how long it takes to write and read arrays of
+    float32 values as IEEE 488.2 binary blocks.
+    """
+
+    params = [10**3, 10**5, 10**7]
+    param_names = ['n_values']
+
+    def setup(self, n_values):
+        self.instr = MemoryVisaInstrument(f'memory_visa_{n_values}')
+        self.data = np.random.rand(n_values).astype('<f4')
+        self.block = binary_block_header(self.data.nbytes) + \
+            self.data.tobytes()
+        self.out = np.empty(n_values, dtype='<f4')
+
+    def teardown(self, n_values):
+        self.instr.close()
+
+    def time_write(self, n_values):
+        self.instr.write_binary_block('DATA ', self.data)
+
+    def time_read(self, n_values):
+        self.instr.visa_handle.response = memoryview(self.block)
+        self.instr.read_binary_block('<f4')
+
+    def time_read_into_out(self, n_values):
+        self.instr.visa_handle.response = memoryview(self.block)
+        self.instr.read_binary_block('<f4', out=self.out)
@@ -0,0 +1,43 @@
+"""
+This module contains code used for benchmarking storing the data of a
+Loop in the arrays of a legacy DataSet.
+"""
+from qcodes.data.data_array import DataArray
+from qcodes.data.data_set import new_data
+
+
+class StoreData:
+    """
+    This benchmark measures how long it takes to store a 2D sweep in a
+    DataSet, one point at a time and one row of the inner loop at a time
+    """
+
+    params = [(10, 100), (100, 1000)]
+    param_names = ['shape']
+
+    def setup(self, shape):
+        x = DataArray(name='x', shape=shape[:1], is_setpoint=True)
+        y = DataArray(name='y', shape=shape, is_setpoint=True,
+                      set_arrays=(x,))
+        z = DataArray(name='z', shape=shape, set_arrays=(x, y))
+        self.data = new_data(arrays=(x, y, z), location=False)
+        self.data.write_period = None
+        for array in self.data.arrays.values():
+            array.init_data()
+        self.row = [float(j) for j in range(shape[1])]
+
+    def time_store(self, shape):
+        store = self.data.store
+        for i in range(shape[0]):
+            store((i,), {'x_set': i})
+            for j in range(shape[1]):
+                store((i, j), {'y_set': j, 'z': i * j})
+
+    def time_store_block(self, shape):
+        data = self.data
+        for i in range(shape[0]):
+            data.store((i,), {'x_set': i})
+            data.store_block((i,), 0, {'y_set': self.row, 'z': self.row})
+
+    def time_get_changes(self, shape):
+        self.data.arrays['z'].get_changes(-1)
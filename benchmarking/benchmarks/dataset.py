@@ -4,16 +4,31 @@ database used under the QCoDeS dataset.
 """
 import shutil
 import tempfile
+import itertools
 import os
+import threading
 import time
 
+import matplotlib.pyplot as plt
 import numpy as np
 
 import qcodes
 from qcodes import ManualParameter
+from qcodes.dataset.data_set import DataSet, load_by_id
 from qcodes.dataset.measurements import Measurement
 from qcodes.dataset.experiment_container import new_experiment
 from qcodes.dataset.database import initialise_database
+from qcodes.dataset.data_export import (datatype_from_setpoints_2d,
+                                        get_shaped_data_by_runid,
+                                        reshape_2D_data)
+from qcodes.dataset.hdf5_exporter import export_to_hdf5
+from qcodes.dataset.plotting import plot_by_id
+from qcodes.dataset.guids import generate_guid
+from qcodes.dataset.param_spec import ParamSpec
+import qcodes.dataset.sqlite_base as sqlite_base
+from qcodes.dataset.sqlite_base import (_adapt_array, _convert_array,
+                                        _adapt_array_npy, _convert_array_npy,
+                                        connect)
 
 
 class Adding5Params:
@@ -129,3 +144,360 @@ class Adding5Params:
         # force writing to database so that it is written before we exit
         # the datasaver context manager
         self.datasaver.flush_data_to_database()
+
+    def time_test_columnar(self, bench_param):
+        """Adding data for 5 parameters directly as columns to the dataset"""
+        if bench_param['paramtype'] == 'array':
+            columns = {str(param): [values] for param, values
+                       in zip(self.parameters, self.values)}
+        else:
+            columns = {str(param): values for param, values
+                       in zip(self.parameters, self.values)}
+        for _ in range(bench_param['n_times']):
+            self.datasaver.dataset.add_results_columnar(columns)
+
+
+class ArrayCodec:
+    """
+    This benchmark compares the legacy .npy array blob format with the
+    compact array blob format used to store arrays in the database.
+    """
+
+    codecs = {'npy': (_adapt_array_npy, _convert_array_npy),
+              'compact': (_adapt_array, _convert_array)}
+
+    params = (['npy', 'compact'], [10000, 100000])
+    param_names = ['codec', 'n_values']
+
+    def setup(self, codec, n_values):
+        self.adapt, self.convert = self.codecs[codec]
+        self.array = np.random.rand(n_values)
+        self.blob = bytes(self.adapt(self.array))
+
+    def time_adapt(self, codec, n_values):
+        self.adapt(self.array)
+
+    def time_convert(self, codec, n_values):
+        self.convert(self.blob)
+
+
+class LoadingData:
+    """
+    This benchmark measures how much time it takes to load the data of a run
+    from the experiment database, comparing the list of lists returned by
+    `get_data` with the numpy arrays returned by `get_data_as_arrays`.
+    """
+
+    params = [10000, 1000000]
+    param_names = ['n_values']
+
+    timer = time.perf_counter
+
+    def setup(self, n_values):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        x = ManualParameter('x')
+        y = ManualParameter('y')
+        meas.register_parameter(x)
+        meas.register_parameter(y, setpoints=[x])
+
+        with meas.run() as datasaver:
+            datasaver.add_result((x, np.linspace(0, 1, n_values)),
+                                 (y, np.random.rand(n_values)))
+        self.dataset = datasaver.dataset
+
+    def teardown(self, n_values):
+        self.dataset.conn.close()
+        self.experiment.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def time_get_data(self, n_values):
+        self.dataset.get_data('x', 'y')
+
+    def time_get_data_as_arrays(self, n_values):
+        self.dataset.get_data_as_arrays('x', 'y')
+
+
+class ReadWhileWrite:
+    """
+    This benchmark measures how long it takes to load the data of a
+    completed run a number of times while another thread keeps adding
+    results to a new run in the same database through its own connection,
+    as happens when a notebook plots data while a measurement is running.
+    The journal mode of the connection profile is varied.
+    """
+
+    number = 1
+    repeat = 5
+
+    params = (['DELETE', 'WAL'], [20])
+    param_names = ['journal_mode', 'n_reads']
+
+    timer = time.perf_counter
+
+    n_writes = 200
+    batch_size = 1000
+
+    def setup(self, journal_mode, n_reads):
+        self._old_journal_mode = \
+            qcodes.config["core"]["db_connection"]["journal_mode"]
+        qcodes.config["core"]["db_connection"]["journal_mode"] = journal_mode
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        x = ManualParameter('x')
+        y = ManualParameter('y')
+        meas.register_parameter(x)
+        meas.register_parameter(y, setpoints=[x])
+
+        with meas.run() as datasaver:
+            datasaver.add_result((x, np.arange(100000)),
+                                 (y, np.random.rand(100000)))
+        self.read_run_id = datasaver.run_id
+        with meas.run() as datasaver:
+            pass
+        self.write_run_id = datasaver.run_id
+        self.columns = {'x': np.arange(self.batch_size),
+                        'y': np.random.rand(self.batch_size)}
+
+    def teardown(self, journal_mode, n_reads):
+        self.experiment.conn.close()
+        shutil.rmtree(self.tmpdir)
+        qcodes.config["core"]["db_connection"]["journal_mode"] = \
+            self._old_journal_mode
+
+    def _write(self):
+        conn = connect(qcodes.config["core"]["db_location"])
+        dataset = DataSet(run_id=self.write_run_id, conn=conn)
+        for _ in range(self.n_writes):
+            dataset.add_results_columnar(self.columns)
+        conn.close()
+
+    def time_read_while_write(self, journal_mode, n_reads):
+        writer = threading.Thread(target=self._write)
+        writer.start()
+        for _ in range(n_reads):
+            dataset = load_by_id(self.read_run_id, read_only=True)
+            dataset.get_data_as_arrays('x', 'y')
+            dataset.conn.close()
+        writer.join()
+
+
+class MetadataLookups:
+    """
+    This benchmark measures the lookups of the layout, dependencies and
+    metadata of a run in a database with many runs. The database is
+    compared before (version 4) and after (version 5) the upgrade that
+    indexes these lookups.
+    """
+
+    params = ([4, 5], [50000])
+    param_names = ['db_version', 'n_runs']
+
+    timer = time.perf_counter
+
+    def setup_cache(self):
+        paths = {}
+        for db_version in self.params[0]:
+            path = os.path.abspath(f'lookups_v{db_version}.db')
+            conn = connect(path, version=db_version)
+            self._fill_database(conn, self.params[1][0])
+            conn.close()
+            paths[db_version] = path
+        return paths
+
+    @staticmethod
+    def _fill_database(conn, n_runs):
+        """
+        Insert n_runs synthetic runs (without results tables) with four
+        parameters each, followed by one proper run with results
+        """
+        exp_id = sqlite_base.new_experiment(conn, 'test-experiment',
+                                            'test-sample')
+        runs = [(exp_id, 'synthetic', f'synthetic-{n}', n, 'x,t,y,z')
+                for n in range(n_runs)]
+        layouts = [(n + 1, param, param, '', '')
+                   for n in range(n_runs) for param in ('x', 't', 'y', 'z')]
+        dependencies = []
+        for n in range(n_runs):
+            x, t, y, z = (4 * n + i for i in range(1, 5))
+            dependencies += [(y, x, 0), (y, t, 1), (z, x, 0)]
+        with sqlite_base.atomic(conn) as atomic_conn:
+            atomic_conn.executemany(
+                "INSERT INTO runs (exp_id, name, result_table_name, "
+                "result_counter, parameters) VALUES (?, ?, ?, ?, ?)", runs)
+            atomic_conn.executemany(
+                "INSERT INTO layouts (run_id, parameter, label, unit, "
+                "inferred_from) VALUES (?, ?, ?, ?, ?)", layouts)
+            atomic_conn.executemany(
+                "INSERT INTO dependencies (dependent, independent, axis_num) "
+                "VALUES (?, ?, ?)", dependencies)
+
+        x = ParamSpec('x', 'numeric')
+        t = ParamSpec('t', 'numeric')
+        y = ParamSpec('y', 'numeric', depends_on=['x', 't'])
+        _, run_id, table_name = sqlite_base.create_run(
+            conn, exp_id, 'target', generate_guid(), parameters=[x, t, y])
+        sqlite_base.insert_many_columns(conn, table_name,
+                                        {'x': np.arange(100),
+                                         't': np.arange(100),
+                                         'y': np.random.rand(100)})
+
+    def setup(self, paths, db_version, n_runs):
+        self.conn = connect(paths[db_version], version=db_version)
+        # the proper run is inserted after the synthetic ones
+        self.run_id = n_runs + 1
+        self.table_name = sqlite_base.select_one_where(
+            self.conn, 'runs', 'result_table_name', 'run_id', self.run_id)
+        self.layout_id = sqlite_base.get_layout_id(self.conn, 'y',
+                                                   self.run_id)
+        self.new_parameters = (ParamSpec(f'p{n}', 'numeric')
+                               for n in itertools.count())
+
+    def teardown(self, paths, db_version, n_runs):
+        self.conn.close()
+
+    def time_get_layout_id(self, paths, db_version, n_runs):
+        sqlite_base.get_layout_id(self.conn, 'y', self.run_id)
+
+    def time_get_dependents(self, paths, db_version, n_runs):
+        sqlite_base.get_dependents(self.conn, self.run_id)
+
+    def time_get_dependencies(self, paths, db_version, n_runs):
+        sqlite_base.get_dependencies(self.conn, self.layout_id)
+
+    def time_get_parameters(self, paths, db_version, n_runs):
+        sqlite_base.get_parameters(self.conn, self.run_id)
+
+    def time_get_setpoints(self, paths, db_version, n_runs):
+        sqlite_base.get_setpoints(self.conn, self.table_name, 'y')
+
+    def time_get_metadata(self, paths, db_version, n_runs):
+        sqlite_base.get_metadata(self.conn, 'run_timestamp', self.table_name)
+
+    def time_add_parameter(self, paths, db_version, n_runs):
+        sqlite_base.add_parameter(self.conn, self.table_name,
+                                  next(self.new_parameters))
+
+
+class Shaping2DData:
+    """
+    This benchmark measures how much time it takes to detect the type of a
+    2D grid of setpoints and to sort its data onto the grid, both for the
+    setpoints of a nested sweep and for the same setpoints in random order,
+    and to get the shaped data of such a run from the database and plot it.
+    """
+
+    params = ([1000], ['nested', 'shuffled'])
+    param_names = ['n_points_per_axis', 'order']
+
+    timer = time.perf_counter
+
+    def setup(self, n_points_per_axis, order):
+        x, y = np.meshgrid(np.linspace(0, 1, n_points_per_axis),
+                           np.linspace(-1, 1, n_points_per_axis),
+                           indexing='ij')
+        self.x = x.ravel()
+        self.y = y.ravel()
+        self.z = np.random.rand(self.x.size)
+        if order == 'shuffled':
+            permutation = np.random.permutation(self.x.size)
+            self.x = self.x[permutation]
+            self.y = self.y[permutation]
+
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        x_param = ManualParameter('x')
+        y_param = ManualParameter('y')
+        z_param = ManualParameter('z')
+        meas.register_parameter(x_param)
+        meas.register_parameter(y_param)
+        meas.register_parameter(z_param, setpoints=[x_param, y_param])
+
+        with meas.run() as datasaver:
+            datasaver.add_result((x_param, self.x), (y_param, self.y),
+                                 (z_param, self.z))
+        self.run_id = datasaver.run_id
+
+    def teardown(self, n_points_per_axis, order):
+        plt.close('all')
+        self.experiment.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def time_datatype_from_setpoints_2d(self, n_points_per_axis, order):
+        datatype_from_setpoints_2d(self.x, self.y)
+
+    def time_reshape_2D_data(self, n_points_per_axis, order):
+        reshape_2D_data(self.x, self.y, self.z)
+
+    def time_get_shaped_data_by_runid(self, n_points_per_axis, order):
+        get_shaped_data_by_runid(self.run_id)
+
+    def time_plot_by_id(self, n_points_per_axis, order):
+        plot_by_id(self.run_id)
+
+
+class ExportingData:
+    """
+    This benchmark measures the time and the peak memory it takes to export
+    a run from the experiment database to an HDF5 file in chunks of rows.
+    """
+
+    params = [100000, 1000000]
+    param_names = ['n_values']
+
+    timer = time.perf_counter
+
+    def setup(self, n_values):
+        self.tmpdir = tempfile.mkdtemp()
+        qcodes.config["core"]["db_location"] = os.path.join(self.tmpdir,
+                                                            'temp.db')
+        qcodes.config["core"]["db_debug"] = False
+        initialise_database()
+        self.experiment = new_experiment("test-experiment",
+                                         sample_name="test-sample")
+
+        meas = Measurement(self.experiment)
+        x = ManualParameter('x')
+        y = ManualParameter('y')
+        meas.register_parameter(x)
+        meas.register_parameter(y, setpoints=[x])
+
+        with meas.run() as datasaver:
+            datasaver.add_result((x, np.linspace(0, 1, n_values)),
+                                 (y, np.random.rand(n_values)))
+        self.dataset = datasaver.dataset
+        self.path = os.path.join(self.tmpdir, 'export.h5')
+
+    def teardown(self, n_values):
+        self.dataset.conn.close()
+        self.experiment.conn.close()
+        shutil.rmtree(self.tmpdir)
+
+    def time_export_to_hdf5(self, n_values):
+        export_to_hdf5(self.dataset, self.path)
+        os.remove(self.path)
+
+    def peakmem_export_to_hdf5(self, n_values):
+        export_to_hdf5(self.dataset, self.path)
+        os.remove(self.path)
@@ -0,0 +1,59 @@
+"""
+This module contains code used for benchmarking writing and reading the
+files of the legacy DataSet with the GNUPlotFormat.
+"""
+import shutil
+import tempfile
+
+import numpy as np
+
+from qcodes.data.data_array import DataArray
+from qcodes.data.data_set import new_data, load_data
+from qcodes.data.gnuplot_format import GNUPlotFormat
+from qcodes.data.io import DiskIO
+
+
+def _make_arrays(shape):
+    x = DataArray(name='x', array_id='x_set', label='X', is_setpoint=True,
+                  preset_data=np.linspace(0, 1, shape[0]))
+    y = DataArray(name='y', array_id='y_set', label='Y', is_setpoint=True,
+                  set_arrays=(x,),
+                  preset_data=np.tile(np.linspace(-1, 1, shape[1]),
+                                      (shape[0], 1)))
+    z = DataArray(name='z', array_id='z', label='Z', set_arrays=(x, y),
+                  preset_data=np.random.rand(*shape))
+    return [x, y, z]
+
+
+class GNUPlotFormatBench:
+    """
+    This benchmark measures how long it takes to write and read a 2D sweep
+    """
+
+    params = [(10, 10), (100, 100), (1000, 1000)]
+    param_names = ['shape']
+    timeout = 300
+
+    def setup(self, shape):
+        self.tmpdir = tempfile.mkdtemp()
+        self.io = DiskIO(self.tmpdir)
+        self.formatter = GNUPlotFormat()
+        self.data = new_data(arrays=_make_arrays(shape), location='written',
+                             io=self.io, formatter=self.formatter)
+        saved = new_data(arrays=_make_arrays(shape), location='saved',
+                         io=self.io, formatter=self.formatter)
+        self.formatter.write(saved, self.io, 'saved', write_metadata=False)
+
+    def teardown(self, shape):
+        shutil.rmtree(self.tmpdir)
+
+    def time_write(self, shape):
+        # mark all data as unsaved, as if it was just measured
+        self.io.remove_all('written')
+        for array in self.data.arrays.values():
+            array.clear_save()
+        self.formatter.write(self.data, self.io, 'written', force_write=True,
+                             write_metadata=False)
+
+    def time_read(self, shape):
+        load_data(location='saved', io=self.io, formatter=self.formatter)
@@ -0,0 +1,45 @@
+"""
+This module contains code used for benchmarking writing the files of the
+legacy DataSet with the HDF5Format while a sweep is running.
+"""
+import shutil
+import tempfile
+
+import numpy as np
+
+from qcodes.data.data_array import DataArray
+from qcodes.data.data_set import new_data
+from qcodes.data.hdf5_format import HDF5Format
+from qcodes.data.io import DiskIO
+
+
+class HDF5FormatIncrementalWrite:
+    """
+    This benchmark measures how long it takes to store a 2D sweep with the
+    HDF5Format, writing the data after every row of the inner loop
+    """
+
+    params = [[(10, 100), (100, 100), (300, 300)], [None, 'gzip']]
+    param_names = ['shape', 'compression']
+    timeout = 300
+
+    def setup(self, shape, compression):
+        self.tmpdir = tempfile.mkdtemp()
+        self.io = DiskIO(self.tmpdir)
+        self.formatter = HDF5Format(compression=compression)
+        self.rows = np.random.rand(*shape)
+        self.n_writes = 0
+
+    def teardown(self, shape, compression):
+        shutil.rmtree(self.tmpdir)
+
+    def time_write_per_row(self, shape, compression):
+        z = DataArray(name='z', array_id='z', shape=shape)
+        z.init_data()
+        self.n_writes += 1
+        data = new_data(arrays=[z], location='written{}'.format(self.n_writes),
+                        io=self.io, formatter=self.formatter)
+        for i, row in enumerate(self.rows):
+            z[i] = row
+            self.formatter.write(data, write_metadata=False)
+        self.formatter.close_file(data)
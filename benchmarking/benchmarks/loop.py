@@ -0,0 +1,31 @@
+"""
+This module contains code used for benchmarking the overhead per point of
+running a legacy Loop, with parameters that do not talk to any hardware.
+"""
+from qcodes.instrument.parameter import ManualParameter
+from qcodes.loops import Loop
+
+
+class LoopOverhead:
+    """
+    This benchmark measures how long it takes to run a 1D and a 2D Loop
+    that measures a number of ManualParameters at every point, without
+    saving the data to disk
+    """
+
+    params = [[(1000,), (10, 100), (100, 100)], [1, 5]]
+    param_names = ['shape', 'n_measured']
+
+    def setup(self, shape, n_measured):
+        setpoints = [ManualParameter('x{}'.format(i), initial_value=0)
+                     for i in range(len(shape))]
+        measured = [ManualParameter('m{}'.format(i), initial_value=i)
+                    for i in range(n_measured)]
+
+        loop = Loop(setpoints[0].sweep(0, 1, num=shape[0]))
+        for param, num in zip(setpoints[1:], shape[1:]):
+            loop = loop.loop(param.sweep(0, 1, num=num))
+        self.loop = loop.each(*measured)
+
+    def time_run(self, shape, n_measured):
+        self.loop.run(location=False, quiet=True, station=False)
@@ -0,0 +1,63 @@
+"""
+This module contains code used for benchmarking the overhead of getting and
+setting QCoDeS parameters, as in software-timed sweeps.
+"""
+from qcodes.instrument.parameter import Parameter
+
+
+class GetSetParameter:
+    """
+    This benchmark measures how long it takes to get and set a parameter
+    that does not talk to any hardware, for parameters with and without a
+    transformation between values and raw values.
+    """
+
+    # number of gets or sets per benchmark call
+    n_calls = 10000
+
+    params = ['plain', 'scaled', 'parsed', 'mapped']
+    param_names = ['transform']
+
+    def setup(self, transform):
+        raw_values = {'plain': 0.5, 'scaled': 0.5, 'parsed': '0.5',
+                      'mapped': 1}
+        kwargs = {'plain': {},
+                  'scaled': {'scale': 10, 'offset': 0.1},
+                  'parsed': {'get_parser': float, 'set_parser': str},
+                  'mapped': {'val_mapping': {'off': 0, 'on': 1}}}[transform]
+        raw_value = raw_values[transform]
+        self.value = 'on' if transform == 'mapped' else 0.5
+
+        self.manual = Parameter('manual', set_cmd=None, get_cmd=None,
+                                initial_value=self.value, **kwargs)
+        self.instrument_like = Parameter('instrument_like',
+                                         set_cmd=lambda value: None,
+                                         get_cmd=lambda: raw_value,
+                                         **kwargs)
+
+    def time_get_manual(self, transform):
+        get = self.manual.get
+        for _ in range(self.n_calls):
+            get()
+
+    def time_set_manual(self, transform):
+        set_ = self.manual.set
+        value = self.value
+        for _ in range(self.n_calls):
+            set_(value)
+
+    def time_get(self, transform):
+        get = self.instrument_like.get
+        for _ in range(self.n_calls):
+            get()
+
+    def time_set(self, transform):
+        set_ = self.instrument_like.set
+        value = self.value
+        for _ in range(self.n_calls):
+            set_(value)
+
+    def time_get_latest(self, transform):
+        get_latest = self.manual.get_latest
+        for _ in range(self.n_calls):
+            get_latest()
@@ -0,0 +1,41 @@
+"""
+This module contains code used for benchmarking the overhead of evaluating
+callables in parallel with ``thread_map``, as done at every point of a
+threaded loop, compared to starting a new thread per callable.
+"""
+from qcodes.utils.threading import RespondingThread, thread_map
+
+
+def _thread_map_with_new_threads(callables):
+    # how thread_map worked before it had a pool of threads
+    threads = [RespondingThread(target=c) for c in callables]
+    for t in threads:
+        t.start()
+    return [t.output() for t in threads]
+
+
+class ThreadMap:
+    """
+    This benchmark measures how long it takes to evaluate a number of
+    trivial callables in parallel, which is the overhead per point of a
+    loop that gets that many parameters with threads.
+    """
+
+    # number of thread_map calls per benchmark call, i.e. loop points
+    n_points = 100
+
+    params = [1, 4, 16]
+    param_names = ['n_callables']
+
+    def setup(self, n_callables):
+        self.callables = [lambda: 0] * n_callables
+        # start the pool outside of the timing
+        thread_map(self.callables)
+
+    def time_thread_map(self, n_callables):
+        for _ in range(self.n_points):
+            thread_map(self.callables)
+
+    def time_new_threads(self, n_callables):
+        for _ in range(self.n_points):
+            _thread_map_with_new_threads(self.callables)
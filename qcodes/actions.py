@@ -2,14 +2,16 @@
 import time
 
 from qcodes.utils.helpers import is_function
-from qcodes.utils.threading import thread_map
+from qcodes.utils.threading import get_concurrently
+from qcodes.utils.timing import sleep_until
 
 
 _NO_SNAPSHOT = {'type': None, 'description': 'Action without snapshot'}
 
 
-# exception when threading is attempted used to simultaneously
-# query the same instrument for several values
+# exception that was raised when threading was attempted to simultaneously
+# query the same instrument for several values. Instruments now take turns
+# in their worker threads, but the exception is kept for compatibility.
 class UnsafeThreadingException(Exception):
     pass
 
@@ -89,7 +91,7 @@ class Wait:
 
     def __call__(self):
         if self.delay:
-            time.sleep(self.delay)
+            sleep_until(time.perf_counter() + self.delay)
 
     def snapshot(self, update=False):
         """
@@ -111,21 +113,19 @@ class _Measure:
     """
     def __init__(self, params_indices, data_set, use_threads):
         self.use_threads = use_threads and len(params_indices) > 1
-        # the applicable DataSet.store function
-        self.store = data_set.store
+        # called after the values of a point are stored in the arrays
+        self.stored = data_set._stored
 
         # for performance, pre-calculate which params return data for
-        # multiple arrays, and the name mappings
+        # multiple arrays, and the arrays the values are stored in
+        self.params = [param for param, _ in params_indices]
         self.getters = []
         self.param_ids = []
         self.composite = []
-        paramcheck = []  # list to check if parameters are unique
+        self.arrays = []
         for param, action_indices in params_indices:
             self.getters.append(param.get)
 
-            if param._instrument:
-                paramcheck.append((param, param._instrument))
-
             if hasattr(param, 'names'):
                 part_ids = []
                 for i in range(len(param.names)):
@@ -133,38 +133,66 @@ class _Measure:
                     part_ids.append(param_id)
                 self.param_ids.append(None)
                 self.composite.append(part_ids)
+                self.arrays.append([data_set.arrays[part_id]
+                                    for part_id in part_ids])
             else:
                 param_id = data_set.action_id_map[action_indices]
                 self.param_ids.append(param_id)
                 self.composite.append(False)
+                self.arrays.append(data_set.arrays[param_id])
 
-        if self.use_threads:
-            insts = [p[1] for p in paramcheck]
-            if (len(set(insts)) != len(insts)):
-                duplicates = [p for p in paramcheck if insts.count(p[1]) > 1]
-                raise UnsafeThreadingException('Can not use threading to '
-                                               'read '
-                                               'several things from the same '
-                                               'instrument. Specifically, you '
-                                               'asked for'
-                                               ' {}.'.format(duplicates))
+        # parameters of the same instrument that it can answer with one
+        # compound query are read together, in place of the first of them
+        self.batches = {} if self.use_threads else _find_batches(self.params)
+        self.batched = {j for _, indices, _ in self.batches.values()
+                        for j in indices}
 
     def __call__(self, loop_indices, **ignore_kwargs):
-        out_dict = {}
         if self.use_threads:
-            out = thread_map(self.getters)
+            out = get_concurrently(self.params)
+        elif self.batches:
+            out = [None] * len(self.getters)
+            for i, getter in enumerate(self.getters):
+                if i in self.batches:
+                    instrument, indices, params = self.batches[i]
+                    for j, value in zip(indices,
+                                        instrument.get_parameters(*params)):
+                        out[j] = value
+                elif i not in self.batched:
+                    out[i] = getter()
         else:
             out = [g() for g in self.getters]
 
-        for param_out, param_id, composite in zip(out, self.param_ids,
-                                                  self.composite):
+        for param_out, array, composite in zip(out, self.arrays,
+                                               self.composite):
             if composite:
-                for val, part_id in zip(param_out, composite):
-                    out_dict[part_id] = val
+                for val, part_array in zip(param_out, array):
+                    part_array[loop_indices] = val
             else:
-                out_dict[param_id] = param_out
+                array[loop_indices] = param_out
+
+        self.stored()
+
 
-        self.store(loop_indices, out_dict)
+def _find_batches(params):
+    """
+    Find the parameters that their instruments can read with one compound
+    query, see ``Instrument.get_parameters``.
+
+    Returns:
+        dict: maps the index of the first parameter of every batch to the
+            instrument, the indices of all parameters of the batch and the
+            parameters themselves
+    """
+    grouped = {}
+    for i, param in enumerate(params):
+        instrument = getattr(param, 'root_instrument', None)
+        batch_query = getattr(instrument, '_batch_query', None)
+        if batch_query is not None and batch_query(param) is not None:
+            grouped.setdefault(id(instrument), (instrument, []))[1].append(i)
+
+    return {indices[0]: (instrument, indices, [params[i] for i in indices])
+            for instrument, indices in grouped.values() if len(indices) > 1}
 
 
 class _Nest:
@@ -300,6 +300,10 @@ class DataArray(DelegateAttributes):
     def _set_index_bounds(self):
         self._min_indices = [0 for d in self.shape]
         self._max_indices = [d - 1 for d in self.shape]
+        # the flat offset of one step of each loop level, ie the number of
+        # values in one slice of the array at that level
+        self._strides = [int(np.prod(self.shape[i + 1:], dtype=int))
+                         for i in range(len(self.shape))]
 
     def clear(self):
         """Fill the (already existing) data array with nan."""
@@ -320,25 +324,32 @@ class DataArray(DelegateAttributes):
         Also update the record of modifications to the array. If you don't
         want this overhead, you can access ``self.ndarray`` directly.
         """
-        if isinstance(loop_indices, collections.abc.Iterable):
-            min_indices = list(loop_indices)
-            max_indices = list(loop_indices)
-        else:
-            min_indices = [loop_indices]
-            max_indices = [loop_indices]
-
-        for i, index in enumerate(min_indices):
-            if isinstance(index, slice):
-                start, stop, step = index.indices(self.shape[i])
-                min_indices[i] = start
-                max_indices[i] = start + (
-                    ((stop - start - 1)//step) * step)
+        self.ndarray.__setitem__(loop_indices, value)
 
-        min_li = self.flat_index(min_indices, self._min_indices)
-        max_li = self.flat_index(max_indices, self._max_indices)
-        self._update_modified_range(min_li, max_li)
+        if type(loop_indices) is tuple:
+            indices = loop_indices
+        elif isinstance(loop_indices, collections.abc.Iterable):
+            indices = tuple(loop_indices)
+        else:
+            indices = (loop_indices,)
+
+        # the flat index range of the values that were set, from the
+        # precomputed strides of the loop levels that are indexed
+        low = high = 0
+        for index, stride, size in zip(indices, self._strides, self.shape):
+            if type(index) is slice:
+                start, stop, step = index.indices(size)
+                low += start * stride
+                high += (start + ((stop - start - 1) // step) * step) * stride
+            else:
+                if index < 0:
+                    index += size
+                low += index * stride
+                high += index * stride
+        # and the full extent of the dimensions that are not indexed
+        high += self._strides[len(indices) - 1] - 1
 
-        self.ndarray.__setitem__(loop_indices, value)
+        self._update_modified_range(low, high)
 
     def __getitem__(self, loop_indices):
         return self.ndarray[loop_indices]
@@ -378,11 +389,16 @@ class DataArray(DelegateAttributes):
         return np.ravel_multi_index(tuple(zip(indices)), self.shape)[0]
 
     def _update_modified_range(self, low, high):
-        if self.modified_range:
-            self.modified_range = (min(self.modified_range[0], low),
-                                   max(self.modified_range[1], high))
-        else:
+        modified_range = self.modified_range
+        if not modified_range:
             self.modified_range = (low, high)
+        elif low >= modified_range[0]:
+            # the usual case in a loop: the end of the range is a cursor
+            # that moves forward as the data comes in
+            if high > modified_range[1]:
+                self.modified_range = (modified_range[0], high)
+        else:
+            self.modified_range = (low, max(modified_range[1], high))
 
     def mark_saved(self, last_saved_index):
         """
@@ -446,7 +462,8 @@ class DataArray(DelegateAttributes):
                 returns a dict with keys:
                     start (int): the flat index of the first returned value.
                     stop (int): the flat index of the last returned value.
-                    vals (List[float]): the new values
+                    vals (numpy.ndarray): the new values, as a flat copy of
+                        this part of the array
         """
         latest_index = self.last_saved_index
         if latest_index is None:
@@ -454,16 +471,11 @@ class DataArray(DelegateAttributes):
         if self.modified_range:
             latest_index = max(latest_index, self.modified_range[1])
 
-        vals = [
-            self.ndarray[np.unravel_index(i, self.ndarray.shape)]
-            for i in range(synced_index + 1, latest_index + 1)
-        ]
-
-        if vals:
+        if latest_index > synced_index:
             return {
                 'start': synced_index + 1,
                 'stop': latest_index,
-                'vals': vals
+                'vals': self.ndarray.flat[synced_index + 1:latest_index + 1]
             }
 
     def apply_changes(self, start, stop, vals):
@@ -478,11 +490,9 @@ class DataArray(DelegateAttributes):
         Args:
             start (int): the flat index of the first new value.
             stop (int): the flat index of the last new value.
-            vals (List[float]): the new values
+            vals (Sequence[float]): the new values
         """
-        for i, val in enumerate(vals):
-            index = np.unravel_index(i + start, self.ndarray.shape)
-            self.ndarray[index] = val
+        self.ndarray.flat[start:start + len(vals)] = vals
         self.synced_index = stop
 
     def __repr__(self):
@@ -402,11 +402,45 @@ class DataSet(DelegateAttributes):
                 array_ids, and values are single numbers or entire slices
                 to insert into that array.
          """
+        arrays = self.arrays
         for array_id, value in ids_values.items():
-            self.arrays[array_id][loop_indices] = value
-        self.last_store = time.time()
+            arrays[array_id][loop_indices] = value
+        self._stored()
+
+    def store_block(self, loop_indices, start, ids_values):
+        """
+        Insert the data of several consecutive points of the innermost loop
+        into one or more of our DataArrays at once.
+
+        This is equivalent to calling ``store`` for each of the points, but
+        the bookkeeping is only done once for the whole block, which matters
+        for fast inner loops, e.g. when the points are read from the buffer
+        of an instrument.
+
+        Args:
+            loop_indices (tuple): the indices of the outer loops of the block.
+            start (int): the index in the innermost loop of the first point.
+            ids_values (Dict[sequence]): a dict whose keys are array_ids, and
+                values are sequences with the values of the points, one
+                value (or slice, for arrays of higher dimensionality) per
+                point, to insert into that array.
+        """
+        loop_indices = tuple(loop_indices)
+        arrays = self.arrays
+        for array_id, values in ids_values.items():
+            block = loop_indices + (slice(start, start + len(values)),)
+            arrays[array_id][block] = values
+        self._stored()
+
+    def _stored(self):
+        """
+        Record that new data was stored, and write the data if the
+        ``write_period`` has passed since the last write.
+        """
+        now = time.time()
+        self.last_store = now
         if (self.write_period is not None and
-                time.time() > self.last_write + self.write_period):
+                now > self.last_write + self.write_period):
             log.debug('Attempting to write')
             self.write()
             self.last_write = time.time()
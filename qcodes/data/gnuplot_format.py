@@ -1,6 +1,6 @@
 import numpy as np
 import re
-import math
+import itertools
 import json
 import logging
 
@@ -70,6 +70,9 @@ class GNUPlotFormat(Formatter):
     of corresponds to our situation.)
     """
 
+    # the number of lines of a file that are parsed at once when reading
+    read_chunk_lines = 100000
+
     def __init__(self, extension='dat', terminator='\n', separator='\t',
                  comment='# ', number_format='.15g', metadata_file=None):
         self.metadata_file = metadata_file or 'snapshot.json'
@@ -170,60 +173,178 @@ class GNUPlotFormat(Formatter):
             data_arrays.append(data_array)
             ids_read.add(array_id)
 
-        indices = [0] * ndim
-        first_point = True
-        resetting = 0
-        for line in f:
-            if self._is_comment(line):
-                continue
-
-            # ignore leading or trailing whitespace (including in blank lines)
-            line = line.strip()
-
-            if not line:
-                # each consecutive blank line implies one more loop to reset
-                # when we read the next data point. Don't depend on the number
-                # of setpoints that change, as there could be weird cases, like
-                # bidirectional sweeps, or highly diagonal sweeps, where this
-                # is incorrect. Anyway this really only matters for >2D sweeps.
-                if not first_point:
-                    resetting += 1
-                continue
-
-            values = tuple(map(float, line.split()))
+        values, resets = self._read_values(f, len(ids))
+        point_indices = self._point_indices(resets, ndim)
 
-            if resetting:
-                indices[-resetting - 1] += 1
-                indices[-resetting:] = [0] * resetting
-                resetting = 0
+        self._store_setpoints(set_arrays, values, point_indices)
+        for j, data_array in enumerate(data_arrays):
+            # set .ndarray directly to avoid the overhead of __setitem__
+            # which updates modified_range
+            data_array.ndarray[point_indices] = values[:, ndim + j]
 
-            for value, set_array in zip(values[:ndim], set_arrays):
-                nparray = set_array.ndarray
-                myindices = tuple(indices[:nparray.ndim])
-                stored_value = nparray[myindices]
-                if math.isnan(stored_value):
-                    nparray[myindices] = value
-                elif stored_value != value:
-                    raise ValueError('inconsistent setpoint values',
-                                     stored_value, value, set_array.name,
-                                     myindices, indices)
-
-            for value, data_array in zip(values[ndim:], data_arrays):
-                # set .ndarray directly to avoid the overhead of __setitem__
-                # which updates modified_range on every call
-                data_array.ndarray[tuple(indices)] = value
-
-            indices[-1] += 1
-            first_point = False
-
-        # Since we skipped __setitem__, back up to the last read point and
-        # mark it as saved that far.
+        # Since we skipped __setitem__, mark the arrays as saved up to the
+        # last read point.
         # Using mark_saved is better than directly setting last_saved_index
         # because it also ensures modified_range is set correctly.
-        indices[-1] -= 1
+        if len(values):
+            indices = [int(index[-1]) for index in point_indices]
+        else:
+            indices = [0] * (ndim - 1) + [-1]
         for array in set_arrays + tuple(data_arrays):
             array.mark_saved(array.flat_index(indices[:array.ndim]))
 
+    def _read_values(self, f, n_columns):
+        """
+        Read the data lines of a file into an array with one row per point,
+        ``read_chunk_lines`` lines at a time.
+
+        Lines with fewer values than columns are filled up with NaN, extra
+        values are ignored.
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: the values, and for each point the
+                number of blank lines before it, i.e. the number of loops
+                that reset (0 for the first point)
+        """
+        chunks = []
+        resets = []
+        resetting = 0
+        while True:
+            lines = list(itertools.islice(f, self.read_chunk_lines))
+            if not lines:
+                break
+
+            data_lines = []
+            for line in lines:
+                if self._is_comment(line):
+                    continue
+
+                # ignore leading or trailing whitespace (including in blank
+                # lines)
+                line = line.strip()
+
+                if not line:
+                    # each consecutive blank line implies one more loop to
+                    # reset when we read the next data point. Don't depend on
+                    # the number of setpoints that change, as there could be
+                    # weird cases, like bidirectional sweeps, or highly
+                    # diagonal sweeps, where this is incorrect. Anyway this
+                    # really only matters for >2D sweeps.
+                    if resets:
+                        resetting += 1
+                    continue
+
+                data_lines.append(line)
+                resets.append(resetting)
+                resetting = 0
+
+            chunks.append(self._parse_lines(data_lines, n_columns))
+
+        if not chunks:
+            return np.empty((0, n_columns)), np.array(resets, dtype=int)
+        return np.concatenate(chunks), np.array(resets, dtype=int)
+
+    @staticmethod
+    def _parse_lines(lines, n_columns):
+        """Parse whitespace separated numbers, n_columns per line."""
+        if all(len(line.split()) == n_columns for line in lines):
+            values = np.fromstring(' '.join(lines), sep=' ')
+            if values.size == len(lines) * n_columns:
+                return values.reshape(-1, n_columns)
+
+        # irregular lines, or values that numpy does not parse
+        rows = []
+        for line in lines:
+            row = tuple(map(float, line.split()))[:n_columns]
+            rows.append(row + (np.nan,) * (n_columns - len(row)))
+        return np.array(rows, dtype=float).reshape(-1, n_columns)
+
+    @staticmethod
+    def _point_indices(resets, ndim):
+        """
+        The indices of the points of a file, given for every point the number
+        of loops that reset before it (see ``_read_values``): the innermost
+        index increases with every point, and a reset of n loops increases
+        the n + 1'th index from the inside and sets the indices inside it
+        to zero.
+
+        Returns:
+            Tuple[np.ndarray]: an array of indices for every dimension
+        """
+        if len(resets) and resets.max() >= ndim:
+            raise ValueError('{} blank lines found in data with {} '
+                             'dimensions'.format(resets.max(), ndim))
+
+        positions = np.arange(len(resets))
+        indices = []
+        for level in range(ndim):
+            loop = ndim - 1 - level  # the number of loops inside this one
+            starts = resets > loop
+            if len(resets):
+                starts[0] = True
+            increments = (resets == loop) & ~starts
+            count = np.cumsum(increments)
+            last_start = np.maximum.accumulate(np.where(starts, positions, 0))
+            indices.append(count - count[last_start] if len(resets)
+                           else count)
+        return tuple(indices)
+
+    @staticmethod
+    def _store_setpoints(set_arrays, values, point_indices):
+        """
+        Store the setpoint values read from a file in the setpoint arrays.
+
+        An element of a setpoint array that already has a value (from an
+        earlier point, or from an earlier file with the same setpoints) must
+        get the same value from every point.
+
+        Raises:
+            ValueError: if the setpoint values are inconsistent
+        """
+        n_points = len(values)
+        errors = []
+        updates = []
+        for i, set_array in enumerate(set_arrays):
+            nparray = set_array.ndarray
+            column = values[:, i]
+            flat = np.ravel_multi_index(point_indices[:nparray.ndim],
+                                        nparray.shape)
+            stored = nparray.flatten()
+
+            # the first value of an element that has no value yet is stored,
+            # all values from the point of the first stored value on must
+            # be equal to it
+            first_read = np.full(stored.shape, n_points)
+            first_read[~np.isnan(stored)] = 0
+            has_value = np.flatnonzero(~np.isnan(column))
+            elements, first = np.unique(flat[has_value], return_index=True)
+            new = np.isnan(stored[elements])
+            elements = elements[new]
+            first = has_value[first[new]]
+            stored[elements] = column[first]
+            first_read[elements] = first
+
+            checked = np.arange(n_points) >= first_read[flat]
+            inconsistent = np.flatnonzero(checked &
+                                          (column != stored[flat]))
+            if len(inconsistent):
+                point = inconsistent[0]
+                errors.append((point, i, stored[flat[point]]))
+            updates.append((nparray, elements, stored[elements]))
+
+        if errors:
+            # the error of the first point, as if the points were read one
+            # by one
+            point, i, stored_value = min(errors, key=lambda e: e[:2])
+            indices = [int(index[point]) for index in point_indices]
+            raise ValueError('inconsistent setpoint values',
+                             stored_value, values[point, i],
+                             set_arrays[i].name,
+                             tuple(indices[:set_arrays[i].ndim]), indices)
+
+        for nparray, elements, element_values in updates:
+            nparray.flat[elements] = element_values
+
     def _is_comment(self, line):
         return line[:self.comment_len] == self.comment_chars
 
@@ -298,27 +419,13 @@ class GNUPlotFormat(Formatter):
 
             overwrite = save_range[0] == 0 or force_write
             open_mode = 'w' if overwrite else 'a'
-            shape = group.set_arrays[-1].shape
 
             with io_manager.open(fn, open_mode) as f:
                 if overwrite:
                     f.write(self._make_header(group))
                     log.debug('Wrote header to file')
 
-                for i in range(save_range[0], save_range[1] + 1):
-                    indices = np.unravel_index(i, shape)
-
-                    # insert a blank line for each loop that reset (to index 0)
-                    # note that if *all* indices are zero (the first point)
-                    # we won't put any blanks
-                    for j, index in enumerate(reversed(indices)):
-                        if index != 0:
-                            if j:
-                                f.write(self.terminator * j)
-                            break
-
-                    one_point = self._data_point(group, indices)
-                    f.write(self.separator.join(one_point) + self.terminator)
+                self._write_points(f, group, save_range[0], save_range[1])
                 log.debug('Wrote to file from '
                           '{} to {}'.format(save_range[0], save_range[1]+1))
             # now that we've saved the data, mark it as such in the data.
@@ -396,9 +503,54 @@ class GNUPlotFormat(Formatter):
     def _comment_line(self, items):
         return self.comment + self.separator.join(items) + self.terminator
 
-    def _data_point(self, group, indices):
-        for array in group.set_arrays:
-            yield self.number_format.format(array[indices[:array.ndim]])
+    def _write_points(self, f, group, first, last):
+        """
+        Write the points from flat index first to last of a group to a file,
+        formatting one inner loop at a time.
+        """
+        shape = group.set_arrays[-1].shape
+        inner_size = shape[-1]
+        line_format, printf_style = self._line_format(
+            len(group.set_arrays) + len(group.data))
+
+        # the points where the inner loop starts over
+        starts = list(range(first - first % inner_size + inner_size,
+                            last + 1, inner_size))
+        for start, stop in zip([first] + starts, starts + [last + 1]):
+            indices = np.unravel_index(np.arange(start, stop), shape)
+            columns = [array.ndarray[indices[:array.ndim]]
+                       for array in group.set_arrays]
+            columns += [array.ndarray[indices] for array in group.data]
+            rows = np.column_stack(columns)
+
+            # insert a blank line for each loop that reset (to index 0)
+            # note that if *all* indices are zero (the first point)
+            # we won't put any blanks
+            blank_lines = ''
+            for j, index in enumerate(reversed(
+                    np.unravel_index(start, shape))):
+                if index != 0:
+                    blank_lines = self.terminator * j
+                    break
+
+            if printf_style:
+                text = (line_format * len(rows)) % tuple(
+                    rows.reshape(-1).tolist())
+            else:
+                text = ''.join(line_format.format(*row)
+                               for row in rows.tolist())
+            f.write(blank_lines + text)
 
-        for array in group.data:
-            yield self.number_format.format(array[indices])
+    def _line_format(self, n_columns):
+        """
+        The format of a line of n_columns numbers, and whether it is a
+        printf-style format, which is faster than ``str.format`` and gives
+        the same output for the common number formats.
+        """
+        match = re.fullmatch(r'\{:(\d*(\.\d+)?[eEfFgG])\}',
+                             self.number_format)
+        number_format = ('%' + match.group(1) if match
+                         else self.number_format)
+        line_format = (self.separator.join([number_format] * n_columns) +
+                       self.terminator)
+        return line_format, match is not None
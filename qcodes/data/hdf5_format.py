@@ -15,10 +15,38 @@ class HDF5Format(Formatter):
 
     Capable of storing (write) and recovering (read) qcodes datasets.
 
+    Every DataArray is stored in a chunked, resizable hdf5 dataset that
+    grows as the data comes in. Only the part of an array that was modified
+    since the previous write (see ``DataArray.modified_range``) is written.
+
+    Args:
+        compression (Optional[str]): the hdf5 compression filter of the
+            data arrays, 'gzip' or 'lzf'. Default None, no compression.
+
+        compression_opts (Optional[int]): options of the compression filter,
+            for 'gzip' the compression level (0-9).
+
+        swmr (bool): write in single writer multiple reader (SWMR) mode,
+            such that the file can be read while a Loop is still running.
+            The file is then created with the latest hdf5 file format,
+            which needs hdf5 1.10 or newer to be read. A formatter with
+            ``swmr=True`` also reads files in SWMR mode.
     """
 
     _format_tag = 'hdf5'
 
+    # the minimal number of values in a chunk of a data array; chunks are
+    # whole multiples of the innermost dimension of the array
+    min_chunk_size = 1024
+
+    def __init__(self, compression=None, compression_opts=None, swmr=False):
+        if compression not in (None, 'gzip', 'lzf'):
+            raise ValueError('HDF5Format compression must be None, '
+                             '"gzip" or "lzf", not {}'.format(compression))
+        self.compression = compression
+        self.compression_opts = compression_opts
+        self.swmr = swmr
+
     def close_file(self, data_set):
         """
         Closes the hdf5 file open in the dataset.
@@ -30,6 +58,12 @@ class HDF5Format(Formatter):
             data_set._h5_base_group.close()
             # Removes reference to closed file
             del data_set._h5_base_group
+            if getattr(data_set, '_h5_pending_metadata', False):
+                # metadata can not be rewritten in SWMR mode, so it is
+                # written now that the file is no longer in that mode
+                del data_set._h5_pending_metadata
+                self.write_metadata(data_set)
+                self.close_file(data_set)
         else:
             logging.warning(
                 'Cannot close file, data_set has no open hdf5 file')
@@ -42,7 +76,10 @@ class HDF5Format(Formatter):
         folder, _filename = os.path.split(filepath)
         if not os.path.isdir(folder):
             os.makedirs(folder)
-        file = h5py.File(filepath, 'a')
+        if self.swmr:
+            file = h5py.File(filepath, 'a', libver='latest')
+        else:
+            file = h5py.File(filepath, 'a')
         return file
 
     def _open_file(self, data_set, location=None):
@@ -50,7 +87,12 @@ class HDF5Format(Formatter):
             location = data_set.location
         filepath = self._filepath_from_location(location,
                                                 io_manager=data_set.io)
-        data_set._h5_base_group = h5py.File(filepath, 'r+')
+        if self.swmr:
+            # the file may still be written to by a running Loop
+            data_set._h5_base_group = h5py.File(filepath, 'r',
+                                                libver='latest', swmr=True)
+        else:
+            data_set._h5_base_group = h5py.File(filepath, 'r+')
 
     def read(self, data_set, location=None):
         """
@@ -181,18 +223,26 @@ class HDF5Format(Formatter):
         writing metadata.
 
             - The main part of write consists of writing and resizing arrays,
-              the resizing providing support for incremental writes.
+              the resizing providing support for incremental writes. Only
+              the values in the ``modified_range`` of an array, and any
+              values beyond the end of its hdf5 dataset, are written,
+              after which the array is marked saved.
 
             - write_metadata is called at the end of write and dumps a
               dictionary to an hdf5 file. If there already is metadata it will
               delete this and overwrite it with current metadata.
 
+        In SWMR mode the file is switched to SWMR writing once all arrays
+        have a dataset in it. From then on, no datasets or attributes can be
+        added to the file, so metadata written after that is only written
+        when the file is closed.
         """
         if not hasattr(data_set, '_h5_base_group') or force_write:
             data_set._h5_base_group = self._create_data_object(
                 data_set, io_manager, location)
 
         data_name = 'Data Arrays'
+        in_swmr_mode = self.swmr and data_set._h5_base_group.swmr_mode
 
         if data_name not in data_set._h5_base_group.keys():
             arr_group = data_set._h5_base_group.create_group(data_name)
@@ -200,40 +250,67 @@ class HDF5Format(Formatter):
             arr_group = data_set._h5_base_group[data_name]
 
         for array_id in data_set.arrays.keys():
-            if array_id not in arr_group.keys() or force_write:
-                self._create_dataarray_dset(array=data_set.arrays[array_id],
-                                            group=arr_group)
+            x = data_set.arrays[array_id]
+            new_dset = array_id not in arr_group.keys() or force_write
+            if new_dset:
+                if array_id in arr_group.keys():
+                    del arr_group[array_id]
+                self._create_dataarray_dset(array=x, group=arr_group)
             dset = arr_group[array_id]
             # Resize the dataset and add the new values
 
             # dataset refers to the hdf5 dataset here
-            datasetshape = dset.shape
-            old_dlen = datasetshape[0]
-            x = data_set.arrays[array_id]
-            try:
-                # get latest NaN element
-                new_dlen = (~np.isnan(x)).flatten().nonzero()[0][-1] + 1
-            except IndexError:
-                new_dlen = old_dlen
-
-            new_datasetshape = (new_dlen,
-                                datasetshape[1])
-            dset.resize(new_datasetshape)
-            new_data_shape = (new_dlen - old_dlen, datasetshape[1])
-            dset[old_dlen:new_dlen] = x[old_dlen:new_dlen].reshape(
-                new_data_shape)
-            # allow resizing extracted data, here so it gets written for
-            # incremental writes aswell
-            dset.attrs['shape'] = x.shape
+            old_dlen = dset.shape[0]
+            start, new_dlen = self._write_range(x, old_dlen, new_dset)
+            if new_dlen > old_dlen:
+                dset.resize((new_dlen, dset.shape[1]))
+            if new_dlen > start:
+                dset[start:new_dlen, 0] = x.ndarray.reshape(-1)[start:new_dlen]
+                x.mark_saved(new_dlen - 1)
+            if not in_swmr_mode:
+                # allow resizing extracted data, here so it gets written for
+                # incremental writes aswell
+                dset.attrs['shape'] = x.shape
+
         if write_metadata:
             self.write_metadata(
                 data_set, io_manager=io_manager, location=location)
 
+        if self.swmr and not in_swmr_mode:
+            data_set._h5_base_group.swmr_mode = True
+
         # flush ensures buffers are written to disk
         # (useful for ensuring openable by other files)
         if flush:
             data_set._h5_base_group.file.flush()
 
+    @staticmethod
+    def _write_range(array, old_dlen, new_dset):
+        """
+        The flat index range ``(start, stop)`` of a DataArray that needs
+        to be written to its hdf5 dataset of length old_dlen, based on
+        which part of the array was modified or saved before.
+        """
+        if new_dset:
+            stop = 0
+            if array.last_saved_index is not None:
+                stop = array.last_saved_index + 1
+            if array.modified_range:
+                stop = max(stop, array.modified_range[1] + 1)
+            elif array.last_saved_index is None:
+                # nothing is known about how far the array has been filled,
+                # e.g. if its ndarray was assigned to directly
+                filled = (~np.isnan(array.ndarray)).reshape(-1).nonzero()[0]
+                if len(filled):
+                    stop = filled[-1] + 1
+            return 0, stop
+
+        if not array.modified_range:
+            return old_dlen, old_dlen
+        start = min(array.modified_range[0], old_dlen)
+        stop = max(array.modified_range[1] + 1, old_dlen)
+        return start, stop
+
     def _create_dataarray_dset(self, array, group):
         '''
         input arguments
@@ -254,10 +331,15 @@ class HDF5Format(Formatter):
         else:
             name = array.array_id
 
-        # Create the hdf5 dataset
+        # Create the hdf5 dataset, with chunks holding whole rows of the
+        # innermost loop
+        row_size = array.shape[-1] if array.shape else 1
+        chunk_rows = -(-self.min_chunk_size // row_size) * row_size
         dset = group.create_dataset(
             array.array_id, (0, 1),
-            maxshape=(None, 1))
+            maxshape=(None, 1), chunks=(chunk_rows, 1),
+            compression=self.compression,
+            compression_opts=self.compression_opts)
         dset.attrs['label'] = _encode_to_utf8(str(label))
         dset.attrs['name'] = _encode_to_utf8(str(name))
         dset.attrs['unit'] = _encode_to_utf8(str(array.unit or ''))
@@ -285,6 +367,9 @@ class HDF5Format(Formatter):
         if not hasattr(data_set, '_h5_base_group'):
             # added here because loop writes metadata before data itself
             data_set._h5_base_group = self._create_data_object(data_set)
+        if self.swmr and data_set._h5_base_group.swmr_mode:
+            data_set._h5_pending_metadata = True
+            return
         if 'metadata' in data_set._h5_base_group.keys():
             del data_set._h5_base_group['metadata']
         metadata_group = data_set._h5_base_group.create_group('metadata')
@@ -1,33 +1,42 @@
-from typing import List, Any, Sequence, Tuple, Dict, Union
+from typing import List, Any, Sequence, Tuple, Dict, Union, Optional
 import logging
 
 import numpy as np
 
-from qcodes.dataset.sqlite_base import (get_dependencies, get_dependents,
-                                        get_layout)
+from qcodes.dataset.param_spec import ParamSpec
 from qcodes.dataset.data_set import load_by_id
 
 log = logging.getLogger(__name__)
 
 
-def flatten_1D_data_for_plot(rawdata: Sequence[Sequence[Any]]) -> np.ndarray:
+def flatten_1D_data_for_plot(rawdata: Union[Sequence[Sequence[Any]],
+                                             np.ndarray]) -> np.ndarray:
     """
     Cast the return value of the database query to
     a numpy array
 
     Args:
-        rawdata: The return of the get_values function
+        rawdata: The return of the get_values function, or an array of
+            get_data_as_arrays
 
     Returns:
         A one-dimensional numpy array
     """
-    dataarray = np.array(rawdata)
+    dataarray = np.asarray(rawdata)
     shape = np.shape(dataarray)
     dataarray = dataarray.reshape(np.product(shape))
 
     return dataarray
 
 
+def _layout_of(spec: ParamSpec) -> Dict[str, Union[str, np.ndarray]]:
+    """
+    Get the name, label and unit of a parameter in the same form as the
+    `get_layout` function does
+    """
+    return {'name': spec.name, 'label': spec.label, 'unit': spec.unit}
+
+
 def get_data_by_id(run_id: int) -> List:
     """
     Load data from database and reshapes into 1D arrays with minimal
@@ -63,29 +72,31 @@ def get_data_by_id(run_id: int) -> List:
 
     data = load_by_id(run_id)
 
-    conn = data.conn
-    deps = get_dependents(conn, run_id)
+    # the layout of the run is looked up once from the cached ParamSpecs of
+    # the dataset instead of querying the layouts for every dependent
+    paramspecs = data.paramspecs
+    deps = [spec for spec in paramspecs.values() if spec.depends_on != '']
 
     output = []
     for dep in deps:
 
-        dependencies = get_dependencies(conn, dep)
-
-        data_axis: Dict[str, Union[str, np.ndarray]] = get_layout(conn, dep)
+        setpoint_names = dep.depends_on.split(', ')
 
-        rawdata = data.get_values(data_axis['name'])
-        data_axis['data'] = flatten_1D_data_for_plot(rawdata)
+        data_axis: Dict[str, Union[str, np.ndarray]] = _layout_of(dep)
+        setpoint_axes: List[Dict[str, Union[str, np.ndarray]]] = [
+            _layout_of(paramspecs[name]) for name in setpoint_names]
 
-        raw_setpoint_data = data.get_setpoints(data_axis['name'])
+        # the values of the dependent and all of its setpoints are read
+        # in one go, and only for the rows where the dependent has a value
+        rawdata = data.get_data_as_arrays(dep.name, *setpoint_names,
+                                          not_null=dep.name)
+        data_axis['data'] = flatten_1D_data_for_plot(rawdata[dep.name])
 
         output_axes = []
 
         max_size = 0
-        for dependency in dependencies:
-            axis: Dict[str, Union[str, np.ndarray]] = get_layout(conn,
-                                                                 dependency[0])
-
-            mydata = flatten_1D_data_for_plot(raw_setpoint_data[axis['name']])
+        for name, axis in zip(setpoint_names, setpoint_axes):
+            mydata = flatten_1D_data_for_plot(rawdata[name])
             axis['data'] = mydata
 
             size = mydata.size
@@ -122,12 +133,9 @@ def _all_steps_multiples_of_min_step(rows: Sequence[np.ndarray]) -> bool:
         The answer to the question
     """
 
-    steps: List[np.ndarray] = []
-    for row in rows:
-        # TODO: What is an appropriate precision?
-        steps += list(np.unique(np.diff(row).round(decimals=15)))
-
-    steps = np.unique((steps))
+    # TODO: What is an appropriate precision?
+    steps = np.unique(np.concatenate([np.diff(row) for row in rows])
+                      .round(decimals=15))
     remainders = np.mod(steps[1:]/steps[0], 1)
 
     # TODO: What are reasonable tolerances for allclose?
@@ -136,43 +144,30 @@ def _all_steps_multiples_of_min_step(rows: Sequence[np.ndarray]) -> bool:
     return asmoms
 
 
-def _rows_from_datapoints(inputsetpoints: np.ndarray) -> np.ndarray:
+def _rows_from_datapoints(values: np.ndarray,
+                          counts: np.ndarray) -> List[np.ndarray]:
     """
     Cast the (potentially) unordered setpoints into rows
     of sorted, unique setpoint values. Because of the way they are ordered,
     these rows do not necessarily correspond to actual rows of the scan,
-    but they can nonetheless be used to identify certain scan types
+    but they can nonetheless be used to identify certain scan types.
+
+    The n'th row holds the values that occur more than n times, so each row
+    is contained in the previous one and rows only differ where the counts
+    of the values differ. Only the distinct rows are returned.
 
     Args:
-        setpoints: The raw setpoints as a one-dimensional array
+        values: The sorted unique setpoint values, as returned by
+            ``np.unique(setpoints, return_counts=True)``
+        counts: The number of occurrences of each of the values
 
     Returns:
-        A ndarray of the rows
+        A list of the distinct rows
     """
+    return [values[counts >= count] for count in np.unique(counts)]
 
-    rows = []
-    setpoints = inputsetpoints.copy()
-
-    # first check if there is only one unique array in which case we can avoid the
-    # potentially slow loop below
-    temp, inds, count = np.unique(setpoints, return_index=True,
-                                  return_counts=True)
-    num_repeats_array = np.unique(count)
-    if len(num_repeats_array) == 1 and count.sum() == len(inputsetpoints):
-        return np.tile(temp, (num_repeats_array[0], 1))
-    else:
-        rows.append(temp)
-        setpoints = np.delete(setpoints, inds)
-
-    while len(setpoints) > 0:
-        temp, inds = np.unique(setpoints, return_index=True)
-        rows.append(temp)
-        setpoints = np.delete(setpoints, inds)
 
-    return np.array(rows)
-
-
-def _all_in_group_or_subgroup(rows: np.ndarray) -> bool:
+def _all_in_group_or_subgroup(counts: np.ndarray) -> bool:
     """
     Detects whether the setpoints correspond to two groups of
     of identical rows, one being contained in the other.
@@ -182,40 +177,83 @@ def _all_in_group_or_subgroup(rows: np.ndarray) -> bool:
     in the setpoint grid, thus allowing for an interrupted sweep.
     Note that each axis needs NOT be equidistantly spaced.
 
+    Since every row is contained in the previous one (see
+    _rows_from_datapoints), this is the case if the unique setpoint values
+    occur at most two different numbers of times.
+
     Args:
-        rows: The output from _rows_from_datapoints
+        counts: The number of occurrences of each unique setpoint value
 
     Returns:
         A boolean indicating whether the setpoints meet the
             criterion
     """
+    return len(np.unique(counts)) <= 2
 
-    groups = 1
-    comp_to = rows[0]
 
-    aigos = True
-    switchindex = 0
+def _nested_sweep_length(outer: np.ndarray, inner: np.ndarray) -> int:
+    """
+    Get the number of inner setpoints if the setpoints are those of a
+    complete nested sweep, in which `inner` runs over the same strictly
+    monotonic values for each of the strictly monotonic values of `outer`.
+    This is checked in a single pass over the data, without any sorting.
+
+    Args:
+        outer: The setpoints of the outer (slow) axis
+        inner: The setpoints of the inner (fast) axis
+
+    Returns:
+        The number of inner setpoints, or 0 if the setpoints are not those
+        of a complete nested sweep
+    """
+    n_inner = int(np.argmax(outer != outer[0]))
+    if n_inner < 2 or len(outer) % n_inner != 0:
+        return 0
+    outer_2d = outer.reshape(-1, n_inner)
+    inner_2d = inner.reshape(-1, n_inner)
+
+    if not (_strictly_monotonic(outer_2d[:, 0])
+            and _strictly_monotonic(inner_2d[0])):
+        return 0
+    if not ((outer_2d == outer_2d[:, :1]).all()
+            and (inner_2d == inner_2d[:1]).all()):
+        return 0
+    return n_inner
 
-    for rowind, row in enumerate(rows[1:]):
-        if np.array_equal(row, comp_to):
-            continue
-        else:
-            groups += 1
-            comp_to = row
-            switchindex = rowind
-            if groups > 2:
-                aigos = False
-                break
 
-    # if there are two groups, check that the rows of one group
-    # are all contained in the rows of the other
-    if aigos and switchindex > 0:
-        for row in rows[1+switchindex:]:
-            if sum([r in rows[0] for r in row]) != len(row):
-                aigos = False
-                break
+def _strictly_monotonic(row: np.ndarray) -> bool:
+    steps = np.diff(row)
+    return bool((steps > 0).all() or (steps < 0).all())
 
-    return aigos
+
+def _rectilinear_grid(x: np.ndarray, y: np.ndarray
+                      ) -> Optional[Tuple[np.ndarray, np.ndarray, bool]]:
+    """
+    Fast path for the setpoints of a complete rectilinear sweep, as
+    produced by two nested loops, that avoids sorting the setpoints
+
+    Args:
+        x: The x-axis values
+        y: The y-axis values
+
+    Returns:
+        The x and y values of the grid in the order of the sweep, and whether
+        x is the outer axis of the sweep, or None if the setpoints are not
+        those of a complete rectilinear sweep of numeric values
+    """
+    if not (np.issubdtype(x.dtype, np.number)
+            and np.issubdtype(y.dtype, np.number)):
+        return None
+    if len(x) != len(y) or len(x) < 4:
+        return None
+
+    ny = _nested_sweep_length(x, y)
+    if ny > 0:
+        return x[::ny], y[:ny], True
+    nx = _nested_sweep_length(y, x)
+    if nx > 0:
+        return x[:nx], y[::nx], False
+    return None
 
 
 def _strings_as_ints(inputarray: np.ndarray) -> np.ndarray:
@@ -227,9 +265,7 @@ def _strings_as_ints(inputarray: np.ndarray) -> np.ndarray:
     Args:
         inputarray: A 1D array of strings
     """
-    newdata = np.zeros(len(inputarray))
-    for n, word in enumerate(np.unique(inputarray)):
-        newdata += ((inputarray == word).astype(int)*n)
+    _, newdata = np.unique(inputarray, return_inverse=True)
     return newdata
 
 
@@ -343,24 +379,30 @@ def datatype_from_setpoints_2d(xpoints: np.ndarray,
     if x_all_the_same or y_all_the_same:
         return 'point'
 
+    # A complete sweep of two nested loops is recognised without sorting
+    if _rectilinear_grid(xpoints, ypoints) is not None:
+        return 'grid'
+
     # Now check if this is a simple rectangular sweep,
     # possibly interrupted in the middle of one row
 
-    xrows = _rows_from_datapoints(xpoints)
-    yrows = _rows_from_datapoints(ypoints)
+    xvalues, xcounts = np.unique(xpoints, return_counts=True)
+    yvalues, ycounts = np.unique(ypoints, return_counts=True)
 
-    x_check = _all_in_group_or_subgroup(xrows)
-    y_check = _all_in_group_or_subgroup(yrows)
+    x_check = _all_in_group_or_subgroup(xcounts)
+    y_check = _all_in_group_or_subgroup(ycounts)
 
-    x_check = x_check and (len(xrows[0]) == len(yrows))
-    y_check = y_check and (len(yrows[0]) == len(xrows))
+    x_check = x_check and (len(xvalues) == ycounts.max())
+    y_check = y_check and (len(yvalues) == xcounts.max())
 
     # this is the check that we are on a "simple" grid
     if y_check and x_check:
         return 'grid'
 
-    x_check = _all_steps_multiples_of_min_step(xrows)
-    y_check = _all_steps_multiples_of_min_step(yrows)
+    x_check = _all_steps_multiples_of_min_step(
+        _rows_from_datapoints(xvalues, xcounts))
+    y_check = _all_steps_multiples_of_min_step(
+        _rows_from_datapoints(yvalues, ycounts))
 
     # this is the check that we are on an equidistant grid
     if y_check and x_check:
@@ -371,24 +413,50 @@ def datatype_from_setpoints_2d(xpoints: np.ndarray,
 
 def reshape_2D_data(x: np.ndarray, y: np.ndarray, z: np.ndarray
                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
-    xrow = np.array(_rows_from_datapoints(x)[0])
-    yrow = np.array(_rows_from_datapoints(y)[0])
-    nx = len(xrow)
-    ny = len(yrow)
+    """
+    Sort the flat setpoints and data of a 2D run onto a grid
+
+    Args:
+        x: The x-axis values
+        y: The y-axis values
+        z: The z-axis (colorbar) values
+
+    Returns:
+        The sorted unique x values, the sorted unique y values and the z
+        values as a 2D array indexed by the y and x index. Points of the
+        grid without data are filled with NaN (or '' for string data)
+    """
+    z_is_stringy = isinstance(z[0], str)
+
+    grid = _rectilinear_grid(x, y)
+    if grid is not None:
+        log.debug('Reshaping rectilinear 2D data onto grid')
+        xrow, yrow, x_is_outer = grid
+        if x_is_outer:
+            z_to_plot = z.reshape(len(xrow), len(yrow)).T
+        else:
+            z_to_plot = z.reshape(len(yrow), len(xrow))
+        if xrow[0] > xrow[-1]:
+            xrow = xrow[::-1]
+            z_to_plot = z_to_plot[:, ::-1]
+        if yrow[0] > yrow[-1]:
+            yrow = yrow[::-1]
+            z_to_plot = z_to_plot[::-1, :]
+        if not z_is_stringy:
+            z_to_plot = z_to_plot.astype(float)
+        return xrow.copy(), yrow.copy(), np.ascontiguousarray(z_to_plot)
 
-    # potentially slow method of filling in the data, should be optimised
     log.debug('Sorting 2D data onto grid')
 
-    if isinstance(z[0], str):
+    xrow, x_index = np.unique(x, return_inverse=True)
+    yrow, y_index = np.unique(y, return_inverse=True)
+    nx = len(xrow)
+    ny = len(yrow)
+
+    if z_is_stringy:
         z_to_plot = np.full((ny, nx), '', dtype=z.dtype)
     else:
         z_to_plot = np.full((ny, nx), np.nan)
-    x_index = np.zeros_like(x, dtype=np.int)
-    y_index = np.zeros_like(y, dtype=np.int)
-    for i, xval in enumerate(xrow):
-        x_index[np.where(x == xval)[0]] = i
-    for i, yval in enumerate(yrow):
-        y_index[np.where(y == yval)[0]] = i
 
     z_to_plot[y_index, x_index] = z
 
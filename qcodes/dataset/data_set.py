@@ -1,12 +1,18 @@
 import functools
 import json
-from typing import Any, Dict, List, Optional, Union, Sized, Callable
-from threading import Thread
+from typing import (Any, Dict, List, Optional, Union, Sized, Callable,
+                    Mapping, Sequence, Tuple)
+from threading import Thread, Condition, Lock, current_thread
 import time
+import heapq
+import itertools
 import logging
 import uuid
 from queue import Queue, Empty
 
+import numpy as np
+
+import qcodes.config
 from qcodes.dataset.param_spec import ParamSpec
 from qcodes.instrument.parameter import _BaseParameter
 from qcodes.dataset.sqlite_base import (atomic, atomic_transaction,
@@ -20,10 +26,13 @@ from qcodes.dataset.sqlite_base import (atomic, atomic_transaction,
                                         add_meta_data, mark_run_complete,
                                         modify_many_values, insert_values,
                                         insert_many_values,
+                                        insert_many_columns,
                                         VALUE, VALUES, get_data,
+                                        get_data_as_arrays,
                                         get_values,
                                         get_setpoints,
                                         get_metadata, one,
+                                        add_snapshot, get_snapshot,
                                         get_experiment_name_from_experiment_id,
                                         get_sample_name_from_experiment_id,
                                         get_guid_from_run_id,
@@ -61,14 +70,99 @@ class CompletedError(RuntimeError):
     pass
 
 
-class _Subscriber(Thread):
+class _SubscriberPool:
+    """
+    A pool of worker threads that calls the callbacks of subscribers of
+    DataSets. Any number of subscribers (of any number of DataSets) share
+    the workers of a pool.
+
+    Subscribers with data waiting for them are put on a schedule (ordered by
+    the time at which they are due) and the workers sleep on a condition
+    variable until a subscriber is due, hence no worker is busy-polling for
+    data. The callback of a given subscriber is never called concurrently
+    from several workers.
+
+    The _SubscriberPool is not meant to be instantiated directly; by default
+    all subscribers share the pool returned by `_get_default_pool`.
+    """
+
+    def __init__(self, n_workers: int = 2) -> None:
+        self._n_workers = n_workers
+        self._condition = Condition()
+        self._schedule: List[Tuple[float, int, '_Subscriber']] = []
+        self._counter = itertools.count()
+        self._workers: List[Thread] = []
+        self.log = logging.getLogger(f"{__name__}._SubscriberPool")
+
+    def schedule(self, subscriber: '_Subscriber', due: float) -> None:
+        """
+        Schedule a call of the subscriber's callback at the (monotonic) time
+        `due` or as soon as possible thereafter.
+        """
+        with self._condition:
+            if not self._workers:
+                self._start_workers()
+            heapq.heappush(self._schedule,
+                           (due, next(self._counter), subscriber))
+            self._condition.notify()
+
+    def _start_workers(self) -> None:
+        for n in range(self._n_workers):
+            worker = Thread(target=self._work, name=f"_SubscriberPool-{n}",
+                            daemon=True)
+            worker.start()
+            self._workers.append(worker)
+
+    def _next_due_subscriber(self) -> '_Subscriber':
+        with self._condition:
+            while True:
+                timeout: Optional[float] = None
+                if self._schedule:
+                    timeout = self._schedule[0][0] - time.monotonic()
+                    if timeout <= 0:
+                        return heapq.heappop(self._schedule)[2]
+                self._condition.wait(timeout)
+
+    def _work(self) -> None:
+        while True:
+            subscriber = self._next_due_subscriber()
+            try:
+                subscriber._dispatch()
+            except Exception:
+                self.log.exception(f"Callback of subscriber "
+                                   f"{subscriber._id} failed")
+
+
+_default_pool: Optional[_SubscriberPool] = None
+_default_pool_lock = Lock()
+
+
+def _get_default_pool() -> _SubscriberPool:
+    """
+    Get the subscriber pool shared by all subscribers (created on first use)
+    """
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = _SubscriberPool()
+        return _default_pool
+
+
+class _Subscriber:
     """
     Class to add a subscriber to a DataSet. The subscriber gets called every
-    time an insert is made to the results_table.
+    time results are added to the DataSet.
 
     The _Subscriber is not meant to be instantiated directly, but rather used
     via the 'subscribe' method of the DataSet.
 
+    The DataSet hands every batch of results it has written directly to its
+    subscribers, and the callback is called from one of the worker threads
+    of a `_SubscriberPool` once at least `min_queue_length` results are
+    waiting and at least `loop_sleep_time` has passed since the previous
+    call. The results are passed to the callback as tuples with one value
+    per parameter of the DataSet (None for missing values).
+
     NOTE: A subscriber should be added *after* all parameters have been added.
 
     NOTE: Special care shall be taken when using the *state* object: it is the
@@ -81,9 +175,9 @@ class _Subscriber(Thread):
                  state: Optional[Any] = None,
                  loop_sleep_time: int = 0,  # in milliseconds
                  min_queue_length: int = 1,
-                 callback_kwargs: Optional[Dict[str, Any]]=None
+                 callback_kwargs: Optional[Dict[str, Any]]=None,
+                 pool: Optional[_SubscriberPool] = None
                  ) -> None:
-        super().__init__()
 
         self._id = id_
 
@@ -106,31 +200,51 @@ class _Subscriber(Thread):
 
         self.callback_id = f"callback{self._id}"
 
-        conn = dataSet.conn
-
-        conn.create_function(self.callback_id, -1, self._cache_data_to_queue)
+        self._parameter_names = [p.name for p in dataSet.get_parameters()]
 
-        parameters = dataSet.get_parameters()
-        sql_param_list = ",".join([f"NEW.{p.name}" for p in parameters])
-        sql_create_trigger_for_callback = f"""
-        CREATE TRIGGER sub{self._id}
-            AFTER INSERT ON '{self.table_name}'
-        BEGIN
-            SELECT {self.callback_id}({sql_param_list});
-        END;"""
-        atomic_transaction(conn, sql_create_trigger_for_callback)
+        self._pool = pool or _get_default_pool()
+        # guards the queue and the scheduling state
+        self._lock = Lock()
+        # held while the callback is being called
+        self._callback_lock = Lock()
+        # the thread that is calling the callback, if any
+        self._dispatching_thread: Optional[Thread] = None
+        self._scheduled = False
+        self._last_call_time = -float('inf')
 
         self.log = logging.getLogger(f"_Subscriber {self._id}")
 
-    def _cache_data_to_queue(self, *args) -> None:
-        self.log.debug(f"Args:{args} put into queue for {self.callback_id}")
-        self.data_queue.put(args)
-        self._data_set_len += 1
-        self._queue_length += 1
+    def _cache_data_to_queue(self,
+                             columns: Mapping[str, Union[np.ndarray,
+                                                         Sequence[VALUE]]],
+                             n_rows: int) -> None:
+        """
+        Put a batch of results written to the DataSet into the queue and,
+        if enough results are waiting, schedule a call of the callback.
 
-    def run(self) -> None:
-        self.log.debug("Starting subscriber")
-        self._loop()
+        Args:
+            columns: the results as a dictionary of parameter names and
+                sequences of values of that parameter
+            n_rows: the number of results in the batch
+        """
+        values = [_column_values(columns[name], n_rows) if name in columns
+                  else [None] * n_rows
+                  for name in self._parameter_names]
+        rows = list(zip(*values))
+        # only the number of rows is logged, formatting the rows themselves
+        # would cost as much as queueing them
+        self.log.debug("%d rows put into queue for %s", n_rows,
+                       self.callback_id)
+        with self._lock:
+            for row in rows:
+                self.data_queue.put(row)
+            self._data_set_len += n_rows
+            self._queue_length += n_rows
+            if (self._queue_length >= self.min_queue_length
+                    and not self._scheduled and not self._stop_signal):
+                self._scheduled = True
+                self._pool.schedule(self, self._last_call_time
+                                    + self._loop_sleep_time)
 
     @staticmethod
     def _exhaust_queue(queue: Queue) -> List:
@@ -143,40 +257,72 @@ class _Subscriber(Thread):
         return result_list
 
     def _call_callback_on_queue_data(self) -> None:
-        result_list = self._exhaust_queue(self.data_queue)
-        self.callback(result_list, self._data_set_len, self.state)
-        self.log.debug(f"{self.callback} called with "
-                       f"result_list: {result_list}.")
-
-    def _loop(self) -> None:
-        while True:
-            if self._stop_signal:
-                self._clean_up()
-                break
-
-            if self._queue_length >= self.min_queue_length:
-                self._call_callback_on_queue_data()
-                self._queue_length = 0
-
-            time.sleep(self._loop_sleep_time)
-
-            if self.dataSet.completed:
+        with self._lock:
+            result_list = self._exhaust_queue(self.data_queue)
+            self._queue_length = 0
+            data_set_len = self._data_set_len
+        self.callback(result_list, data_set_len, self.state)
+        self.log.debug("%s called with %d results", self.callback,
+                       len(result_list))
+
+    def _dispatch(self) -> None:
+        """
+        Call the callback on the queued data. Called from a worker thread of
+        the pool when the subscriber is due.
+        """
+        with self._callback_lock:
+            with self._lock:
+                self._scheduled = False
+                if (self._stop_signal
+                        or self._queue_length < self.min_queue_length):
+                    return
+            self._dispatching_thread = current_thread()
+            try:
                 self._call_callback_on_queue_data()
-                break
+            finally:
+                self._dispatching_thread = None
+                self._last_call_time = time.monotonic()
 
     def done_callback(self) -> None:
         self.log.debug("Done callback")
-        self._call_callback_on_queue_data()
+        with self._callback_lock:
+            self._call_callback_on_queue_data()
 
     def schedule_stop(self) -> None:
-        if not self._stop_signal:
-            self.log.debug("Scheduling stop")
-            self._stop_signal = True
+        with self._lock:
+            if not self._stop_signal:
+                self.log.debug("Scheduling stop")
+                self._stop_signal = True
+
+    def join(self) -> None:
+        """
+        Wait for a call of the callback that is in progress to finish
+
+        When called from the callback itself, e.g. because the callback
+        unsubscribes, only the stop is scheduled since the call in progress
+        is the caller.
+        """
+        if self._dispatching_thread is current_thread():
+            self.schedule_stop()
+            return
+        with self._callback_lock:
+            self._clean_up()
 
     def _clean_up(self) -> None:
         self.log.debug("Stopped subscriber")
 
 
+def _column_values(column: Union[np.ndarray, Sequence[VALUE]],
+                   n_rows: int) -> List[VALUE]:
+    """
+    Turn a column of results into a list of python values to pass on to
+    subscribers. Numpy arrays of scalars are converted in bulk.
+    """
+    if isinstance(column, np.ndarray) and column.ndim == 1:
+        return column.tolist()
+    return list(column)
+
+
 class DataSet(Sized):
     def __init__(self, path_to_db: str=None,
                  run_id: Optional[int]=None,
@@ -221,6 +367,12 @@ class DataSet(Sized):
         self._run_id = run_id
         self._debug = False
         self.subscribers: Dict[str, _Subscriber] = {}
+        # the layout of the run (parameters and their dependencies) and the
+        # name of the results table are looked up once and then cached
+        self._table_name: Optional[str] = None
+        self._paramspecs: Optional[Dict[str, ParamSpec]] = None
+        # the snapshot is read on first use and then cached
+        self._snapshot_raw: Optional[str] = None
 
         if run_id is not None:
             if not run_exists(self.conn, run_id):
@@ -265,9 +417,12 @@ class DataSet(Sized):
                                 "name", "run_id", self.run_id)
 
     @property
-    def table_name(self):
-        return select_one_where(self.conn, "runs",
-                                "result_table_name", "run_id", self.run_id)
+    def table_name(self) -> str:
+        if self._table_name is None:
+            self._table_name = select_one_where(self.conn, "runs",
+                                                "result_table_name",
+                                                "run_id", self.run_id)
+        return self._table_name
 
     @property
     def guid(self):
@@ -275,7 +430,10 @@ class DataSet(Sized):
 
     @property
     def snapshot(self) -> Optional[dict]:
-        """Snapshot of the run as dictionary (or None)"""
+        """
+        Snapshot of the run as dictionary (or None). Every access returns a
+        new dictionary, so that callers may modify it
+        """
         snapshot_json = self.snapshot_raw
         if snapshot_json is not None:
             return json.loads(snapshot_json)
@@ -285,11 +443,14 @@ class DataSet(Sized):
     @property
     def snapshot_raw(self) -> Optional[str]:
         """Snapshot of the run as a JSON-formatted string (or None)"""
-        if is_column_in_table(self.conn, "runs", "snapshot"):
-            return select_one_where(self.conn, "runs", "snapshot",
-                                    "run_id", self.run_id)
-        else:
-            return None
+        if self._snapshot_raw is None:
+            self._snapshot_raw = get_snapshot(self.conn, self.run_id)
+        if self._snapshot_raw is None:
+            # snapshots stored by earlier versions of QCoDeS
+            if is_column_in_table(self.conn, "runs", "snapshot"):
+                return select_one_where(self.conn, "runs", "snapshot",
+                                        "run_id", self.run_id)
+        return self._snapshot_raw
 
     @property
     def number_of_results(self):
@@ -309,9 +470,17 @@ class DataSet(Sized):
 
     @property
     def paramspecs(self) -> Dict[str, ParamSpec]:
-        params = self.get_parameters()
-        param_names = [p.name for p in params]
-        return dict(zip(param_names, params))
+        return dict(self._get_cached_paramspecs())
+
+    def _get_cached_paramspecs(self) -> Dict[str, ParamSpec]:
+        """
+        Get the ParamSpecs of the run from the layout cache, loading them
+        from the layouts and dependencies tables on first use
+        """
+        if self._paramspecs is None:
+            params = get_parameters(self.conn, self.run_id)
+            self._paramspecs = {p.name: p for p in params}
+        return self._paramspecs
 
     @property
     def exp_id(self) -> int:
@@ -446,12 +615,16 @@ class DataSet(Sized):
         desc.interdeps = InterDependencies(*desc.interdeps.paramspecs, spec)
         self._description = desc
 
+        if self._paramspecs is not None:
+            self._paramspecs[spec.name] = spec
+
     def get_parameters(self) -> SPECS:
-        return get_parameters(self.conn, self.run_id)
+        return list(self._get_cached_paramspecs().values())
 
     @deprecate(reason=None, alternative="DataSet.add_parameter")  # type: ignore
     def add_parameters(self, specs: SPECS) -> None:
         add_parameter(self.conn, self.table_name, *specs)
+        self._paramspecs = None
 
     def add_metadata(self, tag: str, metadata: Any):
         """
@@ -462,10 +635,29 @@ class DataSet(Sized):
             tag: represents the key in the metadata dictionary
             metadata: actual metadata
         """
+        if tag == 'snapshot' and isinstance(metadata, str):
+            self.add_snapshot(metadata)
+            return
         add_meta_data(self.conn, self.run_id, {tag: metadata})
         # `add_meta_data` does not commit, hence we commit here:
         self.conn.commit()
 
+    def add_snapshot(self, snapshot: str) -> None:
+        """
+        Adds a snapshot to the DataSet. Identical snapshots of different runs
+        are stored only once, and depending on the
+        `qcodes.config.core.snapshot_storage` settings, the snapshot is
+        compressed and/or stored as a patch against the snapshot of the
+        previous run (see `sqlite_base.add_snapshot`).
+
+        Args:
+            snapshot: the snapshot as a JSON string
+        """
+        storage = qcodes.config['core']['snapshot_storage']
+        add_snapshot(self.conn, self.run_id, snapshot,
+                     compress=storage['compress'], delta=storage['delta'])
+        self._snapshot_raw = snapshot
+
     @property
     def started(self) -> bool:
         return self._started
@@ -513,9 +705,10 @@ class DataSet(Sized):
             self._started = True
 
         # TODO: Make this check less fugly
+        paramspecs = self._get_cached_paramspecs()
         for param in results.keys():
-            if self.paramspecs[param].depends_on != '':
-                deps = self.paramspecs[param].depends_on.split(', ')
+            if paramspecs[param].depends_on != '':
+                deps = paramspecs[param].depends_on.split(', ')
                 for dep in deps:
                     if dep not in results.keys():
                         raise ValueError(f'Can not add result for {param}, '
@@ -529,6 +722,9 @@ class DataSet(Sized):
                               list(results.keys()),
                               list(results.values())
                               )
+        if self.subscribers:
+            self._notify_subscribers({param: [value] for param, value
+                                      in results.items()}, 1)
         return index
 
     def add_results(self, results: List[Dict[str, VALUE]]) -> int:
@@ -561,6 +757,46 @@ class DataSet(Sized):
 
         insert_many_values(self.conn, self.table_name, list(expected_keys),
                            values)
+        if self.subscribers:
+            columns = {key: [value[i] for value in values]
+                       for i, key in enumerate(expected_keys)}
+            self._notify_subscribers(columns, len(values))
+        return len_before_add
+
+    def add_results_columnar(self,
+                             results: Mapping[str, Union[np.ndarray,
+                                                         Sequence[VALUE]]]
+                             ) -> int:
+        """
+        Adds a sequence of results to the DataSet given in columnar form,
+        i.e. as one sequence (preferably a numpy array) of values per
+        parameter. This avoids creating a dictionary per result and is the
+        preferred way of adding large amounts of data.
+
+        Args:
+            results: dictionary with the name of a parameter as the key and
+                the sequence of values of that parameter as the value. All
+                sequences must have the same length. Parameters that are not
+                in the dictionary are assumed to be None
+
+        Returns:
+            the index in the DataSet that the **first** result was stored at
+
+        It is an error to provide a value for a key or keyword that is not
+        the name of a parameter in this DataSet.
+
+        It is an error to add results to a completed DataSet.
+        """
+
+        if not self.started:
+            self._perform_start_actions()
+            self._started = True
+
+        len_before_add = length(self.conn, self.table_name)
+
+        n_rows = insert_many_columns(self.conn, self.table_name, results)
+        if self.subscribers and n_rows > 0:
+            self._notify_subscribers(results, n_rows)
         return len_before_add
 
     def modify_result(self, index: int, results: Dict[str, VALUES]) -> None:
@@ -657,6 +893,7 @@ class DataSet(Sized):
 
         with atomic(self.conn) as self.conn:
             add_parameter(self.conn, self.table_name, spec)
+            self._paramspecs = None
             # now add values!
             results = [{spec.name: value} for value in values]
             self.add_results(results)
@@ -712,11 +949,61 @@ class DataSet(Sized):
                         start, end)
         return data
 
+    def get_data_as_arrays(self,
+                           *params: Union[str, ParamSpec, _BaseParameter],
+                           start: Optional[int] = None,
+                           end: Optional[int] = None,
+                           not_null: Optional[str] = None
+                           ) -> Dict[str, np.ndarray]:
+        """
+        Returns the values stored in the DataSet for the specified parameters
+        as one numpy array per parameter. The parameters and the range are
+        specified in the same way as for :py:meth:`get_data`.
+
+        The arrays are filled directly from the database in chunks, and the
+        values of numeric parameters are not passed through the python level
+        converter, which makes this much faster than :py:meth:`get_data` for
+        large datasets. The values of 'array' parameters are stacked along
+        the first axis if all of them have the same shape.
+
+        Args:
+            *params: string parameter names, QCoDeS Parameter objects, and
+                ParamSpec objects
+            start: start value of selection range (by result count); ignored
+                if None
+            end: end value of selection range (by results count); ignored if
+                None
+            not_null: name of a parameter; if given, only the results where
+                this parameter has a value (i.e. is not NULL) are returned
+
+        Returns:
+            dictionary with the parameter names as keys and the arrays of
+            their values as values
+        """
+        valid_param_names = []
+        for maybeParam in params:
+            if isinstance(maybeParam, str):
+                valid_param_names.append(maybeParam)
+                continue
+            else:
+                try:
+                    maybeParam = maybeParam.name
+                except Exception as e:
+                    raise ValueError(
+                        "This parameter does not have  a name") from e
+            valid_param_names.append(maybeParam)
+        if not_null is not None \
+                and not_null not in self._get_cached_paramspecs():
+            raise ValueError('Unknown parameter, not in this DataSet')
+        data = get_data_as_arrays(self.conn, self.table_name,
+                                  valid_param_names, start, end, not_null)
+        return data
+
     def get_values(self, param_name: str) -> List[List[Any]]:
         """
         Get the values (i.e. not NULLs) of the specified parameter
         """
-        if param_name not in self.parameters:
+        if param_name not in self._get_cached_paramspecs():
             raise ValueError('Unknown parameter, not in this DataSet')
 
         values = get_values(self.conn, self.table_name, param_name)
@@ -732,13 +1019,16 @@ class DataSet(Sized):
                 setpoints
         """
 
-        if param_name not in self.parameters:
+        paramspecs = self._get_cached_paramspecs()
+        if param_name not in paramspecs:
             raise ValueError('Unknown parameter, not in this DataSet')
 
-        if self.paramspecs[param_name].depends_on == '':
+        depends_on = paramspecs[param_name].depends_on
+        if depends_on == '':
             raise ValueError(f'Parameter {param_name} has no setpoints.')
 
-        setpoints = get_setpoints(self.conn, self.table_name, param_name)
+        setpoints = get_setpoints(self.conn, self.table_name, param_name,
+                                  depends_on.split(', '))
 
         return setpoints
 
@@ -747,25 +1037,59 @@ class DataSet(Sized):
                   min_wait: int = 0,
                   min_count: int = 1,
                   state: Optional[Any] = None,
-                  callback_kwargs: Optional[Dict[str, Any]] = None
+                  callback_kwargs: Optional[Dict[str, Any]] = None,
+                  pool: Optional[_SubscriberPool] = None
                   ) -> str:
+        """
+        Subscribe to the results added to this DataSet
+
+        Args:
+            callback: the function to call with the new results. It is
+                called with three arguments: a list of result tuples (one
+                value per parameter of the DataSet), the length of the
+                DataSet, and the `state`
+            min_wait: the minimal time in milliseconds between two calls of
+                the callback
+            min_count: the minimal number of new results for which the
+                callback is called
+            state: a mutable object that is passed to the callback
+            callback_kwargs: additional keyword arguments to the callback
+            pool: the pool of worker threads that calls the callback. By
+                default all subscribers share one pool.
+
+        Returns:
+            the id of the subscriber
+        """
         subscriber_id = uuid.uuid4().hex
         subscriber = _Subscriber(self, subscriber_id, callback, state,
-                                 min_wait, min_count, callback_kwargs)
+                                 min_wait, min_count, callback_kwargs,
+                                 pool)
         self.subscribers[subscriber_id] = subscriber
-        subscriber.start()
         return subscriber_id
 
     def unsubscribe(self, uuid: str) -> None:
         """
         Remove subscriber with the provided uuid
         """
-        with atomic(self.conn) as self.conn:
-            self._remove_trigger(uuid)
-            sub = self.subscribers[uuid]
-            sub.schedule_stop()
-            sub.join()
-            del self.subscribers[uuid]
+        sub = self.subscribers[uuid]
+        sub.schedule_stop()
+        sub.join()
+        del self.subscribers[uuid]
+
+    def _notify_subscribers(self,
+                            columns: Mapping[str, Union[np.ndarray,
+                                                        Sequence[VALUE]]],
+                            n_rows: int) -> None:
+        """
+        Hand a batch of results that has just been written to the database
+        over to the subscribers
+
+        Args:
+            columns: dictionary of parameter names and sequences of values
+            n_rows: the number of results in the batch
+        """
+        for sub in list(self.subscribers.values()):
+            sub._cache_data_to_queue(columns, n_rows)
 
     def _remove_trigger(self, name):
         transaction(self.conn, f"DROP TRIGGER IF EXISTS {name};")
@@ -773,6 +1097,9 @@ class DataSet(Sized):
     def unsubscribe_all(self):
         """
         Remove all subscribers
+
+        Triggers that subscribers of earlier versions of QCoDeS have left
+        in the database are removed as well.
         """
         sql = "select * from sqlite_master where type = 'trigger';"
         triggers = atomic_transaction(self.conn, sql).fetchall()
@@ -785,6 +1112,10 @@ class DataSet(Sized):
             self.subscribers.clear()
 
     def get_metadata(self, tag):
+        if tag == 'snapshot':
+            snapshot = self.snapshot_raw
+            if snapshot is not None:
+                return snapshot
         return get_metadata(self.conn, tag, self.table_name)
 
     def __len__(self) -> int:
@@ -804,7 +1135,7 @@ class DataSet(Sized):
 
 
 # public api
-def load_by_id(run_id: int) -> DataSet:
+def load_by_id(run_id: int, read_only: bool = False) -> DataSet:
     """
     Load dataset by run id
 
@@ -812,6 +1143,10 @@ def load_by_id(run_id: int) -> DataSet:
 
     Args:
         run_id: run id of the dataset
+        read_only: if True, the dataset is loaded through a read-only
+            connection to the database. Use this for loading data for
+            plotting or exporting while a measurement is writing to the
+            same database.
 
     Returns:
         dataset with the given run id
@@ -819,11 +1154,16 @@ def load_by_id(run_id: int) -> DataSet:
     if run_id is None:
         raise ValueError('run_id has to be a positive integer, not None.')
 
-    d = DataSet(path_to_db=get_DB_location(), run_id=run_id)
+    if read_only:
+        conn = connect(get_DB_location(), read_only=True)
+        d = DataSet(run_id=run_id, conn=conn)
+    else:
+        d = DataSet(path_to_db=get_DB_location(), run_id=run_id)
     return d
 
 
-def load_by_counter(counter: int, exp_id: int) -> DataSet:
+def load_by_counter(counter: int, exp_id: int,
+                    read_only: bool = False) -> DataSet:
     """
     Load a dataset given its counter in a given experiment
 
@@ -832,6 +1172,8 @@ def load_by_counter(counter: int, exp_id: int) -> DataSet:
     Args:
         counter: counter of the dataset within the given experiment
         exp_id: id of the experiment where to look for the dataset
+        read_only: if True, the dataset is loaded through a read-only
+            connection to the database
 
     Returns:
         dataset of the given counter in the given experiment
@@ -849,7 +1191,7 @@ def load_by_counter(counter: int, exp_id: int) -> DataSet:
     run_id = one(c, 'run_id')
     conn.close()
 
-    d = DataSet(get_DB_location(), run_id=run_id)
+    d = load_by_id(run_id, read_only=read_only)
     return d
 
 
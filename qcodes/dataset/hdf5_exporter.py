@@ -0,0 +1,257 @@
+"""
+Incremental export of the results of a run to an HDF5 file.
+
+The results table of the run is streamed out of the database in chunks of
+rows, and every parameter is written to its own chunked, compressed and
+resizable HDF5 dataset along a shared row dimension. The setpoints of a
+dependent parameter are attached to its dataset as dimension scales. Since
+the number of exported rows is stored in the file, an export can be resumed
+later to mirror a run that is still growing.
+"""
+from typing import Dict, Optional, Tuple
+import logging
+
+import h5py
+import numpy as np
+
+from qcodes.dataset.data_set import DataSet
+from qcodes.dataset.param_spec import ParamSpec
+
+log = logging.getLogger(__name__)
+
+_STRING_DTYPE = h5py.special_dtype(vlen=str)
+
+
+def export_to_hdf5(dataset: DataSet, path: str,
+                   chunk_size: int = 10000,
+                   compression: Optional[str] = 'gzip') -> int:
+    """
+    Export the results of a run to an HDF5 file, or add the results that
+    have been stored since the last export of the same run to that file.
+
+    The results are read from the database ``chunk_size`` rows at a time and
+    appended to the file before the next chunk is read, so the memory used
+    does not depend on the size of the run. Every parameter becomes a
+    dataset in the root group of the file, with the results along the first
+    axis. Results in which a parameter has no value are NaN (or '' for
+    'text' parameters) in its dataset. The dataset of a parameter with
+    integer values keeps their integer dtype until a value is missing or
+    not an integer, then it is converted to float64. The label, unit,
+    paramtype, depends_on and inferred_from of the parameter are stored as
+    attributes.
+
+    Args:
+        dataset: the DataSet of the run to export
+        path: the path to the HDF5 file; it is created if it does not exist
+        chunk_size: the number of rows to read from the database at a time
+        compression: the HDF5 compression filter of the datasets, or None
+
+    Returns:
+        the number of rows exported to the file in total
+
+    Raises:
+        ValueError: if the file holds the export of a different run, or if
+            the values of an 'array' parameter change shape
+    """
+    with h5py.File(path, 'a') as file:
+        if 'guid' not in file.attrs:
+            file.attrs['guid'] = dataset.guid
+            file.attrs['run_id'] = dataset.run_id
+            file.attrs['exported_rows'] = 0
+        elif file.attrs['guid'] != dataset.guid:
+            raise ValueError(f'{path} holds the export of run '
+                             f'{file.attrs["guid"]}, not of run '
+                             f'{dataset.guid}.')
+
+        exported_rows = int(file.attrs['exported_rows'])
+        paramspecs = dataset.paramspecs
+
+        # an export that was interrupted halfway through a chunk may have
+        # left rows behind that are not counted as exported
+        for name in paramspecs:
+            if name in file and len(file[name]) != exported_rows:
+                file[name].resize(exported_rows, axis=0)
+
+        total_rows = len(dataset)
+        names = list(paramspecs)
+        while exported_rows < total_rows:
+            end = min(exported_rows + chunk_size, total_rows)
+            chunk = dataset.get_data_as_arrays(*names, start=exported_rows,
+                                               end=end)
+            for name, spec in paramspecs.items():
+                _append(file, spec, chunk[name], exported_rows, end,
+                        compression)
+            _attach_setpoints(file, paramspecs)
+            exported_rows = end
+            file.attrs['exported_rows'] = exported_rows
+            file.flush()
+            log.debug(f'Exported {exported_rows} of {total_rows} rows of '
+                      f'run {dataset.run_id} to {path}')
+
+    return exported_rows
+
+
+def _append(file: h5py.File, spec: ParamSpec, values: np.ndarray,
+            start: int, end: int, compression: Optional[str]) -> None:
+    """
+    Write the values of the rows from start to end of a parameter to its
+    dataset in the file, creating the dataset if it does not exist yet
+    """
+    n_rows = end - start
+    if spec.type == 'text':
+        data = np.array(['' if value is None else value
+                         for value in values], dtype=object)
+        shape: Tuple[int, ...] = ()
+    elif spec.type == 'array':
+        data, shape = _stack_arrays(spec, values, n_rows, file)
+        if data is None:
+            # the shape of the values is not known before the first value,
+            # and the rows without a value are filled in on creation
+            return
+    else:
+        data = _numeric(values)
+        shape = ()
+
+    if spec.name not in file:
+        _create_dataset(file, spec, start, shape, data.dtype, compression)
+    elif _is_integer(file[spec.name].dtype) and not _is_integer(data.dtype):
+        _convert_to_float(file, spec.name)
+    h5dataset = file[spec.name]
+    h5dataset.resize(end, axis=0)
+    h5dataset[start:end] = data
+
+
+def _stack_arrays(spec: ParamSpec, values: np.ndarray, n_rows: int,
+                  file: h5py.File
+                  ) -> Tuple[Optional[np.ndarray], Tuple[int, ...]]:
+    """
+    Stack the values of an 'array' parameter into an array with the rows
+    along the first axis, filling rows without a value with NaN. Returns
+    None if there is no value and no dataset to take the shape from.
+    """
+    if values.dtype != object and values.ndim > 1:
+        shape = values.shape[1:]
+        data = _numeric(values)
+    else:
+        known = [value for value in values if value is not None]
+        if spec.name in file:
+            shape = file[spec.name].shape[1:]
+        elif known:
+            shape = np.shape(known[0])
+        else:
+            return None, ()
+        data = np.full((n_rows,) + shape, np.nan)
+        for row, value in enumerate(values):
+            if value is None:
+                continue
+            if np.shape(value) != shape:
+                raise ValueError(f'Can not export {spec.name}, its values '
+                                 f'change shape from {shape} to '
+                                 f'{np.shape(value)}.')
+            data[row] = value
+
+    if spec.name in file and file[spec.name].shape[1:] != shape:
+        raise ValueError(f'Can not export {spec.name}, its values change '
+                         f'shape from {file[spec.name].shape[1:]} to '
+                         f'{shape}.')
+    return data, shape
+
+
+def _is_integer(dtype: np.dtype) -> bool:
+    return dtype.kind in 'iu'
+
+
+def _numeric(values: np.ndarray) -> np.ndarray:
+    """
+    The values of a numeric or array parameter as an array of their own
+    integer dtype, so that large integers keep their precision, or else as
+    float64 with NaN for missing values
+    """
+    if _is_integer(values.dtype):
+        return values
+    return values.astype(float)
+
+
+def _create_dataset(file: h5py.File, spec: ParamSpec, n_rows: int,
+                    shape: Tuple[int, ...], data_dtype: np.dtype,
+                    compression: Optional[str]) -> None:
+    """
+    Create the resizable dataset of a parameter with n_rows rows, which are
+    filled with NaN (or ''). The dataset takes the integer dtype of the data
+    if there are no rows to fill, and is float64 otherwise.
+    """
+    if spec.type == 'text':
+        dtype = _STRING_DTYPE
+        fillvalue = None
+    elif _is_integer(data_dtype) and n_rows == 0:
+        dtype = data_dtype
+        fillvalue = None
+    else:
+        dtype = np.float64
+        fillvalue = np.nan
+
+    h5dataset = file.create_dataset(spec.name, shape=(n_rows,) + shape,
+                                    maxshape=(None,) + shape, dtype=dtype,
+                                    chunks=True, compression=compression,
+                                    fillvalue=fillvalue)
+    h5dataset.attrs['label'] = spec.label
+    h5dataset.attrs['unit'] = spec.unit
+    h5dataset.attrs['paramtype'] = spec.type
+    h5dataset.attrs['depends_on'] = spec.depends_on
+    h5dataset.attrs['inferred_from'] = spec.inferred_from
+
+
+def _convert_to_float(file: h5py.File, name: str) -> None:
+    """
+    Replace the integer dataset of a parameter by a float64 dataset with the
+    same values, once a value is missing or not an integer. The values are
+    copied one chunk at a time. The dimension scales of the datasets
+    involved are detached and attached again by `_attach_setpoints`.
+    """
+    old = file[name]
+    for h5dataset in file.values():
+        scales = list(h5dataset.dims[0].values())
+        if h5dataset.name == old.name or name in h5dataset.dims[0].keys():
+            for scale in scales:
+                h5dataset.dims[0].detach_scale(scale)
+
+    tmp_name = f'{name}__converting'
+    new = file.create_dataset(tmp_name, shape=old.shape,
+                              maxshape=old.maxshape, dtype=np.float64,
+                              chunks=old.chunks,
+                              compression=old.compression,
+                              fillvalue=np.nan)
+    for key in ('label', 'unit', 'paramtype', 'depends_on', 'inferred_from'):
+        new.attrs[key] = old.attrs[key]
+    step = old.chunks[0]
+    for begin in range(0, len(old), step):
+        new[begin:begin + step] = old[begin:begin + step]
+    del file[name]
+    file.move(tmp_name, name)
+
+
+def _attach_setpoints(file: h5py.File,
+                      paramspecs: Dict[str, ParamSpec]) -> None:
+    """
+    Attach the datasets of the setpoints of the dependent parameters to
+    their datasets as dimension scales of the row axis, once the datasets
+    of a dependent and of all of its setpoints exist. Setpoints that are
+    not one value per row can not be dimension scales and are only listed
+    in the depends_on attribute.
+    """
+    for spec in paramspecs.values():
+        if spec.depends_on == '' or spec.name not in file:
+            continue
+        h5dataset = file[spec.name]
+        if len(h5dataset.dims[0]) > 0:
+            continue
+        setpoints = spec.depends_on.split(', ')
+        if not all(name in file for name in setpoints):
+            continue
+        for name in setpoints:
+            scale = file[name]
+            if scale.ndim != 1 or paramspecs[name].depends_on != '':
+                continue
+            if not h5py.h5ds.is_scale(scale.id):
+                h5dataset.dims.create_scale(scale, name)
+            h5dataset.dims[0].attach_scale(scale)
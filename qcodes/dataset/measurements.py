@@ -1,9 +1,12 @@
+import itertools
 import json
 import logging
+from queue import Queue
+from threading import Thread
 from time import monotonic
 from collections import OrderedDict
 from typing import (Callable, Union, Dict, Tuple, List, Sequence, cast,
-                    MutableMapping, MutableSequence, Optional, Any)
+                    Mapping, MutableMapping, MutableSequence, Optional, Any)
 from inspect import signature
 from numbers import Number
 
@@ -16,7 +19,10 @@ from qcodes.instrument.parameter import ArrayParameter, _BaseParameter, \
 from qcodes.dataset.experiment_container import Experiment
 from qcodes.dataset.param_spec import ParamSpec
 from qcodes.dataset.data_set import DataSet
+from qcodes.dataset.sqlite_base import (connect, insert_many_columns,
+                                        path_to_dbfile)
 from qcodes.utils.helpers import NumpyJSONEncoder
+from qcodes.utils.threading import get_concurrently
 
 log = logging.getLogger(__name__)
 
@@ -44,6 +50,113 @@ def is_number(thing: Any) -> bool:
         return False
 
 
+def _chunk_parameters(chunk: Mapping[str, Any]) -> Tuple[str, ...]:
+    """
+    The names of the parameters of a chunk of results, in order
+    """
+    return tuple(chunk)
+
+
+class DataWriteError(Exception):
+    """
+    Raised when the background writer of a DataSaver failed to write results
+    to the database
+    """
+    pass
+
+
+class _BackgroundWriter(Thread):
+    """
+    A thread that writes batches of results of a DataSet to the database.
+
+    The thread has its own connection to the database file of the DataSet,
+    so the SQLite commits do not block the thread that produces the
+    results. Batches are handed over via a bounded queue: once
+    `max_queue_size` batches are waiting, `submit` blocks until the writer
+    has caught up.
+
+    The first error that occurs while writing is kept and raised (as a
+    DataWriteError) to the caller on the next call to `submit` or `stop`.
+    Batches submitted after a failure are discarded.
+
+    The _BackgroundWriter is not meant to be instantiated directly, but is
+    used by the DataSaver if the measurement is run with
+    `write_in_background=True`.
+    """
+
+    def __init__(self, dataset: DataSet, max_queue_size: int = 10) -> None:
+        super().__init__(name=f"_BackgroundWriter-{dataset.run_id}",
+                         daemon=True)
+        self._dataset = dataset
+        self._path_to_db = path_to_dbfile(dataset.conn)
+        if self._path_to_db == '':
+            raise ValueError("Can not write to an in-memory database in "
+                             "the background.")
+        self._table_name = dataset.table_name
+        self._queue: Queue = Queue(maxsize=max_queue_size)
+        self._error: Optional[Exception] = None
+
+    def run(self) -> None:
+        conn = connect(self._path_to_db)
+        try:
+            while True:
+                columns = self._queue.get()
+                try:
+                    if columns is None:
+                        break
+                    if self._error is None:
+                        self._write(conn, columns)
+                finally:
+                    self._queue.task_done()
+        finally:
+            conn.close()
+
+    def _write(self, conn, columns: Mapping[str, Union[np.ndarray, List]]
+               ) -> None:
+        try:
+            n_rows = insert_many_columns(conn, self._table_name, columns)
+        except Exception as e:
+            log.exception('Could not commit to database')
+            self._error = e
+            return
+        log.debug(f'Background writer wrote {n_rows} results')
+        if self._dataset.subscribers and n_rows > 0:
+            self._dataset._notify_subscribers(columns, n_rows)
+
+    def raise_if_failed(self) -> None:
+        """
+        Raise a DataWriteError if writing to the database has failed
+        """
+        if self._error is not None:
+            raise DataWriteError(f'Could not commit to database; '
+                                 f'{self._error}') from self._error
+
+    def submit(self, columns: Mapping[str, Union[np.ndarray, List]]
+               ) -> None:
+        """
+        Queue a batch of results for writing. Blocks while the queue is full.
+        """
+        self.raise_if_failed()
+        self._queue.put(columns)
+
+    def drain(self) -> None:
+        """
+        Wait until all queued batches have been written
+        """
+        self._queue.join()
+        self.raise_if_failed()
+
+    def stop(self) -> None:
+        """
+        Write all queued batches, stop the thread and raise if any write
+        has failed
+        """
+        if self.is_alive():
+            self._queue.put(None)
+            self.join()
+        self.raise_if_failed()
+
+
 class DataSaver:
     """
     The class used by the Runner context manager to handle the datasaving to
@@ -53,7 +166,9 @@ class DataSaver:
     default_callback: Optional[dict] = None
 
     def __init__(self, dataset: DataSet, write_period: numeric_types,
-                 parameters: Dict[str, ParamSpec]) -> None:
+                 parameters: Dict[str, ParamSpec],
+                 write_in_background: bool = False,
+                 max_queue_size: int = 10) -> None:
         self._dataset = dataset
         if DataSaver.default_callback is not None \
                 and 'run_tables_subscription_callback' \
@@ -76,7 +191,8 @@ class DataSaver:
         self.write_period = float(write_period)
         self.parameters = parameters
         self._known_parameters = list(parameters.keys())
-        self._results: List[dict] = []  # will be filled by addResult
+        # will be filled by add_result with chunks of columns
+        self._results: List[Dict[str, Union[np.ndarray, List]]] = []
         self._last_save_time = monotonic()
         self._known_dependencies: Dict[str, List[str]] = {}
         for param, parspec in parameters.items():
@@ -84,6 +200,11 @@ class DataSaver:
                 self._known_dependencies.update(
                     {str(param): parspec.depends_on.split(', ')})
 
+        self._writer: Optional[_BackgroundWriter] = None
+        if write_in_background:
+            self._writer = _BackgroundWriter(dataset, max_queue_size)
+            self._writer.start()
+
     def add_result(self, *res_tuple: res_type) -> None:
         """
         Add a result to the measurement results. Represents a measurement
@@ -107,6 +228,13 @@ class DataSaver:
         However, if the parameter is registered as array type the numpy arrays
         are not unraveled but stored directly for improved performance.
 
+        This also means that a whole sweep can be added at once, for
+        example the setpoints of a hardware sweep together with the buffered
+        readback:
+        >> setpoints = dac.voltage.sweep(0, 1, num=10000).to_hardware_list()
+        >> datasaver.add_result((dac.voltage, setpoints),
+        ..                      (lockin.buffer, lockin.buffer.get()))
+
         Args:
             res_tuple: a tuple with the first element being the parameter name
                 and the second element is the corresponding value(s) at this
@@ -225,43 +353,83 @@ class DataSaver:
             self.flush_data_to_database()
             self._last_save_time = monotonic()
 
+    def get_and_add_result(self, *parameters: _BaseParameter,
+                           setpoints: Sequence[res_type] = (),
+                           timeout: Optional[float] = None) -> None:
+        """
+        Get parameters concurrently and add their values as one result,
+        together with the values of the setpoints. The parameters of
+        different instruments are read at the same time, see
+        :func:`qcodes.utils.threading.get_concurrently`. The call
+        >> datasaver.get_and_add_result(dmm1.v, dmm2.v,
+        ..                              setpoints=[(dac.ch1, v)])
+        adds the same result as
+        >> datasaver.add_result((dac.ch1, v), (dmm1.v, dmm1.v()),
+        ..                      (dmm2.v, dmm2.v()))
+
+        Args:
+            parameters: the parameters to get
+            setpoints: tuples of parameters and their values, as for
+                `add_result`, to add along with the values of parameters
+            timeout: the time in seconds to wait for all values
+
+        Raises:
+            asyncio.TimeoutError: if not all values arrive within the
+                timeout. No result is added then.
+        """
+        values = get_concurrently(parameters, timeout)
+        self.add_result(*setpoints, *zip(parameters, values))
+
     def _append_results(self, res: Sequence[res_type],
                         input_size: int) -> None:
         """
         A private method to add the data to actual queue of data to be written.
+        The data is stored as a chunk of columns, one numpy array (or list)
+        of length `input_size` per parameter.
 
         Args:
             res: A sequence of the data to be added
             input_size: The length of the data to be added. 1 if its
                 to be inserted as arrays.
         """
-        for index in range(input_size):
-            res_dict = {}
-            for partial_result in res:
-                param = str(partial_result[0])
-                value = partial_result[1]
-                param_spec = self.parameters[param]
-                if param_spec.type == 'array' and index == 0:
-                    res_dict[param] = value
-                elif param_spec.type != 'array':
-                    # For compatibility with the old Loop, setpoints are
-                    # tuples of numbers (usually tuple(np.linspace(...))
-                    if hasattr(value, '__len__') and not isinstance(value, str):
-                        value = cast(Union[Sequence, np.ndarray], value)
-                        if isinstance(value, np.ndarray):
-                            # this is significantly faster than atleast_1d
-                            # espcially for non 0D arrays
-                            # because we already know that this is a numpy
-                            # array and just one numpy array. atleast_1d
-                            # performs additional checks.
-                            if value.ndim == 0:
-                                value = value.reshape(1)
-                            value = value.ravel()
-                        res_dict[param] = value[index]
-                    else:
-                        res_dict[param] = value
-            if len(res_dict) > 0:
-                self._results.append(res_dict)
+        columns: Dict[str, Union[np.ndarray, List]] = {}
+        for partial_result in res:
+            param = str(partial_result[0])
+            value = partial_result[1]
+            param_spec = self.parameters[param]
+            if param_spec.type == 'array':
+                columns[param] = [value]
+            # For compatibility with the old Loop, setpoints are
+            # tuples of numbers (usually tuple(np.linspace(...))
+            elif hasattr(value, '__len__') and not isinstance(value, str):
+                # copied, since the caller may reuse its array for the
+                # next result before the buffered results are flushed
+                value = np.array(value, copy=True).ravel()
+                if len(value) == 1 and input_size > 1:
+                    value = np.repeat(value, input_size)
+                columns[param] = value
+            else:
+                columns[param] = [value] * input_size
+        if len(columns) > 0:
+            self._results.append(columns)
+
+    @staticmethod
+    def _merge_chunks(chunks: Sequence[Dict[str, Union[np.ndarray, List]]]
+                      ) -> Dict[str, Union[np.ndarray, List]]:
+        """
+        Concatenate column chunks that all have the same set of parameters
+        into a single chunk.
+        """
+        if len(chunks) == 1:
+            return chunks[0]
+        merged: Dict[str, Union[np.ndarray, List]] = {}
+        for param in chunks[0]:
+            parts = [chunk[param] for chunk in chunks]
+            if all(isinstance(part, np.ndarray) for part in parts):
+                merged[param] = np.concatenate(parts)
+            else:
+                merged[param] = list(itertools.chain.from_iterable(parts))
+        return merged
 
     def _unbundle_arrayparameter(self,
                                  parameter: ArrayParameter,
@@ -375,24 +543,77 @@ class DataSaver:
     def flush_data_to_database(self) -> None:
         """
         Write the in-memory results to the database.
+
+        Consecutive chunks of results for the same set of parameters are
+        written with a single columnar insert.
         """
         log.debug('Flushing to database')
-        if self._results != []:
+        if self._writer is not None:
+            self._hand_over_to_writer()
+        elif self._results != []:
+            write_point = None
             try:
-                write_point = self._dataset.add_results(self._results)
+                for _, group in itertools.groupby(
+                        self._results, key=_chunk_parameters):
+                    chunks = list(group)
+                    columns = self._merge_chunks(chunks)
+                    index = self._dataset.add_results_columnar(columns)
+                    if write_point is None:
+                        write_point = index
+                    # drop what has been written so that a failure further
+                    # down the line does not write anything twice
+                    self._results = self._results[len(chunks):]
                 log.debug(f'Successfully wrote from index {write_point}')
-                self._results = []
             except Exception as e:
                 log.warning(f'Could not commit to database; {e}')
         else:
             log.debug('No results to flush')
 
+    def _hand_over_to_writer(self) -> None:
+        """
+        Hand the in-memory results over to the background writer, one
+        columnar batch per group of consecutive chunks with the same
+        parameters.
+
+        Raises:
+            DataWriteError: if the background writer failed to write
+                earlier results
+        """
+        writer = self._writer
+        writer.raise_if_failed()
+        if self._results == []:
+            log.debug('No results to flush')
+            return
+        if not self._dataset.started:
+            self._dataset._perform_start_actions()
+            self._dataset._started = True
+        results, self._results = self._results, []
+        for _, group in itertools.groupby(
+                results, key=_chunk_parameters):
+            writer.submit(self._merge_chunks(list(group)))
+
+    def _finish_writing(self) -> None:
+        """
+        Flush the remaining results and wait for them to be written to the
+        database
+
+        Raises:
+            DataWriteError: if writing any of the results failed
+        """
+        try:
+            self.flush_data_to_database()
+        finally:
+            if self._writer is not None:
+                self._writer.stop()
+
     @property
     def run_id(self) -> int:
         return self._dataset.run_id
 
     @property
     def points_written(self) -> int:
+        if self._writer is not None:
+            self._writer.drain()
         return self._dataset.number_of_results
 
     @property
@@ -420,7 +641,8 @@ class Runner:
             name: str = '',
             subscribers: Sequence[Tuple[Callable,
                                         Union[MutableSequence,
-                                              MutableMapping]]] = None) -> None:
+                                              MutableMapping]]] = None,
+            write_in_background: bool = False) -> None:
 
         self.enteractions = enteractions
         self.exitactions = exitactions
@@ -439,6 +661,7 @@ class Runner:
         self.write_period = float(write_period) \
             if write_period is not None else 5.0
         self.name = name if name else 'results'
+        self.write_in_background = write_in_background
 
     def __enter__(self) -> DataSaver:
         # TODO: should user actions really precede the dataset?
@@ -461,10 +684,8 @@ class Runner:
             station = self.station
 
         if station:
-            self.ds.add_metadata('snapshot',
-                                 json.dumps({'station': station.snapshot()},
-                                            cls=NumpyJSONEncoder)
-                                 )
+            self.ds.add_snapshot(json.dumps({'station': station.snapshot()},
+                                            cls=NumpyJSONEncoder))
 
         if self.parameters is not None:
             for paramspec in self.parameters.values():
@@ -484,13 +705,19 @@ class Runner:
 
         self.datasaver = DataSaver(dataset=self.ds,
                                    write_period=self.write_period,
-                                   parameters=self.parameters)
+                                   parameters=self.parameters,
+                                   write_in_background=self.write_in_background)
 
         return self.datasaver
 
     def __exit__(self, exception_type, exception_value, traceback) -> None:
 
-        self.datasaver.flush_data_to_database()
+        write_error: Optional[DataWriteError] = None
+        try:
+            self.datasaver._finish_writing()
+        except DataWriteError as e:
+            log.exception('Could not write all results to the database')
+            write_error = e
 
         # perform the "teardown" events
         for func, args in self.exitactions:
@@ -502,6 +729,10 @@ class Runner:
 
         self.ds.unsubscribe_all()
 
+        # do not mask an exception raised inside the context
+        if write_error is not None and exception_type is None:
+            raise write_error
+
 
 class Measurement:
     """
@@ -872,13 +1103,21 @@ class Measurement:
         """
         self.subscribers.append((func, state))
 
-    def run(self) -> Runner:
+    def run(self, write_in_background: bool = False) -> Runner:
         """
         Returns the context manager for the experimental run
+
+        Args:
+            write_in_background: if True, results are written to the
+                database by a separate thread so that writing does not
+                block the measurement loop. Errors that occur while writing
+                are raised as DataWriteError from the next `add_result`
+                that flushes or when exiting the context.
         """
         return Runner(self.enteractions, self.exitactions,
                       self.experiment, station=self.station,
                       write_period=self._write_period,
                       parameters=self.parameters,
                       name=self.name,
-                      subscribers=self.subscribers)
+                      subscribers=self.subscribers,
+                      write_in_background=write_in_background)
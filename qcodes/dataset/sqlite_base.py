@@ -1,11 +1,16 @@
 import sys
 from contextlib import contextmanager
+import hashlib
+import json
 import logging
 import sqlite3
 import time
 import io
+import pathlib
+import struct
+import zlib
 from typing import (Any, List, Optional, Tuple, Union, Dict, cast, Callable,
-                    Sequence, DefaultDict)
+                    Mapping, Sequence, DefaultDict, Set)
 import itertools
 from functools import wraps
 from collections import defaultdict
@@ -75,6 +80,20 @@ CREATE TABLE IF NOT EXISTS runs (
 );
 """
 
+_snapshots_table_schema = """
+CREATE TABLE IF NOT EXISTS snapshots (
+    -- the SHA-256 hex digest of the JSON of the snapshot
+    snapshot_hash TEXT PRIMARY KEY,
+    -- 'json' for plain and 'zlib' for zlib-compressed UTF-8 text
+    encoding TEXT NOT NULL,
+    -- if not NULL, data is a JSON patch against the snapshot of this hash
+    base_hash TEXT,
+    -- the number of patches to apply to get to this snapshot
+    depth INTEGER NOT NULL,
+    data BLOB NOT NULL
+);
+"""
+
 _layout_table_schema = """
 CREATE TABLE IF NOT EXISTS layouts (
     layout_id INTEGER PRIMARY KEY,
@@ -169,8 +188,9 @@ def upgrader(func: Callable[[SomeConnection], None]):
 
 
 # utility function to allow sqlite/numpy type
-def _adapt_array(arr: ndarray) -> sqlite3.Binary:
+def _adapt_array_npy(arr: ndarray) -> sqlite3.Binary:
     """
+    Legacy array adapter storing the array in the .npy format.
     See this:
     https://stackoverflow.com/questions/3425320/sqlite3-programmingerror-you-must-not-use-8-bit-bytestrings-unless-you-use-a-te
     """
@@ -180,12 +200,72 @@ def _adapt_array(arr: ndarray) -> sqlite3.Binary:
     return sqlite3.Binary(out.read())
 
 
-def _convert_array(text: bytes) -> ndarray:
+def _convert_array_npy(text: bytes) -> ndarray:
+    """
+    Legacy array converter for blobs stored in the .npy format.
+    """
     out = io.BytesIO(text)
     out.seek(0)
     return np.load(out)
 
 
+# The compact array blob format (used from database version 4 and up) is a
+# small fixed header followed by the raw C-ordered data buffer. The header is
+#   magic (4 bytes), length of the dtype string (uint8), ndim (uint8),
+#   dtype string (ascii, e.g. '<f8'), shape (ndim * int64)
+# and is padded with zeros to a multiple of 8 bytes to keep the data aligned.
+# The magic starts with the same non-ascii byte as .npy blobs do, but is
+# otherwise different from the .npy magic, hence the two formats can always
+# be told apart.
+_ARRAY_MAGIC = b'\x93QCA'
+_ARRAY_HEADER = struct.Struct('<4sBB')
+
+
+def _adapt_array(arr: ndarray) -> sqlite3.Binary:
+    """
+    Adapt a numpy array to a blob in the compact array format. Arrays of
+    object dtype can not be represented as a raw buffer, and the dtype
+    string of a structured dtype does not hold its fields, hence such arrays
+    are stored in the legacy .npy format instead.
+    """
+    if arr.dtype.hasobject or arr.dtype.fields is not None:
+        return _adapt_array_npy(arr)
+    dtype_str = arr.dtype.str.encode('ascii')
+    header = (_ARRAY_HEADER.pack(_ARRAY_MAGIC, len(dtype_str), arr.ndim)
+              + dtype_str
+              + struct.pack(f'<{arr.ndim}q', *arr.shape))
+    header += b'\x00' * (-len(header) % 8)
+    # tobytes copies the data in C order, also of non-contiguous arrays
+    return sqlite3.Binary(header + arr.tobytes())
+
+
+def _convert_array(text: bytes, copy: bool = True) -> ndarray:
+    """
+    Convert a blob to a numpy array. Legacy .npy blobs are read with
+    `np.load`.
+
+    Args:
+        text: the blob
+        copy: whether to copy the data out of a blob in the compact array
+            format. If False, the returned array is a read-only view of the
+            blob, which is only safe if the caller copies it anyway.
+    """
+    if bytes(text[:4]) != _ARRAY_MAGIC:
+        return _convert_array_npy(text)
+    _, dtype_len, ndim = _ARRAY_HEADER.unpack_from(text)
+    offset = _ARRAY_HEADER.size
+    dtype_str = bytes(text[offset:offset + dtype_len]).decode('ascii')
+    dtype = np.dtype(dtype_str)
+    offset += dtype_len
+    shape = struct.unpack_from(f'<{ndim}q', text, offset)
+    offset += 8 * ndim
+    offset += -offset % 8
+    count = int(np.prod(shape))
+    arr = np.frombuffer(text, dtype=dtype, count=count,
+                        offset=offset).reshape(shape)
+    return arr.copy() if copy else arr
+
+
 this_session_default_encoding = sys.getdefaultencoding()
 
 
@@ -287,18 +367,22 @@ def many_many(curr: sqlite3.Cursor, *columns: str) -> List[List[Any]]:
 
 
 def connect(name: str, debug: bool = False,
-            version: int=-1) -> sqlite3.Connection:
+            version: int=-1, read_only: bool = False) -> sqlite3.Connection:
     """
     Connect or create  database. If debug the queries will be echoed back.
     This function takes care of registering the numpy/sqlite type
     converters that we need.
 
+    The connection is tuned according to the connection profile in
+    `qcodes.config.core.db_connection` (see `apply_connection_profile`).
 
     Args:
         name: name or path to the sqlite file
         debug: whether or not to turn on tracing
         version: which version to create. We count from 0. -1 means 'latest'
           Should always be left at -1 except when testing.
+        read_only: if True, the database is opened in read-only mode. The
+          database must exist and is neither created nor upgraded.
 
     Returns:
         conn: connection object to the database
@@ -311,7 +395,16 @@ def connect(name: str, debug: bool = False,
     # register binary(TEXT) -> numpy converter
     # for some reasons mypy complains about this
     sqlite3.register_converter("array", _convert_array)
-    conn = sqlite3.connect(name, detect_types=sqlite3.PARSE_DECLTYPES)
+    profile = qc.config['core']['db_connection']
+    timeout = profile['busy_timeout'] / 1000
+    if read_only:
+        conn = sqlite3.connect(f"{pathlib.Path(name).resolve().as_uri()}"
+                               f"?mode=ro",
+                               detect_types=sqlite3.PARSE_DECLTYPES,
+                               timeout=timeout, uri=True)
+    else:
+        conn = sqlite3.connect(name, detect_types=sqlite3.PARSE_DECLTYPES,
+                               timeout=timeout)
     # sqlite3 options
     conn.row_factory = sqlite3.Row
 
@@ -330,11 +423,62 @@ def connect(name: str, debug: bool = False,
     if debug:
         conn.set_trace_callback(print)
 
-    init_db(conn)
-    perform_db_upgrade(conn, version=version)
+    apply_connection_profile(conn, profile, read_only=read_only)
+
+    if not read_only:
+        init_db(conn)
+        perform_db_upgrade(conn, version=version)
     return conn
 
 
+_PRAGMA_CHOICES = {'journal_mode': ('DELETE', 'TRUNCATE', 'PERSIST',
+                                    'MEMORY', 'WAL', 'OFF'),
+                   'synchronous': ('OFF', 'NORMAL', 'FULL', 'EXTRA'),
+                   'temp_store': ('DEFAULT', 'FILE', 'MEMORY')}
+_INTEGER_PRAGMAS = ('cache_size', 'mmap_size')
+
+
+def apply_connection_profile(conn: SomeConnection, profile: Dict[str, Any],
+                             read_only: bool = False) -> None:
+    """
+    Set the PRAGMAs of a connection profile on a connection. The busy
+    timeout of the profile is not a PRAGMA and is used by `connect` when
+    opening the connection.
+
+    Args:
+        conn: the connection to tune
+        profile: dictionary with (some of) the keys journal_mode,
+            synchronous, cache_size, mmap_size and temp_store. Settings
+            that are missing or None are left at the SQLite default.
+        read_only: if True, the journal mode is not set since it can not be
+            changed through a read-only connection
+
+    Raises:
+        ValueError: if a setting has an invalid value
+    """
+    pragmas: List[Tuple[str, Union[str, int]]] = []
+    for pragma, choices in _PRAGMA_CHOICES.items():
+        value = profile.get(pragma)
+        if value is None or (read_only and pragma == 'journal_mode'):
+            continue
+        value = str(value).upper()
+        if value not in choices:
+            raise ValueError(f'Invalid value {value} for PRAGMA {pragma}, '
+                             f'must be one of {choices}')
+        pragmas.append((pragma, value))
+    for pragma in _INTEGER_PRAGMAS:
+        value = profile.get(pragma)
+        if value is None:
+            continue
+        if not isinstance(value, int) or isinstance(value, bool):
+            raise ValueError(f'Invalid value {value} for PRAGMA {pragma}, '
+                             f'must be an integer')
+        pragmas.append((pragma, value))
+
+    for pragma, value in pragmas:
+        conn.execute(f"PRAGMA {pragma} = {value}")
+
+
 def perform_db_upgrade(conn: SomeConnection, version: int=-1) -> None:
     """
     This is intended to perform all upgrades as needed to bring the
@@ -348,7 +492,8 @@ def perform_db_upgrade(conn: SomeConnection, version: int=-1) -> None:
     """
 
     upgrade_actions = [perform_db_upgrade_0_to_1, perform_db_upgrade_1_to_2,
-                       perform_db_upgrade_2_to_3]
+                       perform_db_upgrade_2_to_3, perform_db_upgrade_3_to_4,
+                       perform_db_upgrade_4_to_5, perform_db_upgrade_5_to_6]
     newest_version = len(upgrade_actions)
     version = newest_version if version == -1 else version
 
@@ -677,6 +822,96 @@ def perform_db_upgrade_2_to_3(conn: SomeConnection) -> None:
             log.debug(f"Upgrade in transition, run number {run_id}: OK")
 
 
+@upgrader
+def perform_db_upgrade_3_to_4(conn: SomeConnection) -> None:
+    """
+    Perform the upgrade from version 3 to version 4
+
+    From version 4 on, arrays are stored in the compact array format (see
+    `_adapt_array`) rather than in the .npy format. Existing .npy blobs are
+    left untouched since the converter reads both formats, so the upgrade
+    only bumps the version to mark that the database may contain blobs
+    that older versions of QCoDeS can not read.
+    """
+
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    if n_run_tables != 1:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_4_to_5(conn: SomeConnection) -> None:
+    """
+    Perform the upgrade from version 4 to version 5
+
+    Add indices for the lookups of the layouts and dependencies of a run and
+    of a run by the name of its results table: one on layouts for
+    (run_id, parameter), one each on dependencies for dependent and
+    independent, and one on runs for result_table_name
+    """
+
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    if n_run_tables == 1:
+        _IX_layouts_run_id_parameter = """
+                                       CREATE INDEX
+                                       IF NOT EXISTS IX_layouts_run_id_parameter
+                                       ON layouts (run_id, parameter)
+                                       """
+        _IX_dependencies_dependent = """
+                                     CREATE INDEX
+                                     IF NOT EXISTS IX_dependencies_dependent
+                                     ON dependencies (dependent)
+                                     """
+        _IX_dependencies_independent = """
+                                       CREATE INDEX
+                                       IF NOT EXISTS IX_dependencies_independent
+                                       ON dependencies (independent)
+                                       """
+        _IX_runs_result_table_name = """
+                                     CREATE INDEX
+                                     IF NOT EXISTS IX_runs_result_table_name
+                                     ON runs (result_table_name)
+                                     """
+        with atomic(conn) as conn:
+            transaction(conn, _IX_layouts_run_id_parameter)
+            transaction(conn, _IX_dependencies_dependent)
+            transaction(conn, _IX_dependencies_independent)
+            transaction(conn, _IX_runs_result_table_name)
+    else:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
+@upgrader
+def perform_db_upgrade_5_to_6(conn: SomeConnection) -> None:
+    """
+    Perform the upgrade from version 5 to version 6
+
+    Add the snapshots table, which stores every distinct snapshot once,
+    keyed by its hash (see `add_snapshot`), and a snapshot_hash column to
+    the runs table that refers to it. Snapshots that earlier versions stored
+    in the snapshot column of the runs table are left in place, and are
+    still read by `DataSet.snapshot_raw`.
+    """
+
+    sql = "SELECT name FROM sqlite_master WHERE type='table' AND name='runs'"
+    cur = atomic_transaction(conn, sql)
+    n_run_tables = len(cur.fetchall())
+
+    if n_run_tables == 1:
+        with atomic(conn) as conn:
+            transaction(conn, _snapshots_table_schema)
+            transaction(conn,
+                        "ALTER TABLE runs ADD COLUMN snapshot_hash TEXT")
+    else:
+        raise RuntimeError(f"found {n_run_tables} runs tables expected 1")
+
+
 def transaction(conn: SomeConnection,
                 sql: str, *args: Any) -> sqlite3.Cursor:
     """Perform a transaction.
@@ -975,6 +1210,67 @@ def insert_many_values(conn: SomeConnection,
     return return_value
 
 
+def _column_to_list(column: Union[ndarray, Sequence[VALUE]]) -> List[VALUE]:
+    """
+    Convert a column of values to a list of python objects suitable for
+    direct consumption by `executemany`. Numpy arrays are converted in bulk
+    with `tolist`, which bypasses the per-value adapters. Since sqlite stores
+    a python nan as NULL, nans in float arrays are replaced by the same
+    'nan' string that `_adapt_float` produces.
+    """
+    if isinstance(column, ndarray):
+        if column.dtype.kind == 'f':
+            nans = np.isnan(column)
+            if nans.any():
+                values = column.astype(object)
+                values[nans] = "nan"
+                return values.tolist()
+        return column.tolist()
+    return list(column)
+
+
+def insert_many_columns(conn: SomeConnection,
+                        formatted_name: str,
+                        columns: Mapping[str,
+                                         Union[ndarray, Sequence[VALUE]]]
+                        ) -> int:
+    """
+    Inserts many rows given as columns of values. All columns must have the
+    same length. The rows are inserted with one prepared statement via
+    `executemany`, hence there is no limit on the number of rows.
+
+    Example input:
+    columns: {'xparam': np.array([x1, x2, x3]),
+              'yparam': np.array([y1, y2, y3])}
+
+    Returns:
+        the number of inserted rows
+
+    NOTE this need to be committed before closing the connection.
+    """
+    lengths = [len(col) for col in columns.values()]
+    if len(set(lengths)) > 1:
+        raise ValueError('Wrong input format for values. Must specify the '
+                         'same number of values for all columns. Received'
+                         f' lengths {lengths}.')
+    if len(lengths) == 0 or lengths[0] == 0:
+        return 0
+
+    _columns = ",".join(columns.keys())
+    _values = ",".join(["?"] * len(columns))
+    query = f"""INSERT INTO "{formatted_name}"
+        ({_columns})
+    VALUES
+        ({_values})
+    """
+    rows = zip(*(_column_to_list(col) for col in columns.values()))
+
+    with atomic(conn) as conn:
+        conn.cursor().executemany(query, rows)
+
+    return lengths[0]
+
+
 def modify_values(conn: SomeConnection,
                   formatted_name: str,
                   index: int,
@@ -1131,7 +1427,9 @@ def get_values(conn: SomeConnection,
 
 def get_setpoints(conn: SomeConnection,
                   table_name: str,
-                  param_name: str) -> Dict[str, List[List[Any]]]:
+                  param_name: str,
+                  setpoint_names: Optional[Sequence[str]] = None
+                  ) -> Dict[str, List[List[Any]]]:
     """
     Get the setpoints for a given dependent parameter
 
@@ -1139,61 +1437,198 @@ def get_setpoints(conn: SomeConnection,
         conn: Connection to the database
         table_name: Name of the table that holds the data
         param_name: Name of the parameter to get the setpoints of
+        setpoint_names: The names of the setpoints of the parameter, if
+            already known (e.g. from a cached layout of the run). If not
+            given, they are looked up in the layouts and dependencies tables
 
     Returns:
         A list of returned setpoint values. Each setpoint return value
         is a list of lists of Any. The first list is a list of run points,
         the second list is a list of parameter values.
     """
-    # TODO: We do this in no less than 5 table lookups, surely
-    # this number can be reduced
+    if setpoint_names is None:
+        sql = """
+        SELECT indeps.parameter
+        FROM runs
+        JOIN layouts AS deps
+            ON deps.run_id = runs.run_id AND deps.parameter = ?
+        JOIN dependencies
+            ON dependencies.dependent = deps.layout_id
+        JOIN layouts AS indeps
+            ON indeps.layout_id = dependencies.independent
+        WHERE runs.result_table_name = ?
+        ORDER BY dependencies.axis_num
+        """
+        c = atomic_transaction(conn, sql, param_name, table_name)
+        setpoint_names = [spn[0] for spn in many_many(c, 'parameter')]
 
-    # get run_id
-    sql = """
-    SELECT run_id FROM runs WHERE result_table_name = ?
+    # get the actual setpoint data of all setpoints in one go
+    output: Dict[str, List[List[Any]]] = {}
+    if len(setpoint_names) == 0:
+        return output
+
+    _setpoint_names = ",".join(setpoint_names)
+    sql = f"""
+    SELECT {_setpoint_names}
+    FROM "{table_name}"
+    WHERE {param_name} IS NOT NULL
     """
-    c = atomic_transaction(conn, sql, table_name)
-    run_id = one(c, 'run_id')
+    c = atomic_transaction(conn, sql)
+    rows = c.fetchall()
+    for i, sp_name in enumerate(setpoint_names):
+        output[sp_name] = [[row[i]] for row in rows]
 
-    # get the parameter layout id
-    sql = """
-    SELECT layout_id FROM layouts
-    WHERE parameter = ?
-    and run_id = ?
+    return output
+
+
+def get_column_types(conn: SomeConnection, table_name: str) -> Dict[str, str]:
     """
-    c = atomic_transaction(conn, sql, param_name, run_id)
-    layout_id = one(c, 'layout_id')
+    Get the declared types of the columns of a table, i.e. for a results
+    table the storage class ('numeric', 'array', 'text') of each parameter
 
-    # get the setpoint layout ids
-    sql = """
-    SELECT independent FROM dependencies
-    WHERE dependent = ?
+    Args:
+        conn: Connection to the database
+        table_name: Name of the table
+
+    Returns:
+        A dict mapping column names to declared (lower case) types
     """
-    c = atomic_transaction(conn, sql, layout_id)
-    indeps = many_many(c, 'independent')
-    indeps = [idp[0] for idp in indeps]
+    cur = atomic_transaction(conn, f'PRAGMA table_info("{table_name}")')
+    return {row['name']: row['type'].lower() for row in cur.fetchall()}
 
-    # get the setpoint names
-    sql = f"""
-    SELECT parameter FROM layouts WHERE layout_id
-    IN {str(indeps).replace('[', '(').replace(']', ')')}
+
+def _arrays_to_array(values: List[Any]) -> ndarray:
     """
-    c = atomic_transaction(conn, sql)
-    setpoint_names_temp = many_many(c, 'parameter')
-    setpoint_names = [spn[0] for spn in setpoint_names_temp]
-    setpoint_names = cast(List[str], setpoint_names)
+    Stack the values of an 'array' column into one array with the rows
+    along the first axis. If the arrays are of different shapes (or there
+    are NULLs), a one-dimensional object array of copies of the values is
+    returned, as the values may be read-only views of the blobs.
+    """
+    if len(values) == 0:
+        return np.array([])
+    shapes = {np.shape(value) for value in values}
+    if len(shapes) == 1 and not any(value is None for value in values):
+        return np.stack(values)
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = [None if value is None else np.array(value) for value in values]
+    return arr
 
-    # get the actual setpoint data
-    output: Dict[str, List[List[Any]]] = {}
-    for sp_name in setpoint_names:
-        sql = f"""
-        SELECT {sp_name}
-        FROM "{table_name}"
-        WHERE {param_name} IS NOT NULL
-        """
-        c = atomic_transaction(conn, sql)
-        sps = many_many(c, sp_name)
-        output[sp_name] = sps
+
+def _column_chunk_to_array(values: List[Any], column_type: str
+                           ) -> Optional[ndarray]:
+    """
+    Turn a chunk of raw values of a column as returned by the cursor into a
+    numpy array. For 'numeric' columns the values have not gone through the
+    numeric converter, hence they are python floats and ints, None for NULL
+    and the string 'nan' for nans. If the chunk contains anything else
+    (e.g. strings in a numeric column) None is returned and the caller must
+    fall back to the converter.
+    """
+    arr = np.array(values)
+    if column_type != 'numeric' or arr.dtype.kind in 'iuf':
+        return arr
+    try:
+        return np.array(values, dtype=float)
+    except ValueError:
+        return None
+
+
+def get_data_as_arrays(conn: SomeConnection,
+                       table_name: str,
+                       columns: List[str],
+                       start: Optional[int] = None,
+                       end: Optional[int] = None,
+                       not_null: Optional[str] = None,
+                       chunk_size: int = 100000
+                       ) -> Dict[str, ndarray]:
+    """
+    Get data from the columns of a table as one numpy array per column.
+    The range is selected in the same way as for `get_data`.
+
+    The data is fetched from the cursor in chunks of `chunk_size` rows. The
+    values of 'numeric' columns are read without going through the python
+    level numeric converter and are directly put into numeric arrays. Only
+    if a numeric column holds non-numeric values (e.g. strings) the
+    converter is used for that column.
+
+    Args:
+        conn: database connection
+        table_name: name of the table
+        columns: list of columns
+        start: start of range (1 indedex)
+        end: start of range (1 indedex)
+        not_null: if given, only rows where this column is not NULL are
+            returned, i.e. the rows that hold values of that parameter
+        chunk_size: the number of rows to fetch from the cursor at a time
+
+    Returns:
+        A dict mapping the column names to arrays of the requested data
+    """
+    column_types = get_column_types(conn, table_name)
+
+    conditions = []
+    if start and end:
+        conditions.append(f"rowid > {start} and rowid <= {end}")
+    elif start:
+        conditions.append(f"rowid >= {start}")
+    elif end:
+        conditions.append(f"rowid <= {end}")
+    if not_null is not None:
+        conditions.append(f"{not_null} IS NOT NULL")
+    where = f"WHERE {' and '.join(conditions)}" if conditions else ""
+
+    # the unary plus turns a numeric or array column into an expression,
+    # which has no declared type, hence sqlite3 does not apply the converter.
+    # The blobs of arrays are decoded below without copying their data, as
+    # they are copied into the output array anyway
+    _columns = ",".join(f"+{col}" if column_types.get(col) in ('numeric',
+                                                               'array')
+                        else col for col in columns)
+    query = f"""
+    SELECT {_columns}
+    FROM "{table_name}"
+    {where}
+    """
+
+    chunks: Dict[str, List[ndarray]] = {col: [] for col in columns}
+    arrays: Dict[str, List[ndarray]] = {col: [] for col in columns}
+    fallback: Set[str] = set()
+    with atomic(conn) as conn:
+        cur = transaction(conn, query)
+        while True:
+            rows = cur.fetchmany(chunk_size)
+            if not rows:
+                break
+            for i, col in enumerate(columns):
+                if col in fallback:
+                    continue
+                values = [row[i] for row in rows]
+                if column_types.get(col) == 'array':
+                    arrays[col] += [None if value is None
+                                    else _convert_array(value, copy=False)
+                                    for value in values]
+                    continue
+                arr = _column_chunk_to_array(values,
+                                             column_types.get(col, ''))
+                if arr is None:
+                    fallback.add(col)
+                else:
+                    chunks[col].append(arr)
+
+    output: Dict[str, ndarray] = {}
+    for col in columns:
+        if col in fallback:
+            sql = f'SELECT {col} FROM "{table_name}" {where}'
+            values = many_many(atomic_transaction(conn, sql), col)
+            output[col] = np.array([value[0] for value in values])
+        elif column_types.get(col) == 'array':
+            output[col] = _arrays_to_array(arrays[col])
+        elif len(chunks[col]) == 0:
+            output[col] = np.array([])
+        elif len(chunks[col]) == 1:
+            output[col] = chunks[col][0]
+        else:
+            output[col] = np.concatenate(chunks[col])
 
     return output
 
@@ -1259,7 +1694,9 @@ def get_dependents(conn: SomeConnection,
     """
     sql = """
     SELECT layout_id FROM layouts
-    WHERE run_id=? and layout_id in (SELECT dependent FROM dependencies)
+    WHERE run_id=? AND EXISTS (SELECT 1 FROM dependencies
+                               WHERE dependent = layouts.layout_id)
+    ORDER BY layout_id
     """
     c = atomic_transaction(conn, sql, run_id)
     res = [d[0] for d in many_many(c, 'layout_id')]
@@ -1599,6 +2036,10 @@ def get_parameters(conn: SomeConnection,
     """
     Get the list of param specs for run
 
+    The layouts and dependencies of all the parameters of the run are read
+    in one go, so the number of queries does not grow with the number of
+    parameters.
+
     Args:
         conn: the connection to the sqlite database
         run_id: The id of the run
@@ -1607,18 +2048,62 @@ def get_parameters(conn: SomeConnection,
         A list of param specs for this run
     """
 
+    # get table name
+    sql = f"""
+    SELECT result_table_name FROM runs WHERE run_id = {run_id}
+    """
+    c = conn.execute(sql)
+    result_table_name = one(c, 'result_table_name')
+
+    # get the data types
+    sql = f"""
+    PRAGMA TABLE_INFO("{result_table_name}")
+    """
+    c = conn.execute(sql)
+    param_types = {row['name']: row['type'] for row in c.fetchall()}
+
+    # get the layouts
+    sql = f"""
+    SELECT layout_id, parameter, label, unit, inferred_from FROM layouts
+    WHERE run_id={run_id}
+    ORDER BY layout_id
+    """
+    c = conn.execute(sql)
+    layouts = many_many(c, 'layout_id', 'parameter', 'label', 'unit',
+                        'inferred_from')
+
+    # get the dependencies as names of the setpoints
     sql = f"""
-    SELECT parameter FROM layouts WHERE run_id={run_id}
+    SELECT dependencies.dependent, layouts.parameter, dependencies.axis_num
+    FROM dependencies
+    JOIN layouts ON dependencies.independent = layouts.layout_id
+    WHERE layouts.run_id={run_id}
     """
     c = conn.execute(sql)
-    param_names_temp = many_many(c, 'parameter')
-    param_names = [p[0] for p in param_names_temp]
-    param_names = cast(List[str], param_names)
+    deps: DefaultDict[int, List[Tuple[int, str]]] = defaultdict(list)
+    for dependent, independent, axis_num in many_many(c, 'dependent',
+                                                      'parameter',
+                                                      'axis_num'):
+        deps[dependent].append((axis_num, independent))
 
     parspecs = []
 
-    for param_name in param_names:
-        parspecs.append(get_paramspec(conn, run_id, param_name))
+    for layout_id, param_name, label, unit, inferred_from_string in layouts:
+        if inferred_from_string:
+            inferred_from = inferred_from_string.split(', ')
+        else:
+            inferred_from = []
+
+        depends_on: Optional[List[str]]
+        if layout_id in deps:
+            depends_on = [dp for _, dp in sorted(deps[layout_id])]
+        else:
+            depends_on = None
+
+        parspecs.append(ParamSpec(param_name, param_types[param_name],
+                                  label, unit,
+                                  inferred_from,
+                                  depends_on))
 
     return parspecs
 
@@ -1756,10 +2241,10 @@ def _add_parameters_to_layout_and_deps(conn: SomeConnection,
                                        formatted_name: str,
                                        *parameter: ParamSpec) -> sqlite3.Cursor:
     # get the run_id
-    sql = f"""
-    SELECT run_id FROM runs WHERE result_table_name="{formatted_name}";
+    sql = """
+    SELECT run_id FROM runs WHERE result_table_name=?;
     """
-    run_id = one(transaction(conn, sql), 'run_id')
+    run_id = one(transaction(conn, sql, formatted_name), 'run_id')
     layout_args = []
     for p in parameter:
         layout_args.append(run_id)
@@ -1958,6 +2443,193 @@ def add_meta_data(conn: SomeConnection,
             raise e
 
 
+def _json_pointer(path: str, key: str) -> str:
+    return path + '/' + key.replace('~', '~0').replace('/', '~1')
+
+
+def _json_diff(old: Any, new: Any, path: str = '') -> List[Dict[str, Any]]:
+    """
+    Get a JSON patch (RFC 6902) that turns the old JSON document into the
+    new one. Only JSON objects are compared member by member, any other
+    value that differs is replaced as a whole.
+    """
+    if isinstance(old, dict) and isinstance(new, dict):
+        patch: List[Dict[str, Any]] = []
+        for key in old:
+            if key not in new:
+                patch.append({'op': 'remove',
+                              'path': _json_pointer(path, key)})
+        for key, value in new.items():
+            if key in old:
+                patch += _json_diff(old[key], value,
+                                    _json_pointer(path, key))
+            else:
+                patch.append({'op': 'add', 'path': _json_pointer(path, key),
+                              'value': value})
+        return patch
+    if type(old) == type(new) and old == new:
+        return []
+    return [{'op': 'replace', 'path': path, 'value': new}]
+
+
+def _apply_json_patch(doc: Any, patch: List[Dict[str, Any]]) -> Any:
+    """
+    Apply a JSON patch as made by `_json_diff` to a JSON document. The
+    document is modified in place, and the patched document is returned.
+    """
+    for operation in patch:
+        keys = [key.replace('~1', '/').replace('~0', '~')
+                for key in operation['path'].split('/')[1:]]
+        if not keys:
+            doc = operation['value']
+            continue
+        parent = doc
+        for key in keys[:-1]:
+            parent = parent[key]
+        if operation['op'] == 'remove':
+            del parent[keys[-1]]
+        else:
+            parent[keys[-1]] = operation['value']
+    return doc
+
+
+def _encode_snapshot_data(text: str, compress: bool) -> Tuple[str, bytes]:
+    data = text.encode('utf-8')
+    if compress:
+        return 'zlib', zlib.compress(data)
+    return 'json', data
+
+
+def _decode_snapshot_data(encoding: str, data: bytes) -> str:
+    if encoding == 'zlib':
+        data = zlib.decompress(data)
+    return bytes(data).decode('utf-8')
+
+
+def _get_snapshot_by_hash(conn: SomeConnection, snapshot_hash: str) -> str:
+    """
+    Get the JSON of a snapshot from the snapshots table, applying the chain
+    of patches that the snapshot may be stored as
+    """
+    sql = """
+    SELECT encoding, base_hash, data FROM snapshots WHERE snapshot_hash=?
+    """
+    patches = []
+    while True:
+        row = atomic_transaction(conn, sql, snapshot_hash).fetchone()
+        if row is None:
+            raise RuntimeError(f'Snapshot {snapshot_hash} is missing from '
+                               f'the snapshots table')
+        text = _decode_snapshot_data(row['encoding'], row['data'])
+        if row['base_hash'] is None:
+            break
+        patches.append(json.loads(text))
+        snapshot_hash = row['base_hash']
+
+    if not patches:
+        return text
+    doc = json.loads(text)
+    for patch in reversed(patches):
+        doc = _apply_json_patch(doc, patch)
+    return json.dumps(doc)
+
+
+def add_snapshot(conn: SomeConnection, run_id: int, snapshot: str,
+                 compress: bool = True, delta: bool = False,
+                 max_delta_depth: int = 10) -> str:
+    """
+    Store the snapshot of a run. Snapshots are stored in the snapshots
+    table once per distinct content, keyed by the SHA-256 hash of their
+    JSON, and the run refers to its snapshot by that hash.
+
+    Args:
+        conn: the connection to the sqlite database
+        run_id: the run to store the snapshot for
+        snapshot: the snapshot as a JSON string
+        compress: whether to zlib-compress a newly stored snapshot
+        delta: whether to store a new snapshot as a JSON patch against the
+            snapshot of the previous run, if the patch is smaller
+        max_delta_depth: the maximal number of patches that have to be
+            applied to get a snapshot; once reached, a snapshot is stored in
+            full
+
+    Returns:
+        the hash of the snapshot
+    """
+    snapshot_hash = hashlib.sha256(snapshot.encode('utf-8')).hexdigest()
+
+    with atomic(conn) as conn:
+        exists_sql = "SELECT depth FROM snapshots WHERE snapshot_hash=?"
+        if transaction(conn, exists_sql, snapshot_hash).fetchone() is None:
+            text = snapshot
+            base_hash = None
+            depth = 0
+            base = _get_delta_base(conn, run_id) if delta else None
+            if base is not None and base[1] < max_delta_depth:
+                base_snapshot = json.loads(_get_snapshot_by_hash(conn,
+                                                                 base[0]))
+                patch = _json_diff(base_snapshot, json.loads(snapshot))
+                patch_text = json.dumps(patch)
+                # the patch is only used if the snapshot is recovered
+                # exactly, which is not the case if e.g. keys are reordered
+                if len(patch_text) < len(snapshot) and json.dumps(
+                        _apply_json_patch(base_snapshot, patch)) == snapshot:
+                    text = patch_text
+                    base_hash, depth = base[0], base[1] + 1
+            encoding, data = _encode_snapshot_data(text, compress)
+            transaction(conn,
+                        "INSERT INTO snapshots (snapshot_hash, encoding, "
+                        "base_hash, depth, data) VALUES (?, ?, ?, ?, ?)",
+                        snapshot_hash, encoding, base_hash, depth,
+                        sqlite3.Binary(data))
+        transaction(conn, "UPDATE runs SET snapshot_hash=? WHERE run_id=?",
+                    snapshot_hash, run_id)
+
+    return snapshot_hash
+
+
+def _get_delta_base(conn: SomeConnection,
+                    run_id: int) -> Optional[Tuple[str, int]]:
+    """
+    Get the hash and the patch depth of the snapshot of the latest run
+    before the given run that has a snapshot in the snapshots table
+    """
+    sql = """
+    SELECT snapshots.snapshot_hash, snapshots.depth
+    FROM runs JOIN snapshots ON runs.snapshot_hash = snapshots.snapshot_hash
+    WHERE runs.run_id < ?
+    ORDER BY runs.run_id DESC
+    LIMIT 1
+    """
+    row = transaction(conn, sql, run_id).fetchone()
+    if row is None:
+        return None
+    return row['snapshot_hash'], row['depth']
+
+
+def get_snapshot(conn: SomeConnection, run_id: int) -> Optional[str]:
+    """
+    Get the snapshot of a run that was stored with `add_snapshot`
+
+    Args:
+        conn: the connection to the sqlite database
+        run_id: the run to get the snapshot of
+
+    Returns:
+        the snapshot as a JSON string, or None if the run has no snapshot in
+        the snapshots table
+    """
+    # a database that is opened read-only is not upgraded, hence may not
+    # have the snapshots table
+    if not is_column_in_table(conn, "runs", "snapshot_hash"):
+        return None
+    snapshot_hash = select_one_where(conn, "runs", "snapshot_hash",
+                                     "run_id", run_id)
+    if snapshot_hash is None:
+        return None
+    return _get_snapshot_by_hash(conn, snapshot_hash)
+
+
 def get_user_version(conn: SomeConnection) -> int:
 
     curr = atomic_transaction(conn, 'PRAGMA user_version')
@@ -1970,6 +2642,18 @@ def set_user_version(conn: SomeConnection, version: int) -> None:
     atomic_transaction(conn, 'PRAGMA user_version({})'.format(version))
 
 
+def path_to_dbfile(conn: SomeConnection) -> str:
+    """
+    Return the path of the database file that the given connection is
+    connected to (an empty string for an in-memory database)
+    """
+    cursor = conn.execute("PRAGMA database_list")
+    for row in cursor.fetchall():
+        if row[1] == 'main':
+            return row[2]
+    return ''
+
+
 def get_experiment_name_from_experiment_id(
         conn: SomeConnection, exp_id: int) -> str:
     return select_one_where(
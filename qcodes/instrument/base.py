@@ -1,10 +1,13 @@
 """Instrument base class."""
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 import logging
+import threading
 import time
 import warnings
 import weakref
 from typing import Sequence, Optional, Dict, Union, Callable, Any, List, \
-    TYPE_CHECKING, cast, Type
+    TYPE_CHECKING, cast, Type, Iterator
 
 import numpy as np
 if TYPE_CHECKING:
@@ -12,12 +15,57 @@ if TYPE_CHECKING:
 from qcodes.utils.helpers import DelegateAttributes, strip_attrs, full_class
 from qcodes.utils.metadata import Metadatable
 from qcodes.utils.validators import Anything
+from qcodes.utils.command import Command
 from .parameter import Parameter, _BaseParameter
 from .function import Function
 
 log = logging.getLogger(__name__)
 
 
+class _SnapshotBudget(threading.local):
+    """
+    The time budget and the record of parameter timings of the instrument
+    snapshots taken in the current thread, see `snapshot_budget`
+    """
+    deadline: Optional[float] = None
+    timings: Optional[Dict[str, float]] = None
+
+
+_snapshot_budget = _SnapshotBudget()
+
+
+@contextmanager
+def snapshot_budget(timeout: Optional[float]=None
+                    ) -> Iterator[Dict[str, float]]:
+    """
+    Context manager that puts a time budget on the instrument snapshots that
+    are taken with update=True in the current thread, and times the
+    snapshots of their parameters.
+
+    Once the budget has run out, the remaining parameters are not updated
+    but snapshotted with their latest values in memory. A parameter query
+    that is already underway is not interrupted.
+
+    Args:
+        timeout: the time budget in seconds, or None for no limit
+
+    Yields:
+        A dict that gets the time in seconds that the snapshot of each
+        parameter took, by the full name of the parameter
+    """
+    timings: Dict[str, float] = {}
+    if timeout is None:
+        _snapshot_budget.deadline = None
+    else:
+        _snapshot_budget.deadline = time.perf_counter() + timeout
+    _snapshot_budget.timings = timings
+    try:
+        yield timings
+    finally:
+        _snapshot_budget.deadline = None
+        _snapshot_budget.timings = None
+
+
 class InstrumentBase(Metadatable, DelegateAttributes):
     """
     Base class for all QCodes instruments and instrument channels
@@ -173,13 +221,22 @@ class InstrumentBase(Metadatable, DelegateAttributes):
             "__class__": full_class(self)
         }
 
+        deadline = _snapshot_budget.deadline
+        timings = _snapshot_budget.timings
+
         snap['parameters'] = {}
         for name, param in self.parameters.items():
-            update = update
+            param_update = update
             if params_to_skip_update and name in params_to_skip_update:
-                update = False
+                param_update = False
+            if param_update and deadline is not None \
+                    and time.perf_counter() > deadline:
+                log.debug(f"Snapshot: time budget used up, not updating "
+                          f"parameter {name} on {self.full_name}")
+                param_update = False
+            t0 = time.perf_counter()
             try:
-                snap['parameters'][name] = param.snapshot(update=update)
+                snap['parameters'][name] = param.snapshot(update=param_update)
             except:
                 # really log this twice. Once verbose for the UI and once
                 # at lower level with more info for file based loggers
@@ -189,6 +246,8 @@ class InstrumentBase(Metadatable, DelegateAttributes):
                          exc_info=True)
 
                 snap['parameters'][name] = param.snapshot(update=False)
+            if timings is not None:
+                timings[param.full_name] = time.perf_counter() - t0
         for attr in set(self._meta_attrs):
             if hasattr(self, attr):
                 snap[attr] = getattr(self, attr)
@@ -315,6 +374,29 @@ class InstrumentBase(Metadatable, DelegateAttributes):
         """
         return self.parameters[param_name].get()
 
+    async def async_set(self, param_name: str, value: Any) -> None:
+        """
+        Shortcut for ``async_set`` of a parameter from its name and new
+        value.
+
+        Args:
+            param_name: The name of a parameter of this instrument.
+            value: The new value to set.
+        """
+        await self.parameters[param_name].async_set(value)
+
+    async def async_get(self, param_name: str) -> Any:
+        """
+        Shortcut for ``async_get`` of a parameter from its name.
+
+        Args:
+            param_name: The name of a parameter of this instrument.
+
+        Returns:
+            The current value of the parameter.
+        """
+        return await self.parameters[param_name].async_get()
+
     def call(self, func_name: str, *args) -> Any:
         """
         Shortcut for calling a function from its name.
@@ -381,17 +463,39 @@ class Instrument(InstrumentBase):
         submodules (Dict[Metadatable]): All the submodules of this instrument
             such as channel lists or logical groupings of parameters.
             Usually populated via ``add_submodule``
+
+        batch_query_separator (Optional[str]): The separator of the queries
+            in a compound query, used by ``get_parameters`` to read several
+            parameters in one round trip. None (the default) if the
+            instrument does not accept compound queries. SCPI instruments
+            can typically use ``';:'``.
+
+        batch_response_separator (Optional[str]): The separator of the
+            answers in the response to a compound query. Defaults to
+            ``batch_query_separator``.
+
+        executor (ThreadPoolExecutor): The worker thread in which
+            ``async_get`` and ``async_set`` of the parameters of this
+            instrument and of its channels run, started on first use.
     """
 
     shared_kwargs = ()
 
+    batch_query_separator = None  # type: Optional[str]
+    batch_response_separator = None  # type: Optional[str]
+
     _all_instruments = {} # type: Dict[str, weakref.ref[Instrument]]
     _type = None
     _instances = [] # type: List[weakref.ref]
 
+    _executor = None  # type: Optional[ThreadPoolExecutor]
+
     def __init__(self, name: str,
                  metadata: Optional[Dict]=None, **kwargs) -> None:
         self._t0 = time.time()
+        # held during every write and ask, so that threads take turns in
+        # talking to the instrument instead of mixing up their messages
+        self._io_lock = threading.RLock()
         if kwargs.pop('server_name', False):
             warnings.warn("server_name argument not supported any more",
                           stacklevel=0)
@@ -490,6 +594,8 @@ class Instrument(InstrumentBase):
         """
         if hasattr(self, 'connection') and hasattr(self.connection, 'close'):
             self.connection.close()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
 
         strip_attrs(self, whitelist=['name'])
         self.remove_instance(self)
@@ -660,6 +766,15 @@ class Instrument(InstrumentBase):
             return True
         return False
 
+    @property
+    def executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # one worker, since the instrument can only do one thing at
+            # a time anyway
+            self._executor = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=self.name)
+        return self._executor
+
     # `write_raw` and `ask_raw` are the interface to hardware                #
     # `write` and `ask` are standard wrappers to help with error reporting   #
     #
@@ -680,7 +795,8 @@ class Instrument(InstrumentBase):
                 including the command and the instrument.
         """
         try:
-            self.write_raw(cmd)
+            with self._io_lock:
+                self.write_raw(cmd)
         except Exception as e:
             inst = repr(self)
             e.args = e.args + ('writing ' + repr(cmd) + ' to ' + inst,)
@@ -720,7 +836,8 @@ class Instrument(InstrumentBase):
                 including the command and the instrument.
         """
         try:
-            answer = self.ask_raw(cmd)
+            with self._io_lock:
+                answer = self.ask_raw(cmd)
 
             return answer
 
@@ -744,6 +861,85 @@ class Instrument(InstrumentBase):
             'Instrument {} has not defined an ask method'.format(
                 type(self).__name__))
 
+    def get_parameters(self, *parameters: _BaseParameter) -> List[Any]:
+        """
+        Get several parameters of this instrument and of its channels with
+        as few round trips to the hardware as possible.
+
+        If the instrument accepts compound queries (see
+        ``batch_query_separator``), the queries of all parameters that are
+        read with a plain ``get_cmd`` string are sent as one compound query,
+        and the response is split into the raw values of these parameters.
+        The ``get_parser``, ``offset``, ``scale`` and ``val_mapping`` of each
+        parameter are applied to its raw value just like in ``get``. All
+        other parameters are read with their own ``get``.
+
+        Args:
+            *parameters: the parameters to get
+
+        Returns:
+            the values of the parameters, in the order of ``parameters``
+        """
+        values = [None] * len(parameters)  # type: List[Any]
+        batch = []  # type: List[int]
+        queries = []  # type: List[str]
+        for i, parameter in enumerate(parameters):
+            query = self._batch_query(parameter)
+            if query is None:
+                values[i] = parameter.get()
+            else:
+                batch.append(i)
+                queries.append(query)
+
+        raw_values = []  # type: List[str]
+        if len(batch) > 1:
+            separator = self.batch_query_separator
+            response = self.ask(separator.join(queries))
+            raw_values = response.split(self.batch_response_separator or
+                                        separator)
+            if len(raw_values) != len(batch):
+                log.warning(f'Response {response!r} of {self.name} to a '
+                            f'compound query of {len(batch)} parameters '
+                            f'has {len(raw_values)} answers, getting the '
+                            f'parameters one by one instead.')
+                raw_values = []
+
+        if raw_values:
+            for i, raw_value in zip(batch, raw_values):
+                values[i] = parameters[i]._save_raw_val(raw_value)
+        else:
+            for i in batch:
+                values[i] = parameters[i].get()
+        return values
+
+    def _batch_query(self, parameter: _BaseParameter) -> Optional[str]:
+        """
+        The query with which a parameter can be read as part of a compound
+        query to this instrument, or None if it can not.
+        """
+        # avoid a circular import
+        from .channel import InstrumentChannel
+
+        if self.batch_query_separator is None:
+            return None
+        get_raw = getattr(parameter, 'get_raw', None)
+        if not isinstance(get_raw, Command) or not hasattr(get_raw, 'cmd_str'):
+            return None
+        # the raw value must be the plain answer of ``ask`` of this
+        # instrument or of one of its channels, without any output parser
+        # of the command or any transformation of the query in between
+        owner = getattr(get_raw.exec_str, '__self__', None)
+        if (get_raw.exec_function != get_raw.call_by_str
+                or getattr(owner, 'root_instrument', None) is not self
+                or get_raw.exec_str != owner.ask
+                or type(owner).ask not in (Instrument.ask,
+                                           InstrumentChannel.ask)):
+            return None
+        try:
+            return get_raw.cmd_str.format()
+        except (IndexError, KeyError):
+            return None
+
 
 def find_or_create_instrument(instrument_class: Type[Instrument],
                               name: str,
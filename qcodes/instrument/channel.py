@@ -101,9 +101,17 @@ class MultiChannelInstrumentParameter(MultiParameter):
         """
         Return a tuple containing the data from each of the channels in the
         list
+
+        The parameters are read with ``get_parameters`` of the instrument,
+        so that instruments that accept compound queries read all channels
+        in one round trip.
         """
-        return tuple(chan.parameters[self._param_name].get() for chan
-                     in self._channels)
+        parameters = [chan.parameters[self._param_name]
+                      for chan in self._channels]
+        get_parameters = getattr(self.root_instrument, 'get_parameters', None)
+        if get_parameters is None:
+            return tuple(parameter.get() for parameter in parameters)
+        return tuple(get_parameters(*parameters))
 
     def set_raw(self, value):
         """
@@ -186,6 +194,10 @@ class ChannelList(Metadatable):
         self._paramclass = multichan_paramclass
 
         self._channel_mapping: Dict[str, InstrumentChannel] = {}
+        # the multi-channel parameters returned by __getattr__, which are
+        # only created again once the channels of the list change
+        self._multi_parameters: Dict[str,
+                                     MultiChannelInstrumentParameter] = {}
         # provide lookup of channels by name
         # If a list of channels is not provided, define a list to store
         # channels. This will eventually become a locked tuple.
@@ -278,6 +290,7 @@ class ChannelList(Metadatable):
                             ".".format(type(obj).__name__,
                                        self._chan_type.__name__))
         self._channel_mapping[obj.short_name] = obj
+        self._multi_parameters.clear()
         self._channels = cast(List[InstrumentChannel], self._channels)
         return self._channels.append(obj)
 
@@ -289,6 +302,7 @@ class ChannelList(Metadatable):
             raise AttributeError("Cannot clear a locked channel list")
         self._channels.clear()
         self._channel_mapping.clear()
+        self._multi_parameters.clear()
 
     def remove(self, obj: InstrumentChannel):
         """
@@ -302,6 +316,7 @@ class ChannelList(Metadatable):
             self._channels = cast(List[InstrumentChannel], self._channels)
             self._channels.remove(obj)
             self._channel_mapping.pop(obj.short_name)
+            self._multi_parameters.clear()
 
     def extend(self, objects: Sequence[InstrumentChannel]):
         """
@@ -322,6 +337,7 @@ class ChannelList(Metadatable):
         channels = cast(List[InstrumentChannel], self._channels)
         channels.extend(objects_tuple)
         self._channels = channels
+        self._multi_parameters.clear()
 
     def index(self, obj: InstrumentChannel):
         """
@@ -350,6 +366,7 @@ class ChannelList(Metadatable):
                                        self._chan_type.__name__))
         self._channels = cast(List[InstrumentChannel], self._channels)
         self._channels.insert(index, obj)
+        self._multi_parameters.clear()
 
     def get_validator(self):
         """
@@ -370,6 +387,7 @@ class ChannelList(Metadatable):
 
         self._channels = tuple(self._channels)
         self._locked = True
+        self._multi_parameters.clear()
 
     def snapshot_base(self, update: bool=False, params_to_skip_update: Optional[Sequence[str]]=None):
         """
@@ -399,10 +417,18 @@ class ChannelList(Metadatable):
         Return a multi-channel function or parameter that we can use to get or
         set all items in a channel list simultaneously.
 
+        A multi-channel parameter is created on first access, and the same
+        one is returned until the channels of the list change.
+
         Params:
             name(str): The name of the parameter or function that we want to
             operate on.
         """
+        try:
+            return self._multi_parameters[name]
+        except KeyError:
+            pass
+
         # Check if this is a valid parameter
         if name in self._channels[0].parameters:
             setpoints = None
@@ -456,6 +482,7 @@ class ChannelList(Metadatable):
                                      setpoint_names=setpoint_names,
                                      setpoint_units=setpoint_units,
                                      setpoint_labels=setpoint_labels)
+            self._multi_parameters[name] = param
             return param
 
         # Check if this is a valid function
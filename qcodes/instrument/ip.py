@@ -1,6 +1,9 @@
 """Ethernet instrument driver class based on sockets."""
+import select
 import socket
 import logging
+import threading
+from typing import Dict, List, Optional, Sequence, Tuple
 
 from .base import Instrument
 
@@ -12,6 +15,10 @@ class IPInstrument(Instrument):
     r"""
     Bare socket ethernet instrument implementation.
 
+    All instruments with the same address and port share one socket, which
+    is closed when none of them uses it any more. Responses are read up to
+    the read terminator, however many packets they arrive in.
+
     Args:
         name (str): What this instrument is called locally.
 
@@ -31,6 +38,11 @@ class IPInstrument(Instrument):
         write_confirmation (bool): Whether the instrument acknowledges writes
             with some response we should read. Default True.
 
+        read_terminator (Optional[str]): Character(s) that terminate each
+            response, which are stripped from it. Defaults to ``terminator``.
+            Use '' for instruments that do not terminate their responses, in
+            which case every read returns the data of a single ``recv``.
+
         metadata (Optional[Dict]): additional static metadata to add to this
             instrument's JSON snapshot.
 
@@ -40,18 +52,20 @@ class IPInstrument(Instrument):
 
     def __init__(self, name, address=None, port=None, timeout=5,
                  terminator='\n', persistent=True, write_confirmation=True,
-                 **kwargs):
+                 read_terminator=None, **kwargs):
         super().__init__(name, **kwargs)
 
         self._address = address
         self._port = port
         self._timeout = timeout
         self._terminator = terminator
+        self._read_terminator = read_terminator
         self._confirmation = write_confirmation
 
         self._ensure_connection = EnsureConnection(self)
         self._buffer_size = 1400
 
+        self._connection = None  # type: Optional[_Connection]
         self._socket = None
 
         self.set_persistent(persistent)
@@ -92,33 +106,32 @@ class IPInstrument(Instrument):
             self._disconnect()
 
     def flush_connection(self):
-        self._recv()
+        """
+        Discard any data sent by the instrument that has not been read,
+        for example a welcome message after connecting. On a socket that was
+        just opened this waits for the first data to arrive.
+        """
+        self._connection.flush(self._buffer_size)
 
     def _connect(self):
 
-        if self._socket is not None:
+        if self._connection is not None:
             self._disconnect()
 
         try:
-            log.info("Opening socket")
-            self._socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            log.info("Connecting socket to {}:{}".format(self._address,
-                                                         self._port))
-            self._socket.connect((self._address, self._port))
-            self.set_timeout(self._timeout)
+            self._connection = _connection_pool.acquire(self._address,
+                                                        self._port)
         except ConnectionRefusedError:
             log.warning("Socket connection failed")
-            self._socket.close()
-            self._socket = None
+            return
+        self._socket = self._connection.socket
+        self.set_timeout(self._timeout)
 
     def _disconnect(self):
-        if getattr(self, '_socket', None) is None:
+        if getattr(self, '_connection', None) is None:
             return
-        log.info("Socket shutdown")
-        self._socket.shutdown(socket.SHUT_RDWR)
-        log.info("Socket closing")
-        self._socket.close()
-        log.info("Socket closed")
+        _connection_pool.release(self._connection)
+        self._connection = None
         self._socket = None
 
     def set_timeout(self, timeout=None):
@@ -143,15 +156,26 @@ class IPInstrument(Instrument):
         """
         self._terminator = terminator
 
+    @property
+    def read_terminator(self) -> str:
+        """The character(s) that terminate each response."""
+        if self._read_terminator is None:
+            return self._terminator
+        return self._read_terminator
+
     def _send(self, cmd):
         data = cmd + self._terminator
         log.debug(f"Writing {data} to instrument {self.name}")
-        self._socket.sendall(data.encode())
+        self._connection.send(data.encode())
 
     def _recv(self):
-        result = self._socket.recv(self._buffer_size)
+        terminator = self.read_terminator
+        if terminator:
+            result = self._connection.read_until(terminator.encode())
+        else:
+            result = self._connection.read_available(self._buffer_size)
         log.debug(f"Got {result} from instrument {self.name}")
-        if result == b'':
+        if result == b'' and not terminator:
             log.warning("Got empty response from Socket recv() "
                         "Connection broken.")
         return result.decode()
@@ -188,6 +212,57 @@ class IPInstrument(Instrument):
             self._send(cmd)
             return self._recv()
 
+    def ask_pipelined(self, cmds: Sequence[str]) -> List[str]:
+        """
+        Send several queries at once and then read all of their responses,
+        so that the round trips to the instrument overlap. The instrument
+        must answer every query with one response, in order.
+
+        Args:
+            cmds: The queries to send to the instrument.
+
+        Returns:
+            The instrument's responses, in the order of the queries.
+        """
+        with self._ensure_connection:
+            data = ''.join(cmd + self._terminator for cmd in cmds)
+            log.debug(f"Writing {data} to instrument {self.name}")
+            self._connection.send(data.encode())
+            return [self._recv() for _ in cmds]
+
+    def ask_binary_block(self, cmd: str) -> bytes:
+        """
+        Send a query that the instrument answers with an IEEE 488.2
+        definite length arbitrary block, ``#<n><length><data>``, and read
+        its data. Indefinite length blocks (``#0<data>``) are read up to the
+        read terminator.
+
+        Args:
+            cmd: The query to send to the instrument.
+
+        Returns:
+            The data of the block.
+        """
+        with self._ensure_connection:
+            self._send(cmd)
+            connection = self._connection
+            header = connection.read_exactly(2)
+            if header[:1] != b'#' or not header[1:].isdigit():
+                raise ValueError(f'Expected a binary block from '
+                                 f'{self.name}, got {header!r}')
+            n_digits = int(header[1:])
+            terminator = self.read_terminator.encode()
+            if n_digits == 0:
+                return connection.read_until(terminator)
+            length = int(connection.read_exactly(n_digits))
+            data = connection.read_exactly(length)
+            if terminator:
+                # the block is the last element of the response
+                connection.read_until(terminator)
+            log.debug(f"Got a binary block of {length} bytes from "
+                      f"instrument {self.name}")
+            return data
+
     def __del__(self):
         self.close()
 
@@ -220,7 +295,9 @@ class EnsureConnection:
     Context manager to ensure an instrument is connected when needed.
 
     Uses ``instrument._persistent`` to determine whether or not to close
-    the connection immediately on completion.
+    the connection immediately on completion. While in the context, the
+    instrument holds the lock of its connection, so that instruments sharing
+    the connection do not interleave their messages.
 
     Args:
         instrument (IPInstrument): the instance to connect.
@@ -233,8 +310,186 @@ class EnsureConnection:
         """Make sure we connect when entering the context."""
         if not self.instrument._persistent or self.instrument._socket is None:
             self.instrument._connect()
+        connection = self.instrument._connection
+        if connection is not None:
+            connection.lock.acquire()
+            # the instruments sharing the connection may use other timeouts
+            self.instrument.set_timeout(self.instrument._timeout)
 
     def __exit__(self, type, value, tb):
         """Possibly disconnect on exiting the context."""
+        connection = self.instrument._connection
+        if connection is not None:
+            connection.lock.release()
         if not self.instrument._persistent:
             self.instrument._disconnect()
+
+
+class _Connection:
+    """
+    A socket connected to an address and port, with a buffer of the data
+    that has been received but not read yet.
+
+    Args:
+        address: The IP address or name.
+        port: The IP port.
+        chunk_size: The number of bytes to receive at a time.
+    """
+
+    def __init__(self, address: str, port: int,
+                 chunk_size: int = 65536) -> None:
+        self.address = address
+        self.port = port
+        self.lock = threading.RLock()
+        self.users = 0
+        self.socket = None  # type: Optional[socket.socket]
+        # whether any data has been read since connecting
+        self.fresh = True
+
+        self._buffer = bytearray()
+        self._chunk = memoryview(bytearray(chunk_size))
+
+    def connect(self) -> None:
+        log.info("Opening socket")
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        log.info("Connecting socket to {}:{}".format(self.address, self.port))
+        try:
+            sock.connect((self.address, self.port))
+        except ConnectionRefusedError:
+            sock.close()
+            raise
+        self.socket = sock
+        self.fresh = True
+        del self._buffer[:]
+
+    def disconnect(self) -> None:
+        if self.socket is None:
+            return
+        log.info("Socket shutdown")
+        try:
+            self.socket.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            # the other end may have closed the connection already
+            pass
+        log.info("Socket closing")
+        self.socket.close()
+        log.info("Socket closed")
+        self.socket = None
+
+    def send(self, data: bytes) -> None:
+        self.socket.sendall(data)
+
+    def _receive(self) -> int:
+        """
+        Receive the next chunk of data into the buffer.
+
+        Raises:
+            ConnectionError: if the connection was closed by the other end
+        """
+        self.fresh = False
+        try:
+            n_bytes = self.socket.recv_into(self._chunk)
+        except socket.timeout:
+            # a partial response would be mistaken for the next one
+            del self._buffer[:]
+            raise
+        if n_bytes == 0:
+            raise ConnectionError(f'Connection to {self.address}:{self.port} '
+                                  f'was closed')
+        self._buffer += self._chunk[:n_bytes]
+        return n_bytes
+
+    def read_until(self, terminator: bytes) -> bytes:
+        """
+        Read up to the terminator, which is discarded.
+        """
+        start = 0
+        while True:
+            end = self._buffer.find(terminator, start)
+            if end >= 0:
+                break
+            # the terminator may straddle two chunks
+            start = max(len(self._buffer) - len(terminator) + 1, 0)
+            self._receive()
+        data = bytes(self._buffer[:end])
+        del self._buffer[:end + len(terminator)]
+        return data
+
+    def read_exactly(self, n_bytes: int) -> bytes:
+        """
+        Read the next n_bytes bytes.
+        """
+        while len(self._buffer) < n_bytes:
+            self._receive()
+        data = bytes(self._buffer[:n_bytes])
+        del self._buffer[:n_bytes]
+        return data
+
+    def read_available(self, max_bytes: int) -> bytes:
+        """
+        Read the data in the buffer, or else of a single recv, at most
+        max_bytes bytes of it.
+        """
+        if not self._buffer:
+            self.fresh = False
+            return self.socket.recv(max_bytes)
+        data = bytes(self._buffer[:max_bytes])
+        del self._buffer[:max_bytes]
+        return data
+
+    def flush(self, max_bytes: int) -> None:
+        """
+        Discard the unread data. If nothing has been read since connecting,
+        wait for a single recv, otherwise only discard what has arrived.
+        """
+        with self.lock:
+            del self._buffer[:]
+            if self.fresh:
+                self.read_available(max_bytes)
+                return
+            while select.select([self.socket], [], [], 0)[0]:
+                if not self.socket.recv(max_bytes):
+                    break
+
+
+class _ConnectionPool:
+    """
+    The connections of all IPInstruments, one per address and port.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._connections = {}  # type: Dict[Tuple[str, int], _Connection]
+
+    def acquire(self, address: str, port: int) -> _Connection:
+        """
+        Get the connection to address and port, and connect if needed.
+
+        Raises:
+            ConnectionRefusedError: if a new connection is refused
+        """
+        with self._lock:
+            connection = self._connections.get((address, port))
+            if connection is None:
+                connection = _Connection(address, port)
+                connection.connect()
+                self._connections[(address, port)] = connection
+            connection.users += 1
+            return connection
+
+    def release(self, connection: _Connection) -> None:
+        """
+        Stop using a connection, and close it if no instrument uses it.
+        """
+        with self._lock:
+            connection.users -= 1
+            if connection.users > 0:
+                return
+            key = (connection.address, connection.port)
+            if self._connections.get(key) is connection:
+                del self._connections[key]
+        with connection.lock:
+            connection.disconnect()
+
+
+_connection_pool = _ConnectionPool()
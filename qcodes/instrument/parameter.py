@@ -52,7 +52,8 @@ This file defines four classes of parameters:
 # create an ABC for Parameter and MultiParameter - or just remove this statement
 # if everyone is happy to use these classes.
 
-from datetime import datetime, timedelta
+from concurrent.futures import Executor
+from datetime import datetime
 from copy import copy
 from operator import xor
 import time
@@ -71,6 +72,7 @@ from qcodes.utils.helpers import (permissive_range, is_sequence_of,
                                   DelegateAttributes, full_class, named_repr,
                                   warn_units)
 from qcodes.utils.metadata import Metadatable
+from qcodes.utils import timing
 from qcodes.utils.command import Command
 from qcodes.utils.validators import Validator, Ints, Strings, Enum
 from qcodes.instrument.sweep_values import SweepFixedValues
@@ -79,9 +81,136 @@ from qcodes.data.data_array import DataArray
 if TYPE_CHECKING:
     from .base import Instrument, InstrumentBase
 
+try:
+    from asyncio import get_running_loop
+except ImportError:
+    # Python 3.6, where get_event_loop returns the running loop when it is
+    # called from a coroutine
+    from asyncio import get_event_loop as get_running_loop
+
 Number = Union[float, int]
 
 
+# types of values that are scaled and offset as a whole, without checking
+# whether they are iterable
+_SCALAR_TYPES = (int, float, complex)
+
+
+class _LatestValue(collections.abc.Mapping):
+    """
+    Record of the latest value of a parameter, its raw value and when it was
+    set or measured.
+
+    The time is stored twice, as floats that are cheap to take on every get
+    and set: ``timestamp`` is a ``time.monotonic`` timestamp to tell the age
+    of the value, and ``wall_time`` a ``time.time`` timestamp to tell when
+    it was taken. For backwards compatibility the record is also a read-only
+    mapping with the keys ``value``, ``ts`` (the wall time as a
+    ``datetime``) and ``raw_value``.
+    """
+    __slots__ = ('value', 'raw_value', 'timestamp', 'wall_time')
+
+    _keys = ('value', 'ts', 'raw_value')
+
+    def __init__(self, value: Any=None, raw_value: Any=None,
+                 timestamp: Optional[float]=None,
+                 wall_time: Optional[float]=None) -> None:
+        self.value = value
+        self.raw_value = raw_value
+        self.timestamp = timestamp
+        self.wall_time = wall_time
+
+    @property
+    def ts(self) -> Optional[datetime]:
+        if self.wall_time is None:
+            return None
+        return datetime.fromtimestamp(self.wall_time)
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._keys:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __repr__(self):
+        return '{}({})'.format(type(self).__name__, dict(self))
+
+
+def _compose(stages: List[Callable]) -> Optional[Callable]:
+    """
+    Compose the functions in stages into one function that applies them in
+    order, or None if there are none.
+    """
+    if not stages:
+        return None
+    if len(stages) == 1:
+        return stages[0]
+
+    def composed(value):
+        for stage in stages:
+            value = stage(value)
+        return value
+    return composed
+
+
+def _subtract_offset(offset, value):
+    if isinstance(value, _SCALAR_TYPES):
+        return value - offset
+    elif isinstance(value, collections.abc.Iterable):
+        # Use single offset for all values
+        return tuple(val - offset for val in value)
+    return value - offset
+
+
+def _subtract_offsets(offsets, value):
+    # offset contains multiple elements, one for each value
+    return tuple(val - offset for val, offset in zip(value, offsets))
+
+
+def _divide_scale(scale, value):
+    if isinstance(value, _SCALAR_TYPES):
+        return value / scale
+    elif isinstance(value, collections.abc.Iterable):
+        # Use single scale for all values
+        return tuple(val / scale for val in value)
+    return value / scale
+
+
+def _divide_scales(scales, value):
+    # scale contains multiple elements, one for each value
+    return tuple(val / scale for val, scale in zip(value, scales))
+
+
+def _add_offset(offset, value):
+    return value + offset
+
+
+def _add_offsets(offsets, value):
+    return tuple(val + offset for val, offset in zip(value, offsets))
+
+
+def _multiply_scale(scale, value):
+    return value * scale
+
+
+def _multiply_scales(scales, value):
+    return tuple(val * scale for val, scale in zip(value, scales))
+
+
+def _map_inverse(inverse_val_mapping, value):
+    if value in inverse_val_mapping:
+        return inverse_val_mapping[value]
+    try:
+        return inverse_val_mapping[int(value)]
+    except (ValueError, KeyError):
+        raise KeyError("'{}' not in val_mapping".format(value))
+
+
 class _SetParamContext:
     """
     This class is returned by the set method of parameters
@@ -95,7 +224,7 @@ class _SetParamContext:
     """
     def __init__(self, parameter):
         self._parameter = parameter
-        self._original_value = self._parameter._latest["value"]
+        self._original_value = self._parameter._latest.value
 
     def __enter__(self):
         pass
@@ -184,6 +313,21 @@ class _BaseParameter(Metadatable):
     """
     get_raw = None  # type: Optional[Callable]
     set_raw = None  # type: Optional[Callable]
+    # loads a list of raw values that the instrument steps through itself,
+    # see ``set_many``
+    set_many_raw = None  # type: Optional[Callable]
+
+    # the transformations between values and raw values, see
+    # ``_compile_transforms``
+    _get_parser = None  # type: Optional[Callable]
+    _set_parser = None  # type: Optional[Callable]
+    _scale = None  # type: Optional[Union[Number, Iterable[Number]]]
+    _offset = None  # type: Optional[Union[Number, Iterable[Number]]]
+    _val_mapping = None  # type: Optional[dict]
+    _inverse_val_mapping = None  # type: Optional[dict]
+    _from_raw = None  # type: Optional[Callable]
+    _to_raw = None  # type: Optional[Callable]
+    _has_transforms = False
 
     def __init__(self, name: str,
                  instrument: Optional['Instrument'],
@@ -232,10 +376,6 @@ class _BaseParameter(Metadatable):
         self.post_delay = post_delay
 
         self.val_mapping = val_mapping
-        if val_mapping is None:
-            self.inverse_val_mapping = None
-        else:
-            self.inverse_val_mapping = {v: k for k, v in val_mapping.items()}
 
         self.get_parser = get_parser
         self.set_parser = set_parser
@@ -243,7 +383,7 @@ class _BaseParameter(Metadatable):
         # record of latest value and when it was set or measured
         # what exactly this means is different for different subclasses
         # but they all use the same attributes so snapshot is consistent.
-        self._latest = {'value': None, 'ts': None, 'raw_value': None}
+        self._latest = _LatestValue()
         self.get_latest = GetLatest(self, max_val_age=max_val_age)
 
         if hasattr(self, 'get_raw') and self.get_raw is not None:
@@ -270,6 +410,10 @@ class _BaseParameter(Metadatable):
         # check if additional waiting time is needed before next set
         self._t_last_set = time.perf_counter()
 
+        # without a step, a set needs no ramp unless a subclass defines one
+        self._default_ramp = (type(self).get_ramp_values is
+                              _BaseParameter.get_ramp_values)
+
     def __str__(self):
         """Include the instrument name with the Parameter name if possible."""
         inst_name = getattr(self._instrument, 'name', '')
@@ -314,7 +458,7 @@ class _BaseParameter(Metadatable):
                 and self._snapshot_value and update:
             self.get()
 
-        state = copy(self._latest) # type: Dict[str, Any]
+        state = dict(self._latest) # type: Dict[str, Any]
         state['__class__'] = full_class(self)
         state['full_name'] = str(self)
 
@@ -349,68 +493,158 @@ class _BaseParameter(Metadatable):
         """
         if validate:
             self.validate(value)
-        if (self.get_parser is None and
-            self.set_parser is None and
-            self.val_mapping is None and
-            self.scale is None and
-            self.offset is None):
-                self.raw_value = value
-        self._latest = {'value': value, 'ts': datetime.now(),
-                        'raw_value': self.raw_value}
+        if not self._has_transforms:
+            self.raw_value = value
+        self._latest = _LatestValue(value, self.raw_value, time.monotonic(),
+                                    time.time())
+
+    def _compile_transforms(self) -> None:
+        """
+        Compose the functions that turn a raw value into a value
+        (``get_parser``, ``offset``, ``scale``, inverse ``val_mapping``) and
+        a value into a raw value (``val_mapping``, ``scale``, ``offset``,
+        ``set_parser``), leaving out the steps that are not used. Called
+        whenever one of these attributes changes, so that getting and setting
+        do not have to check them every time.
+        """
+        from_raw = []  # type: List[Callable]
+        to_raw = []  # type: List[Callable]
+
+        if self._get_parser is not None:
+            from_raw.append(self._get_parser)
+
+        # apply offset first (native scale), then scale
+        if self._offset is not None:
+            if isinstance(self._offset, collections.abc.Iterable):
+                from_raw.append(partial(_subtract_offsets, self._offset))
+                to_raw.append(partial(_add_offsets, self._offset))
+            else:
+                from_raw.append(partial(_subtract_offset, self._offset))
+                to_raw.append(partial(_add_offset, self._offset))
+
+        if self._scale is not None:
+            if isinstance(self._scale, collections.abc.Iterable):
+                from_raw.append(partial(_divide_scales, self._scale))
+                to_raw.append(partial(_multiply_scales, self._scale))
+            else:
+                from_raw.append(partial(_divide_scale, self._scale))
+                to_raw.append(partial(_multiply_scale, self._scale))
+
+        if self._inverse_val_mapping is not None:
+            from_raw.append(partial(_map_inverse, self._inverse_val_mapping))
+        if self._val_mapping is not None:
+            to_raw.append(self._val_mapping.__getitem__)
+
+        # the transformation of set values is the reverse of that of get
+        to_raw.reverse()
+        if self._set_parser is not None:
+            to_raw.append(self._set_parser)
+
+        self._from_raw = _compose(from_raw)
+        self._to_raw = _compose(to_raw)
+        self._has_transforms = bool(from_raw or to_raw)
+
+    @property
+    def get_parser(self) -> Optional[Callable]:
+        return self._get_parser
+
+    @get_parser.setter
+    def get_parser(self, get_parser: Optional[Callable]) -> None:
+        self._get_parser = get_parser
+        self._compile_transforms()
+
+    @property
+    def set_parser(self) -> Optional[Callable]:
+        return self._set_parser
+
+    @set_parser.setter
+    def set_parser(self, set_parser: Optional[Callable]) -> None:
+        self._set_parser = set_parser
+        self._compile_transforms()
+
+    @property
+    def scale(self) -> Optional[Union[Number, Iterable[Number]]]:
+        return self._scale
+
+    @scale.setter
+    def scale(self, scale: Optional[Union[Number, Iterable[Number]]]) -> None:
+        self._scale = scale
+        self._compile_transforms()
+
+    @property
+    def offset(self) -> Optional[Union[Number, Iterable[Number]]]:
+        return self._offset
+
+    @offset.setter
+    def offset(self,
+               offset: Optional[Union[Number, Iterable[Number]]]) -> None:
+        self._offset = offset
+        self._compile_transforms()
+
+    @property
+    def val_mapping(self) -> Optional[dict]:
+        return self._val_mapping
+
+    @val_mapping.setter
+    def val_mapping(self, val_mapping: Optional[dict]) -> None:
+        """
+        Setting val_mapping also sets inverse_val_mapping to its inverse.
+        """
+        self._val_mapping = val_mapping
+        if val_mapping is None:
+            self._inverse_val_mapping = None
+        else:
+            self._inverse_val_mapping = {v: k for k, v in val_mapping.items()}
+        self._compile_transforms()
+
+    @property
+    def inverse_val_mapping(self) -> Optional[dict]:
+        return self._inverse_val_mapping
+
+    @inverse_val_mapping.setter
+    def inverse_val_mapping(self, inverse_val_mapping: Optional[dict]) -> None:
+        self._inverse_val_mapping = inverse_val_mapping
+        self._compile_transforms()
 
     def _wrap_get(self, get_function):
         @wraps(get_function)
         def get_wrapper(*args, **kwargs):
             try:
                 # There might be cases where a .get also has args/kwargs
-                value = get_function(*args, **kwargs)
-                self.raw_value = value
-
-                if self.get_parser is not None:
-                    value = self.get_parser(value)
-
-                # apply offset first (native scale)
-                if self.offset is not None:
-                    # offset values
-                    if isinstance(self.offset, collections.abc.Iterable):
-                        # offset contains multiple elements, one for each value
-                        value = tuple(value - offset for value, offset
-                                      in zip(value, self.offset))
-                    elif isinstance(value, collections.abc.Iterable):
-                        # Use single offset for all values
-                        value = tuple(value - self.offset for value in value)
-                    else:
-                        value -= self.offset
-
-                # scale second
-                if self.scale is not None:
-                    # Scale values
-                    if isinstance(self.scale, collections.abc.Iterable):
-                        # Scale contains multiple elements, one for each value
-                        value = tuple(value / scale for value, scale
-                                      in zip(value, self.scale))
-                    elif isinstance(value, collections.abc.Iterable):
-                        # Use single scale for all values
-                        value = tuple(value / self.scale for value in value)
-                    else:
-                        value /= self.scale
-
-                if self.val_mapping is not None:
-                    if value in self.inverse_val_mapping:
-                        value = self.inverse_val_mapping[value]
-                    else:
-                        try:
-                            value = self.inverse_val_mapping[int(value)]
-                        except (ValueError, KeyError):
-                            raise KeyError("'{}' not in val_mapping".format(value))
-                self._save_val(value)
-                return value
+                raw_value = get_function(*args, **kwargs)
             except Exception as e:
                 e.args = e.args + ('getting {}'.format(self),)
                 raise e
+            return self._save_raw_val(raw_value)
 
+        # lets thread_map run the wrapper in the worker of the instrument
+        get_wrapper.parameter = self
         return get_wrapper
 
+    def _save_raw_val(self, raw_value):
+        """
+        Turn a raw value as returned by the instrument into the value of the
+        parameter by applying ``get_parser``, ``offset``, ``scale`` and
+        ``val_mapping``, and save both as the latest values.
+
+        Args:
+            raw_value: the raw value of the parameter
+
+        Returns:
+            the value of the parameter
+        """
+        try:
+            self.raw_value = raw_value
+            if self._from_raw is None:
+                value = raw_value
+            else:
+                value = self._from_raw(raw_value)
+            self._save_val(value)
+            return value
+        except Exception as e:
+            e.args = e.args + ('getting {}'.format(self),)
+            raise e
+
     def _wrap_set(self, set_function):
         @wraps(set_function)
         def set_wrapper(value, **kwargs):
@@ -420,50 +654,30 @@ class _BaseParameter(Metadatable):
                 # In some cases intermediate sweep values must be used.
                 # Unless `self.step` is defined, get_sweep_values will return
                 # a list containing only `value`.
-                steps = self.get_ramp_values(value, step=self.step)
+                if self._step is None and self._default_ramp:
+                    steps = (value,)  # type: Iterable
+                else:
+                    steps = self.get_ramp_values(value, step=self._step)
 
-                for step_index, val_step in enumerate(steps):
+                for val_step in steps:
                     # even if the final value is valid we may be generating
                     # steps that are not so validate them too
                     self.validate(val_step)
-                    if self.val_mapping is not None:
-                        # Convert set values using val_mapping dictionary
-                        raw_value = self.val_mapping[val_step]
-                    else:
-                        raw_value = val_step
 
-                    # transverse transformation in reverse order as compared to
-                    # getter:
-                    # apply scale first
-                    if self.scale is not None:
-                        if isinstance(self.scale, collections.abc.Iterable):
-                            # Scale contains multiple elements, one for each value
-                            raw_value = tuple(val * scale for val, scale
-                                              in zip(raw_value, self.scale))
-                        else:
-                            # Use single scale for all values
-                            raw_value *= self.scale
-
-                    # apply offset next
-                    if self.offset is not None:
-                        if isinstance(self.offset, collections.abc.Iterable):
-                            # offset contains multiple elements, one for each value
-                            raw_value = tuple(val + offset for val, offset
-                                              in zip(raw_value, self.offset))
-                        else:
-                            # Use single offset for all values
-                            raw_value += self.offset
-
-                    # parser last
-                    if self.set_parser is not None:
-                        raw_value = self.set_parser(raw_value)
+                    # transverse transformation in reverse order as compared
+                    # to getter: val_mapping, scale, offset, parser last
+                    if self._to_raw is None:
+                        raw_value = val_step
+                    else:
+                        raw_value = self._to_raw(val_step)
 
                     # Check if delay between set operations is required
-                    t_elapsed = time.perf_counter() - self._t_last_set
-                    if t_elapsed < self.inter_delay:
-                        # Sleep until time since last set is larger than
-                        # self.post_delay
-                        time.sleep(self.inter_delay - t_elapsed)
+                    if self._inter_delay:
+                        t_elapsed = time.perf_counter() - self._t_last_set
+                        if t_elapsed < self._inter_delay:
+                            # Sleep until time since last set is larger than
+                            # self.inter_delay
+                            timing.sleep(self._inter_delay - t_elapsed)
 
                     # Start timer to measure execution time of set_function
                     t0 = time.perf_counter()
@@ -478,16 +692,65 @@ class _BaseParameter(Metadatable):
 
                     # Check if any delay after setting is required
                     t_elapsed = self._t_last_set - t0
-                    if t_elapsed < self.post_delay:
+                    if t_elapsed < self._post_delay:
                         # Sleep until total time is larger than self.post_delay
-                        time.sleep(self.post_delay - t_elapsed)
+                        timing.sleep(self._post_delay - t_elapsed)
 
             except Exception as e:
                 e.args = e.args + ('setting {} to {}'.format(self, value),)
                 raise e
 
+        # lets thread_map run the wrapper in the worker of the instrument
+        set_wrapper.parameter = self
         return set_wrapper
 
+    def set_many(self, values: Sequence) -> None:
+        """
+        Sweep the parameter through a list of values.
+
+        If the instrument can step through a list of setpoints by itself,
+        for example one setpoint per trigger, the parameter has a
+        ``set_many_raw`` that loads the raw values of the whole list into the
+        instrument in one go. ``set_many`` then returns as soon as the list
+        is loaded, and the instrument steps through it while the readback is
+        buffered, so that a sweep takes a few transactions instead of one or
+        more per point. The latest value of the parameter is not updated,
+        since it is not known when the instrument steps.
+
+        Otherwise the values are set one by one with ``set``.
+
+        Args:
+            values: the values to sweep through, in order
+
+        Raises:
+            ValueError: if the parameter has a ``step`` and values change by
+                more than step from one to the next
+        """
+        if self.set_many_raw is None:
+            for value in values:
+                self.set(value)
+            return
+
+        try:
+            for value in values:
+                self.validate(value)
+            if self._step is not None and len(values) > 1:
+                if numpy.any(numpy.abs(numpy.diff(values)) > self._step):
+                    raise ValueError('values change by more than step {} from '
+                                     'one to the next'.format(self._step))
+                # ramp to the start of the list as for a single set
+                self.set(values[0])
+
+            if self._to_raw is None:
+                raw_values = list(values)
+            else:
+                raw_values = [self._to_raw(value) for value in values]
+            self.set_many_raw(raw_values)
+        except Exception as e:
+            e.args = e.args + ('setting {} to a list of {} values'.format(
+                self, len(values)),)
+            raise e
+
     def get_ramp_values(self, value: Union[float, int, Sized],
                         step: Union[float, int]=None) -> List[Union[float,
                                                                     int,
@@ -534,13 +797,14 @@ class _BaseParameter(Metadatable):
             value (any): value to validate
 
         """
+        if self.vals is None:
+            return
         if self._instrument:
             context = (getattr(self._instrument, 'name', '') or
                        str(self._instrument.__class__)) + '.' + self.name
         else:
             context = self.name
-        if self.vals is not None:
-            self.vals.validate(value, 'Parameter: ' + context)
+        self.vals.validate(value, 'Parameter: ' + context)
 
     @property
     def step(self):
@@ -722,6 +986,42 @@ class _BaseParameter(Metadatable):
         self.set(value)
         return context_manager
 
+    async def async_get(self):
+        """
+        Get the value of the parameter without blocking the event loop.
+
+        The ``get`` runs in the worker thread of the instrument of the
+        parameter (see ``Instrument.executor``), so that the calls to one
+        instrument are made one at a time, while calls to different
+        instruments can run concurrently, e.g. with ``asyncio.gather``.
+        Parameters without an instrument use the default executor of the
+        event loop.
+
+        Returns:
+            the value of the parameter
+        """
+        loop = get_running_loop()
+        return await loop.run_in_executor(self._executor, self.get)
+
+    async def async_set(self, value) -> None:
+        """
+        Set the parameter without blocking the event loop, in the same
+        thread as ``async_get``.
+
+        Args:
+            value: the value to set
+        """
+        loop = get_running_loop()
+        await loop.run_in_executor(self._executor, self.set, value)
+
+    @property
+    def _executor(self) -> Optional[Executor]:
+        """
+        The executor of the root instrument of the parameter, or None if it
+        does not have one
+        """
+        return getattr(self.root_instrument, 'executor', None)
+
     @property
     def name_parts(self) -> List[str]:
         if self.instrument is not None:
@@ -838,6 +1138,11 @@ class Parameter(_BaseParameter):
             been set or measured more recently than this, perform an
             additional measurement.
 
+        set_many_cmd (Optional[Callable]): function that loads a list of raw
+            values into the instrument, which then steps through them by
+            itself. Used by ``set_many`` and ``SweepFixedValues
+            .to_hardware_list``.
+
         docstring (Optional[str]): documentation string for the __doc__
             field of the object. The __doc__ field of the instance is used by
             some help systems, but not all
@@ -857,6 +1162,7 @@ class Parameter(_BaseParameter):
                  max_val_age: Optional[float]=None,
                  vals: Optional[Validator]=None,
                  docstring: Optional[str]=None,
+                 set_many_cmd: Optional[Callable]=None,
                  **kwargs) -> None:
         super().__init__(name=name, instrument=instrument, vals=vals, **kwargs)
 
@@ -867,7 +1173,7 @@ class Parameter(_BaseParameter):
                 if max_val_age is not None:
                     raise SyntaxError('Must have get method or specify get_cmd '
                                       'when max_val_age is set')
-                self.get_raw = lambda: self._latest['raw_value']
+                self.get_raw = lambda: self._latest.raw_value
             else:
                 exec_str_ask = instrument.ask if instrument else None
                 self.get_raw = Command(arg_count=0, cmd=get_cmd, exec_str=exec_str_ask)
@@ -878,9 +1184,12 @@ class Parameter(_BaseParameter):
                 self.set_raw = partial(self._save_val, validate=False)# type: Callable
             else:
                 exec_str_write = instrument.write if instrument else None
-                self.set_raw = Command(arg_count=1, cmd=set_cmd, exec_str=exec_str_write)# type: Callable
+                self.set_raw = Command(arg_count=1, cmd=set_cmd, exec_str=exec_str_write)
             self.set = self._wrap_set(self.set_raw)
 
+        if set_many_cmd is not None:
+            self.set_many_raw = set_many_cmd
+
         self._meta_attrs.extend(['label', 'unit', 'vals'])
 
         self.label = name if label is None else label
@@ -1378,15 +1687,15 @@ class GetLatest(DelegateAttributes):
         state = self.parameter._latest
         if self.max_val_age is None:
             # Return last value since max_val_age is not specified
-            return state['value']
+            return state.value
         else:
-            oldest_ok_val = datetime.now() - timedelta(seconds=self.max_val_age)
-            if state['ts'] is None or state['ts'] < oldest_ok_val:
+            if (state.timestamp is None or
+                    time.monotonic() - state.timestamp > self.max_val_age):
                 # Time of last get exceeds max_val_age seconds, need to
                 # perform new .get()
                 return self.parameter.get()
             else:
-                return state['value']
+                return state.value
 
     def __call__(self):
         return self.get()
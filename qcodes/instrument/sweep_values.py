@@ -1,5 +1,7 @@
 from copy import deepcopy
 
+import numpy as np
+
 from qcodes.utils.helpers import (is_sequence, permissive_range, make_sweep,
                                   named_repr)
 from qcodes.utils.metadata import Metadatable
@@ -245,6 +247,25 @@ class SweepFixedValues(SweepValues):
             if 'first' in snap and 'last' in snap:
                 snap['last'], snap['first'] = snap['first'], snap['last']
 
+    def to_hardware_list(self):
+        """
+        Load the values of this sweep into the instrument as a list of
+        setpoints that it steps through by itself, see
+        ``Parameter.set_many``. If the parameter can not do that, it is set
+        to each of the values in turn instead.
+
+        Returns:
+            np.ndarray: the values of the sweep, to store as the setpoints of
+                the buffered readback in one ``DataSaver.add_result``
+        """
+        set_many = getattr(self.parameter, 'set_many', None)
+        if set_many is not None:
+            set_many(self._values)
+        else:
+            for value in self._values:
+                self.set(value)
+        return np.array(self._values)
+
     def snapshot_base(self, update=False):
         """
         Snapshot state of SweepValues.
@@ -1,8 +1,10 @@
 """Visa instrument driver based on pyvisa."""
-from typing import Sequence
+from typing import Sequence, Optional, Union
+import time
 import warnings
 import logging
 
+import numpy as np
 import visa
 import pyvisa.constants as vi_const
 import pyvisa.resources
@@ -43,8 +45,13 @@ class VisaInstrument(Instrument):
 
     Attributes:
         visa_handle (pyvisa.resources.Resource): The communication channel.
+
+        binary_block_throughput (Optional[float]): The throughput in bytes
+            per second of the last binary block written or read.
     """
 
+    binary_block_throughput = None  # type: Optional[float]
+
     def __init__(self, name, address=None, timeout=5,
                  terminator='', device_clear=True, visalib=None, **kwargs):
 
@@ -225,6 +232,144 @@ class VisaInstrument(Instrument):
         log.debug(f"Got instrument response: {response}")
         return response
 
+    def write_binary_block(self, cmd: str, data: np.ndarray) -> None:
+        """
+        Write a command followed by the bytes of an array as an IEEE 488.2
+        definite length arbitrary block, ``<cmd>#<n><length><data>``.
+
+        Args:
+            cmd: The command, including any separator before the block.
+            data: The values to send. Convert them to the data type and byte
+                order that the instrument expects beforehand.
+        """
+        payload = np.ascontiguousarray(data).reshape(-1).view(np.uint8)
+        # join copies the memory of the array only once
+        message = b''.join((cmd.encode(), binary_block_header(len(payload)),
+                            payload.data))
+
+        log.debug(f"Writing {len(payload)} bytes as a binary block to "
+                  f"instrument {self.name}: {cmd}")
+        t_start = time.perf_counter()
+        with self._io_lock:
+            self.visa_handle.write_raw(message)
+        self._record_throughput(len(payload), t_start)
+
+    def read_binary_block(self, dtype: Union[str, np.dtype]='<f4',
+                          out: Optional[np.ndarray]=None,
+                          chunk_size: int=2**20,
+                          expect_termination: bool=True) -> np.ndarray:
+        """
+        Read an IEEE 488.2 definite length arbitrary block,
+        ``#<n><length><data>``, into an array, for example after writing a
+        query for a trace. Use ``query_binary_block`` to write the query and
+        read the block without another thread talking to the instrument in
+        between.
+
+        The data is read in chunks of at most chunk_size bytes straight into
+        the memory of the output array, which may be preallocated to read
+        several blocks into one array without copying.
+
+        Args:
+            dtype: The data type of the values in the block, including the
+                byte order.
+            out: A C-contiguous array of data type dtype to read the values
+                into, with at least as many elements as the block has.
+                Allocated if not given.
+            chunk_size: The maximum number of bytes per VISA read.
+            expect_termination: Whether the block is followed by the read
+                terminator, which is then read and discarded.
+
+        Returns:
+            The values of the block, as a view of out if given.
+
+        Raises:
+            ValueError: If the response is not a definite length block, if
+                its length is not a multiple of the size of dtype, or if out
+                is too small or has another data type.
+        """
+        with self._io_lock:
+            return self._read_binary_block(dtype, out, chunk_size,
+                                           expect_termination)
+
+    def _read_binary_block(self, dtype: Union[str, np.dtype],
+                           out: Optional[np.ndarray],
+                           chunk_size: int,
+                           expect_termination: bool) -> np.ndarray:
+        t_start = time.perf_counter()
+        handle = self.visa_handle
+        header = handle.read_bytes(2)
+        n_digits = header[1:]
+        if header[:1] != b'#' or not n_digits.isdigit() or n_digits == b'0':
+            raise ValueError(f'Expected a definite length binary block from '
+                             f'{self.name}, got {header!r}')
+        n_bytes = int(handle.read_bytes(int(n_digits)))
+
+        dtype = np.dtype(dtype)
+        if n_bytes % dtype.itemsize:
+            raise ValueError(f'The binary block of {n_bytes} bytes from '
+                             f'{self.name} does not contain values of '
+                             f'{dtype.itemsize} bytes.')
+        n_values = n_bytes // dtype.itemsize
+        if out is None:
+            out = np.empty(n_values, dtype=dtype)
+        elif (out.dtype != dtype or out.size < n_values
+              or not out.flags.c_contiguous):
+            raise ValueError(f'Can not read {n_values} values of type '
+                             f'{dtype} into a {out.dtype} array of shape '
+                             f'{out.shape}.')
+        values = out.reshape(-1)[:n_values]
+        buffer = values.view(np.uint8).data
+
+        received = 0
+        while received < n_bytes:
+            chunk = handle.read_bytes(min(chunk_size, n_bytes - received))
+            buffer[received:received + len(chunk)] = chunk
+            received += len(chunk)
+        if expect_termination and handle.read_termination:
+            handle.read_raw()
+
+        self._record_throughput(n_bytes, t_start)
+        return values
+
+    def query_binary_block(self, cmd: str,
+                           dtype: Union[str, np.dtype]='<f4',
+                           out: Optional[np.ndarray]=None,
+                           chunk_size: int=2**20,
+                           expect_termination: bool=True) -> np.ndarray:
+        """
+        Write a query and read the IEEE 488.2 definite length arbitrary
+        block that the instrument answers with, see ``read_binary_block``.
+
+        The instrument is locked from the write until the whole block has
+        been read, so that no other thread can talk to the instrument in
+        between and get (part of) the block as its answer.
+
+        Args:
+            cmd: The query to send to the instrument.
+            dtype: The data type of the values in the block, including the
+                byte order.
+            out: A C-contiguous array of data type dtype to read the values
+                into. Allocated if not given.
+            chunk_size: The maximum number of bytes per VISA read.
+            expect_termination: Whether the block is followed by the read
+                terminator, which is then read and discarded.
+
+        Returns:
+            The values of the block, as a view of out if given.
+        """
+        with self._io_lock:
+            self.write(cmd)
+            return self._read_binary_block(dtype, out, chunk_size,
+                                           expect_termination)
+
+    def _record_throughput(self, n_bytes: int, t_start: float) -> None:
+        elapsed = time.perf_counter() - t_start
+        if elapsed > 0:
+            self.binary_block_throughput = n_bytes / elapsed
+            log.debug(f"Transferred a binary block of {n_bytes} bytes "
+                      f"to/from {self.name} at "
+                      f"{self.binary_block_throughput / 1e6:.1f} MB/s")
+
     def snapshot_base(self, update: bool=False,
                       params_to_skip_update: Sequence[str] = None):
         """
@@ -248,3 +393,12 @@ class VisaInstrument(Instrument):
         snap['timeout'] = self.timeout.get()
 
         return snap
+
+
+def binary_block_header(n_bytes: int) -> bytes:
+    """
+    The header of an IEEE 488.2 definite length arbitrary block of n_bytes
+    bytes, ``#<number of digits of n_bytes><n_bytes>``.
+    """
+    length = str(n_bytes)
+    return f'#{len(length)}{length}'.encode()
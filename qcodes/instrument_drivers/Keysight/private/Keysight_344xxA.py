@@ -86,7 +86,7 @@ class ArrayMeasurement(ArrayParameter):
 
         # parse the acquired values
         try:
-            numvals = np.array(list(map(float, rawvals.split(','))))
+            numvals = np.array(rawvals.split(','), dtype=float)
         except AttributeError:
             numvals = None
 
@@ -39,6 +39,7 @@ class QDacChannel(InstrumentChannel):
 
         # Validate the channel
         self._CHANNEL_VALIDATION.validate(channum)
+        self._channum = channum
 
         # Add the parameters
 
@@ -131,13 +132,15 @@ class QDacMultiChannelParameter(MultiChannelInstrumentParameter):
         Return a tuple containing the data from each of the channels in the
         list.
         """
-        # For voltages, we can do something slightly faster than the naive
-        # approach
+        # For the parameters that the channels read from the status of the
+        # QDac, we can do something much faster than the naive approach:
+        # read the status of all channels once instead of once per channel
 
-        if self._param_name == 'v':
+        if self._param_name in ('v', 'vrange'):
             qdac = self._channels[0]._parent
             qdac._get_status(readcurrents=False)
-            output = tuple(chan.parameters[self._param_name].get_latest()
+            output = tuple(qdac._state_from_status(chan._channum,
+                                                   self._param_name)
                            for chan in self._channels)
         else:
             output = tuple(chan.parameters[self._param_name].get()
@@ -384,6 +387,13 @@ class QDac(VisaInstrument):
 
         self._get_status(readcurrents=False)
 
+        return self._state_from_status(chan, param)
+
+    def _state_from_status(self, chan, param):
+        """
+        The value of a parameter of a channel from the status read last by
+        ``_get_status``, see ``read_state``
+        """
         value = getattr(self.channels[chan-1], param).get_latest()
 
         returnmap = {'vrange': {1: 1, 10: 0},
@@ -106,7 +106,7 @@ class ChannelBuffer(ArrayParameter):
         rawdata = self._instrument.visa_handle.read_raw()
 
         # parse it
-        realdata = np.fromstring(rawdata, dtype='<i2')
+        realdata = np.frombuffer(rawdata, dtype='<i2')
         numbers = realdata[::2]*2.0**(realdata[1::2]-124)
         if self.shape[0] != N:
             raise RuntimeError("SR830 got {} points in buffer expected {}".format(N, self.shape[0]))
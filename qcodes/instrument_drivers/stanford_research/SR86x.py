@@ -1,6 +1,6 @@
 import numpy as np
 import logging
-from typing import Sequence, Dict, Callable, Tuple
+from typing import Sequence, Dict, Callable, Tuple, Optional
 
 from qcodes import VisaInstrument
 from qcodes.instrument.channel import InstrumentChannel, ChannelList
@@ -386,7 +386,12 @@ class SR86xBuffer(InstrumentChannel):
                              f"is larger than current capture length of the "
                              f"buffer ({current_capture_length}kB).")
 
-        values = np.array([])
+        # the blocks are read straight into one buffer, one after the other.
+        # A block may be shorter than requested, hence only the part of the
+        # buffer that has been filled is returned
+        values = np.empty(size_in_kb * 1024 // 4, dtype='<f4')
+        values_per_kb = 1024 // 4
+        n_values_read = 0
         data_size_to_read_in_kb = size_in_kb
         n_readings = 0
 
@@ -398,19 +403,21 @@ class SR86xBuffer(InstrumentChannel):
             else:
                 size_of_this_reading = data_size_to_read_in_kb
 
-            data_from_this_reading = self._get_raw_capture_data_block(
-                size_of_this_reading,
-                offset_in_kb=offset)
-            values = np.append(values, data_from_this_reading)
+            stop = n_values_read + size_of_this_reading * values_per_kb
+            block = self._get_raw_capture_data_block(
+                size_of_this_reading, offset_in_kb=offset,
+                out=values[n_values_read:stop])
+            n_values_read += len(block)
 
             data_size_to_read_in_kb -= size_of_this_reading
             n_readings += 1
 
-        return values
+        return values[:n_values_read].astype(np.float64)
 
     def _get_raw_capture_data_block(self,
                                     size_in_kb: int,
-                                    offset_in_kb: int=0
+                                    offset_in_kb: int=0,
+                                    out: Optional[np.ndarray]=None
                                     ) -> np.ndarray:
         """
         Read data from the buffer. The maximum amount of data that can be
@@ -434,6 +441,9 @@ class SR86xBuffer(InstrumentChannel):
                 Offset within the buffer of where to read the data; for
                 example, when 0 is specified, the data is read from the start
                 of the buffer
+            out
+                Optional float32 array of 256 values per kB to read the data
+                into, instead of allocating a new array
 
         Returns:
             A one-dimensional numpy array of the requested data. Note that the
@@ -464,15 +474,11 @@ class SR86xBuffer(InstrumentChannel):
                              f"2kB chunks "
                              f"({size_of_currently_captured_data}kB)")
 
-        values = self._parent.visa_handle.query_binary_values(
-            f"CAPTUREGET? {offset_in_kb}, {size_in_kb}",
-            datatype='f',
-            is_big_endian=False,
-            expect_termination=False)
         # the sr86x does not include an extra termination char on binary
         # messages so we set expect_termination to False
-
-        return np.array(values)
+        return self._parent.query_binary_block(
+            f"CAPTUREGET? {offset_in_kb}, {size_in_kb}", dtype='<f4',
+            out=out, expect_termination=False)
 
     def capture_one_sample_per_trigger(self,
                                        trigger_count: int,
@@ -624,6 +630,13 @@ class SR86x(VisaInstrument):
     """
     This is the code for Stanford_SR865 Lock-in Amplifier
     """
+    # the SR86x accepts several commands in one message, separated by
+    # semicolons (its commands have no SCPI tree, so no ':' is needed), and
+    # answers the queries in one line, which lets ``get_parameters`` read
+    # e.g. X, Y and the sensitivity in one round trip
+    batch_query_separator = ';'
+    batch_response_separator = ';'
+
     _VOLT_TO_N = {1: 0, 500e-3: 1, 200e-3: 2,
                   100e-3: 3, 50e-3: 4, 20e-3: 5,
                   10e-3: 6, 5e-3: 7, 2e-3: 8,
@@ -3,7 +3,6 @@ import logging
 import warnings
 
 import numpy as np
-import array as arr
 
 from time import sleep, localtime
 from io import BytesIO
@@ -1186,12 +1185,8 @@ class Tektronix_AWG5014(VisaInstrument):
             print('Writing to:',
                   self.ask('MMEMory:CDIRectory?').replace('\n', '\\ '),
                   filename)
-        # Header indicating the name and size of the file being send
-        name_str = 'MMEMory:DATA "{}",'.format(filename).encode('ASCII')
-        size_str = ('#' + str(len(str(len(awg_file)))) +
-                    str(len(awg_file))).encode('ASCII')
-        mes = name_str + size_str + awg_file
-        self.visa_handle.write_raw(mes)
+        self.write_binary_block('MMEMory:DATA "{}",'.format(filename),
+                                np.frombuffer(awg_file, dtype=np.uint8))
 
     def load_awg_file(self, filename):
         """
@@ -1620,18 +1615,8 @@ class Tektronix_AWG5014(VisaInstrument):
         # Prepare the data block
         number = ((2**13 - 1) + (2**13 - 1) * w + 2**14 *
                   np.array(m1) + 2**15 * np.array(m2))
-        number = number.astype('int')
-        ws = arr.array('H', number)
-
-        ws = ws.tobytes()
-        s1 = 'WLISt:WAVeform:DATA "{}",'.format(wfmname)
-        s1 = s1.encode('UTF-8')
-        s3 = ws
-        s2 = '#' + str(len(str(len(s3)))) + str(len(s3))
-        s2 = s2.encode('UTF-8')
-
-        mes = s1 + s2 + s3
-        self.visa_handle.write_raw(mes)
+        self.write_binary_block('WLISt:WAVeform:DATA "{}",'.format(wfmname),
+                                number.astype('<u2'))
 
     def clear_message_queue(self, verbose=False):
         """
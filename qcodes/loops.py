@@ -54,7 +54,8 @@ import numpy as np
 from qcodes.station import Station
 from qcodes.data.data_set import new_data
 from qcodes.data.data_array import DataArray
-from qcodes.utils.helpers import wait_secs, full_class, tprint
+from qcodes.utils.helpers import full_class, tprint
+from qcodes.utils.timing import Scheduler
 from qcodes.utils.metadata import Metadatable
 
 from .actions import (_actions_snapshot, Task, Wait, _Measure, _Nest,
@@ -89,6 +90,12 @@ class Loop(Metadatable):
             and give an error if you wait longer than expected.
         progress_interval: should progress of the loop every x seconds. Default
             is None (no output)
+        period: a number of seconds between the starts of consecutive
+            points. If given, point i is set at ``i * period`` after the
+            start of the loop and its delay ends at ``i * period + delay``,
+            so the timing of the points does not depend on how long the
+            previous points took. Default None: every point starts when the
+            previous one is done, and its delay counts from when it was set.
 
     After creating a Loop, you attach one or more ``actions`` to it, making an
     ``ActiveLoop``
@@ -104,13 +111,17 @@ class Loop(Metadatable):
     inside this one.
     """
     def __init__(self, sweep_values, delay=0, station=None,
-                 progress_interval=None):
+                 progress_interval=None, period=None):
         super().__init__()
         if delay < 0:
             raise ValueError('delay must be > 0, not {}'.format(repr(delay)))
+        if period is not None and period <= 0:
+            raise ValueError('period must be > 0, not {}'.format(
+                repr(period)))
 
         self.sweep_values = sweep_values
         self.delay = delay
+        self.period = period
         self.station = station
         self.nested_loop = None
         self.actions = None
@@ -160,7 +171,8 @@ class Loop(Metadatable):
 
     def _copy(self):
         out = Loop(self.sweep_values, self.delay,
-                   progress_interval=self.progress_interval)
+                   progress_interval=self.progress_interval,
+                   period=self.period)
         out.nested_loop = self.nested_loop
         out.then_actions = self.then_actions
         out.station = self.station
@@ -199,7 +211,8 @@ class Loop(Metadatable):
         return ActiveLoop(self.sweep_values, self.delay, *actions,
                           then_actions=self.then_actions, station=self.station,
                           progress_interval=self.progress_interval,
-                          bg_task=self.bg_task, bg_final_task=self.bg_final_task, bg_min_delay=self.bg_min_delay)
+                          bg_task=self.bg_task, bg_final_task=self.bg_final_task, bg_min_delay=self.bg_min_delay,
+                          period=self.period)
 
     def with_bg_task(self, task, bg_final_task=None, min_delay=0.01):
         """
@@ -218,8 +231,9 @@ class Loop(Metadatable):
                 Note that if a task is doing a lot of processing it is recommended
                 to increase min_delay.
                 Note that the actual time between task invocations may be much
-                longer than this, as the task is only run between passes
-                through the loop.
+                longer than this, as the task is only run in the slack time
+                of the delays of the loop if it fits in there, or else
+                between passes through the loop.
         """
         return _attach_bg_task(self, task, bg_final_task, min_delay)
 
@@ -297,12 +311,15 @@ class Loop(Metadatable):
         Returns:
             dict: base snapshot
         """
-        return {
+        snap = {
             '__class__': full_class(self),
             'sweep_values': self.sweep_values.snapshot(update=update),
             'delay': self.delay,
             'then_actions': _actions_snapshot(self.then_actions, update)
         }
+        if self.period is not None:
+            snap['period'] = self.period
+        return snap
 
 
 def _attach_then_actions(loop, actions, overwrite):
@@ -352,10 +369,11 @@ class ActiveLoop(Metadatable):
 
     def __init__(self, sweep_values, delay, *actions, then_actions=(),
                  station=None, progress_interval=None, bg_task=None,
-                 bg_final_task=None, bg_min_delay=None):
+                 bg_final_task=None, bg_min_delay=None, period=None):
         super().__init__()
         self.sweep_values = sweep_values
         self.delay = delay
+        self.period = period
         self.actions = list(actions)
         self.progress_interval = progress_interval
         self.then_actions = then_actions
@@ -400,7 +418,8 @@ class ActiveLoop(Metadatable):
                 the Loop) will add to each other or overwrite the earlier ones.
         """
         loop = ActiveLoop(self.sweep_values, self.delay, *self.actions,
-                          then_actions=self.then_actions, station=self.station)
+                          then_actions=self.then_actions, station=self.station,
+                          period=self.period)
         return _attach_then_actions(loop, actions, overwrite)
 
     def with_bg_task(self, task, bg_final_task=None, min_delay=0.01):
@@ -424,13 +443,16 @@ class ActiveLoop(Metadatable):
 
     def snapshot_base(self, update=False):
         """Snapshot of this ActiveLoop's definition."""
-        return {
+        snap = {
             '__class__': full_class(self),
             'sweep_values': self.sweep_values.snapshot(update=update),
             'delay': self.delay,
             'actions': _actions_snapshot(self.actions, update),
             'then_actions': _actions_snapshot(self.then_actions, update)
         }
+        if self.period is not None:
+            snap['period'] = self.period
+        return snap
 
     def containers(self):
         """
@@ -604,18 +626,26 @@ class ActiveLoop(Metadatable):
 
         return sp
 
-    def set_common_attrs(self, data_set, use_threads):
+    def set_common_attrs(self, data_set, use_threads, scheduler=None):
         """
         set a couple of common attributes that the main and nested loops
         all need to have:
         - the DataSet collecting all our measurements
-        - a queue for communicating with the main process
+        - the Scheduler timing the delays of all loops, a new one if None
         """
         self.data_set = data_set
         self.use_threads = use_threads
+        if scheduler is None:
+            scheduler = Scheduler(
+                record=getattr(self, 'record_timing', False))
+        self.scheduler = scheduler
+        if self.bg_task is not None:
+            scheduler.add_idle_task(self._run_bg_task, self.bg_min_delay)
+        # the plans of this loop are compiled again for the new DataSet
+        self._plans = {}
         for action in self.actions:
             if hasattr(action, 'set_common_attrs'):
-                action.set_common_attrs(data_set, use_threads)
+                action.set_common_attrs(data_set, use_threads, scheduler)
 
     def get_data_set(self, *args, **kwargs):
         """
@@ -673,20 +703,27 @@ class ActiveLoop(Metadatable):
         return self.run(quiet=True, location=False, **kwargs)
 
     def run(self, use_threads=False, quiet=False, station=None,
-            progress_interval=False, set_active=True, *args, **kwargs):
+            progress_interval=False, set_active=True, *args,
+            record_timing=False, **kwargs):
         """
         Execute this loop.
 
         Args:
             use_threads: (default False): whenever there are multiple `get` calls
-                back-to-back, execute them in separate threads so they run in
-                parallel (as long as they don't block each other)
+                back-to-back, execute them in the worker threads of their
+                instruments so they run in parallel (as long as they don't
+                block each other). The parameters of one instrument are read
+                one after the other.
             quiet: (default False): set True to not print anything except errors
             station: a Station instance for snapshots (omit to use a previously
                 provided Station, or the default Station)
             progress_interval (default None): show progress of the loop every x
                 seconds. If provided here, will override any interval provided
                 with the Loop definition
+            record_timing (default False): besides the statistics of how
+                late the delays of the loop ended, which are always stored
+                in the metadata under ``loop.timing``, also store the
+                intended and actual end of every delay there.
 
         kwargs are passed along to data_set.new_data. These can only be
         provided when the `DataSet` is first created; giving these during `run`
@@ -713,6 +750,7 @@ class ActiveLoop(Metadatable):
         """
         if progress_interval is not False:
             self.progress_interval = progress_interval
+        self.record_timing = record_timing
 
         data_set = self.get_data_set(*args, **kwargs)
 
@@ -778,6 +816,19 @@ class ActiveLoop(Metadatable):
 
         return callables
 
+    def _get_plan(self, action_indices):
+        """
+        The ``_LoopPlan`` of this loop at ``action_indices`` in the DataSet,
+        which is compiled on the first entry into the loop in a run and
+        reused on every following entry, e.g. at every point of an outer
+        loop.
+        """
+        plans = self.__dict__.setdefault('_plans', {})
+        plan = plans.get(action_indices)
+        if plan is None:
+            plan = plans[action_indices] = _LoopPlan(self, action_indices)
+        return plan
+
     def _compile_one(self, action, new_action_indices):
         if isinstance(action, Wait):
             return Task(self._wait, action.delay)
@@ -795,7 +846,10 @@ class ActiveLoop(Metadatable):
                 # somehow this does not show up in the data_set returned by
                 # run(), but it is saved to the metadata
                 ts = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                self.data_set.add_metadata({'loop': {'ts_end': ts}})
+                timing = self.scheduler.timing_stats(
+                    per_wait=getattr(self, 'record_timing', False))
+                self.data_set.add_metadata({'loop': {'ts_end': ts,
+                                                     'timing': timing}})
                 self.data_set.finalize()
 
     def _run_loop(self, first_delay=0, action_indices=(),
@@ -817,59 +871,58 @@ class ActiveLoop(Metadatable):
         # the loop parameter may be increased if an outer loop requested longer
         delay = max(self.delay, first_delay)
 
-        callables = self._compile_actions(self.actions, action_indices)
-        n_callables = 0
-        for item in callables:
-            if hasattr(item, 'param_ids'):
-                n_callables += len(item.param_ids)
-            else:
-                n_callables += 1
+        plan = self._get_plan(action_indices)
+        callables = plan.callables
+        stored = self.data_set._stored
+        sweep_values = self.sweep_values
+        period = self.period
         t0 = time.time()
-        last_task = t0
-        imax = len(self.sweep_values)
+        # the start of the loop, from which the points of a loop with a
+        # period are timed
+        t_start = time.perf_counter()
+        imax = len(sweep_values)
 
         self.last_task_failed = False
 
-        for i, value in enumerate(self.sweep_values):
+        for i, value in enumerate(sweep_values):
             if self.progress_interval is not None:
                 tprint('loop %s: %d/%d (%.1f [s])' % (
-                    self.sweep_values.name, i, imax, time.time() - t0),
+                    sweep_values.name, i, imax, time.time() - t0),
                     dt=self.progress_interval, tag='outerloop')
                 if i:
                     tprint("Estimated finish time: %s" % (
                         time.asctime(time.localtime(t0 + ((time.time() - t0) * imax / i)))),
                            dt=self.progress_interval, tag="finish")
 
-            set_val = self.sweep_values.set(value)
+            if period is None:
+                set_val = sweep_values.set(value)
+                # the delay counts from the moment the setpoint was set
+                t_set = time.perf_counter()
+            else:
+                # the points are timed from the start of the loop, so the
+                # time that a point takes does not shift the next ones
+                t_set = t_start + i * period
+                if i:
+                    self.scheduler.wait_until(t_set)
+                set_val = sweep_values.set(value)
 
             new_indices = loop_indices + (i,)
             new_values = current_values + (value,)
-            data_to_store = {}
-
-            if hasattr(self.sweep_values, "parameters"):  # combined parameter
-                set_name = self.data_set.action_id_map[action_indices]
-                if hasattr(self.sweep_values, 'aggregate'):
-                    value = self.sweep_values.aggregate(*set_val)
-                # below is useful but too verbose even at debug
-                # log.debug('Calling .store method of DataSet because '
-                #           'sweep_values.parameters exist')
-                self.data_set.store(new_indices, {set_name: value})
+
+            if plan.part_arrays is not None:  # combined parameter
+                if plan.aggregate:
+                    value = sweep_values.aggregate(*set_val)
+                plan.set_array[new_indices] = value
                 # set_val list of values to set [param1_setpoint, param2_setpoint ..]
-                for j, val in enumerate(set_val):
-                    set_index = action_indices + (j+n_callables, )
-                    set_name = (self.data_set.action_id_map[set_index])
-                    data_to_store[set_name] = val
+                for array, val in zip(plan.part_arrays, set_val):
+                    array[new_indices] = val
             else:
-                set_name = self.data_set.action_id_map[action_indices]
-                data_to_store[set_name] = value
-            # below is useful but too verbose even at debug
-            # log.debug('Calling .store method of DataSet because a sweep step'
-            #           ' was taken')
-            self.data_set.store(new_indices, data_to_store)
-
-            if not self._nest_first:
+                plan.set_array[new_indices] = value
+            stored()
+
+            if delay and not self._nest_first:
                 # only wait the delay time if an inner loop will not inherit it
-                self._wait(delay)
+                self._wait(delay, t_set)
 
             try:
                 for f in callables:
@@ -888,24 +941,11 @@ class ActiveLoop(Metadatable):
             # after the first setpoint, delay reverts to the loop delay
             delay = self.delay
 
-            # now check for a background task and execute it if it's
-            # been long enough since the last time
-            # don't let exceptions in the background task interrupt
-            # the loop
-            # if the background task fails twice consecutively, stop
-            # executing it
+            # the background task runs in the slack time of the delays if
+            # they leave enough time for it. If it has been long enough since
+            # the last time but it did not fit, run it between the points.
             if self.bg_task is not None:
-                t = time.time()
-                if t - last_task >= self.bg_min_delay:
-                    try:
-                        self.bg_task()
-                    except Exception:
-                        if self.last_task_failed:
-                            self.bg_task = None
-                        self.last_task_failed = True
-                        log.exception("Failed to execute bg task")
-
-                    last_task = t
+                self.scheduler.run_idle_tasks()
 
         # run the background task one last time to catch the last setpoint(s)
         if self.bg_task is not None:
@@ -914,7 +954,7 @@ class ActiveLoop(Metadatable):
 
         # the loop is finished - run the .then actions
         #log.debug('Finishing loop, running the .then actions...')
-        for f in self._compile_actions(self.then_actions, ()):
+        for f in plan.then_callables:
             #log.debug('...running .then action {}'.format(f))
             f()
 
@@ -923,8 +963,60 @@ class ActiveLoop(Metadatable):
             log.debug('Running the bg_final_task')
             self.bg_final_task()
 
-    def _wait(self, delay):
+    def _wait(self, delay, start=None):
         if delay:
-            finish_clock = time.perf_counter() + delay
-            t = wait_secs(finish_clock)
-            time.sleep(t)
+            self.scheduler.wait(delay, start)
+
+    def _run_bg_task(self):
+        # don't let exceptions in the background task interrupt
+        # the loop
+        # if the background task fails twice consecutively, stop
+        # executing it
+        if self.bg_task is None:
+            return
+        try:
+            self.bg_task()
+        except Exception:
+            if self.last_task_failed:
+                self.bg_task = None
+            self.last_task_failed = True
+            log.exception("Failed to execute bg task")
+
+
+class _LoopPlan:
+    """
+    What one ActiveLoop does at every point of its sweep, compiled once per
+    run: the callables of its actions and the DataArrays of its setpoints.
+
+    This should not be constructed manually, only by an ActiveLoop.
+
+    Args:
+        loop (ActiveLoop): the loop to compile, with its DataSet set.
+        action_indices (tuple): where the loop is in any outer loop action
+            arrays.
+    """
+    def __init__(self, loop, action_indices):
+        data_set = loop.data_set
+        action_id_map = data_set.action_id_map
+
+        self.callables = loop._compile_actions(loop.actions, action_indices)
+        self.then_callables = loop._compile_actions(loop.then_actions, ())
+        self.set_array = data_set.arrays[action_id_map[action_indices]]
+
+        if hasattr(loop.sweep_values, 'parameters'):  # combined parameter
+            # the setpoints of the parameters are stored after the arrays of
+            # all measured values
+            n_callables = 0
+            for item in self.callables:
+                if hasattr(item, 'param_ids'):
+                    n_callables += len(item.param_ids)
+                else:
+                    n_callables += 1
+            self.aggregate = hasattr(loop.sweep_values, 'aggregate')
+            self.part_arrays = [
+                data_set.arrays[action_id_map[action_indices +
+                                              (j + n_callables,)]]
+                for j in range(len(loop.sweep_values.parameters))]
+        else:
+            self.aggregate = False
+            self.part_arrays = None
@@ -45,7 +45,7 @@ def _get_metadata(*parameters) -> Dict[str, Any]:
     for parameter in parameters:
         _meta = getattr(parameter, "_latest", None)
         if _meta:
-            meta = deepcopy(_meta)
+            meta = deepcopy(dict(_meta))
         else:
             raise ValueError("Input is not a parameter; Refusing to proceed")
         # convert to string
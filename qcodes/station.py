@@ -1,16 +1,20 @@
 """Station objects - collect all the equipment you use to do an experiment."""
-from typing import Dict, List, Optional, Sequence, Any
+import logging
+from typing import Dict, List, Optional, Sequence, Any, Tuple
 
 from qcodes.utils.metadata import Metadatable
 from qcodes.utils.helpers import make_unique, DelegateAttributes
+from qcodes.utils.threading import thread_map
 
-from qcodes.instrument.base import Instrument
+from qcodes.instrument.base import Instrument, snapshot_budget
 from qcodes.instrument.parameter import Parameter
 from qcodes.instrument.parameter import ManualParameter
 from qcodes.instrument.parameter import StandardParameter
 
 from qcodes.actions import _actions_snapshot
 
+log = logging.getLogger(__name__)
+
 
 class Station(Metadatable, DelegateAttributes):
 
@@ -36,20 +40,38 @@ class Station(Metadatable, DelegateAttributes):
         update_snapshot (bool): immediately update the snapshot
             of each component as it is added to the Station, default true
 
+        parallel_snapshot (bool): when the snapshot is updated, query the
+            instruments in parallel, one thread per instrument, default
+            false. The parameters of each instrument are still queried
+            one after the other.
+
+        snapshot_timeout (Optional[float]): time budget in seconds for
+            updating the snapshot of each instrument. The parameters that
+            are left when the budget has run out are snapshotted with their
+            latest values in memory. Default None, i.e. no limit.
+
     Attributes:
         default (Station): class attribute to store the default station
         delegate_attr_dicts (list): a list of names (strings) of dictionaries
             which are (or will be) attributes of self, whose keys should be
             treated as attributes of self
+        snapshot_timings (dict): the time in seconds that updating the
+            snapshot of each instrument parameter took during the last
+            updating snapshot, by full name of the parameter
     """
 
     default = None # type: 'Station'
 
     def __init__(self, *components: Metadatable,
                  monitor: Any=None, default: bool=True,
-                 update_snapshot: bool=True, **kwargs) -> None:
+                 update_snapshot: bool=True, parallel_snapshot: bool=False,
+                 snapshot_timeout: Optional[float]=None, **kwargs) -> None:
         super().__init__(**kwargs)
 
+        self.parallel_snapshot = parallel_snapshot
+        self.snapshot_timeout = snapshot_timeout
+        self.snapshot_timings = {} # type: Dict[str, float]
+
         # when a new station is defined, store it in a class variable
         # so it becomes the globally accessible default station.
         # You can still have multiple stations defined, but to use
@@ -93,6 +115,7 @@ class Station(Metadatable, DelegateAttributes):
         }
 
         components_to_remove = []
+        instruments = {} # type: Dict[str, Instrument]
 
         for name, itm in self.components.items():
             if isinstance(itm, Instrument):
@@ -100,9 +123,37 @@ class Station(Metadatable, DelegateAttributes):
                 # station object, hence this 'if' allows to avoid
                 # snapshotting instruments that are already closed
                 if Instrument.is_valid(itm):
-                    snap['instruments'][name] = itm.snapshot(update=update)
+                    instruments[name] = itm
                 else:
                     components_to_remove.append(name)
+
+        if update and self.parallel_snapshot and len(instruments) > 1:
+            snaps_and_timings = thread_map(
+                [self._snapshot_instrument] * len(instruments),
+                args=[(itm, update) for itm in instruments.values()],
+                instruments=list(instruments.values()))
+        else:
+            snaps_and_timings = [self._snapshot_instrument(itm, update)
+                                 for itm in instruments.values()]
+
+        timings = {} # type: Dict[str, float]
+        for name, (itm_snap, itm_timings) in zip(instruments,
+                                                 snaps_and_timings):
+            snap['instruments'][name] = itm_snap
+            timings.update(itm_timings)
+        if update:
+            self.snapshot_timings = timings
+            if log.isEnabledFor(logging.DEBUG):
+                log.debug('Slowest parameters in snapshot: ' + ', '.join(
+                    f'{name} ({duration:.3f} s)' for name, duration
+                    in self.slowest_snapshot_parameters()))
+
+        # the parameters and components of the station itself may belong to
+        # the instruments, hence they are only snapshotted once all the
+        # instruments are done
+        for name, itm in self.components.items():
+            if isinstance(itm, Instrument):
+                continue
             elif isinstance(itm, (Parameter,
                                   ManualParameter,
                                   StandardParameter
@@ -116,6 +167,33 @@ class Station(Metadatable, DelegateAttributes):
 
         return snap
 
+    def _snapshot_instrument(self, instrument: Instrument, update: bool
+                             ) -> Tuple[Dict, Dict[str, float]]:
+        """
+        Snapshot an instrument within the time budget of the station, and
+        return the snapshot along with the timings of its parameters
+        """
+        timeout = self.snapshot_timeout if update else None
+        with snapshot_budget(timeout) as timings:
+            snap = instrument.snapshot(update=update)
+        return snap, timings
+
+    def slowest_snapshot_parameters(self, n: int=5
+                                    ) -> List[Tuple[str, float]]:
+        """
+        The instrument parameters that took the longest to update during
+        the last updating snapshot of the station
+
+        Args:
+            n: the number of parameters to return
+
+        Returns:
+            list of (full name, time in seconds) of the n slowest
+            parameters, slowest first
+        """
+        return sorted(self.snapshot_timings.items(),
+                      key=lambda item: item[1], reverse=True)[:n]
+
     def add_component(self, component: Metadatable, name: str=None,
                       update_snapshot: bool=True) -> str:
         """
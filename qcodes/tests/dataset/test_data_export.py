@@ -0,0 +1,80 @@
+import numpy as np
+import pytest
+
+from qcodes.dataset.data_export import (datatype_from_setpoints_2d,
+                                        reshape_2D_data, _strings_as_ints)
+
+
+@pytest.fixture
+def grid():
+    xrow = np.array([0, 0.5, 1.5, 2])
+    yrow = np.array([-1, 0, 1])
+    z = np.arange(12, dtype=float).reshape(3, 4)
+    return xrow, yrow, z
+
+
+def _flatten(xrow, yrow, z, x_is_outer):
+    x_grid, y_grid = np.meshgrid(xrow, yrow)
+    if x_is_outer:
+        return x_grid.T.ravel(), y_grid.T.ravel(), z.T.ravel()
+    return x_grid.ravel(), y_grid.ravel(), z.ravel()
+
+
+@pytest.mark.parametrize('x_is_outer', [True, False])
+@pytest.mark.parametrize('reverse', [False, True])
+def test_reshape_nested_sweep(grid, x_is_outer, reverse):
+    xrow, yrow, z = grid
+    x, y, zflat = _flatten(xrow, yrow, z, x_is_outer)
+    if reverse:
+        x, y, zflat = x[::-1], y[::-1], zflat[::-1]
+
+    assert datatype_from_setpoints_2d(x, y) == 'grid'
+
+    x_out, y_out, z_out = reshape_2D_data(x, y, zflat)
+    assert np.array_equal(x_out, xrow)
+    assert np.array_equal(y_out, yrow)
+    assert np.array_equal(z_out, z)
+
+
+def test_reshape_shuffled_interrupted_sweep(grid):
+    xrow, yrow, z = grid
+    x, y, zflat = _flatten(xrow, yrow, z, x_is_outer=False)
+    # the sweep stops halfway through the last row
+    x, y, zflat = x[:10], y[:10], zflat[:10]
+    order = np.random.permutation(len(x))
+
+    assert datatype_from_setpoints_2d(x[order], y[order]) == 'grid'
+
+    x_out, y_out, z_out = reshape_2D_data(x[order], y[order], zflat[order])
+    expected = z.copy()
+    expected[2, 2:] = np.nan
+    assert np.array_equal(x_out, xrow)
+    assert np.array_equal(y_out, yrow)
+    np.testing.assert_array_equal(z_out, expected)
+
+
+def test_datatype_equidistant_and_unknown():
+    x = np.array([0, 1, 2, 0, 2, 3])
+    y = np.array([0, 0, 0, 1, 1, 1])
+    assert datatype_from_setpoints_2d(x, y) == 'equidistant'
+
+    x = np.array([0, 1, 2, 0.3, 2, 3])
+    assert datatype_from_setpoints_2d(x, y) == 'unknown'
+
+
+def test_reshape_string_setpoints():
+    x = np.array(['b', 'b', 'a', 'a'])
+    y = np.array([1, 2, 1, 2])
+    z = np.array([1., 2., 3., 4.])
+
+    assert datatype_from_setpoints_2d(x, y) == 'grid'
+
+    x_out, y_out, z_out = reshape_2D_data(x, y, z)
+    assert np.array_equal(x_out, ['a', 'b'])
+    assert np.array_equal(y_out, [1, 2])
+    assert np.array_equal(z_out, [[3., 1.], [4., 2.]])
+
+
+def test_strings_as_ints():
+    ints = _strings_as_ints(np.array(['a', 'b', 'c', 'a', 'c']))
+    assert np.array_equal(ints, [0, 1, 2, 0, 2])
@@ -25,7 +25,11 @@ from qcodes.dataset.sqlite_base import (connect,
                                         atomic_transaction,
                                         perform_db_upgrade_0_to_1,
                                         perform_db_upgrade_1_to_2,
-                                        perform_db_upgrade_2_to_3)
+                                        perform_db_upgrade_2_to_3,
+                                        perform_db_upgrade_3_to_4,
+                                        perform_db_upgrade_4_to_5,
+                                        perform_db_upgrade_5_to_6,
+                                        is_column_in_table)
 
 from qcodes.dataset.guids import parse_guid
 import qcodes.tests.dataset
@@ -77,7 +81,8 @@ def test_tables_exist():
                        version=version)
         cursor = conn.execute("select sql from sqlite_master"
                               " where type = 'table'")
-        expected_tables = ['experiments', 'runs', 'layouts', 'dependencies']
+        expected_tables = ['experiments', 'runs', 'layouts', 'dependencies',
+                           'snapshots']
         rows = [row for row in cursor]
         assert len(rows) == len(expected_tables)
         for row, expected_table in zip(rows, expected_tables):
@@ -274,6 +279,63 @@ def test_perform_actual_upgrade_2_to_3_some_runs():
         assert p4.unit == "unit 4"
 
 
+def test_perform_upgrade_3_to_4():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = connect(os.path.join(tmpdir, 'temp.db'), version=3)
+
+        assert get_user_version(conn) == 3
+
+        perform_db_upgrade_3_to_4(conn)
+
+        assert get_user_version(conn) == 4
+
+        conn.close()
+
+
+def test_perform_upgrade_4_to_5():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = connect(os.path.join(tmpdir, 'temp.db'), version=4)
+
+        assert get_user_version(conn) == 4
+
+        index_query = ("SELECT name FROM sqlite_master "
+                       "WHERE type='index' AND name LIKE 'IX_%'")
+
+        c = atomic_transaction(conn, index_query)
+        assert len(c.fetchall()) == 2
+
+        perform_db_upgrade_4_to_5(conn)
+
+        assert get_user_version(conn) == 5
+
+        c = atomic_transaction(conn, index_query)
+        assert {row['name'] for row in c.fetchall()} == {
+            'IX_runs_exp_id', 'IX_runs_guid', 'IX_layouts_run_id_parameter',
+            'IX_dependencies_dependent', 'IX_dependencies_independent',
+            'IX_runs_result_table_name'}
+
+        conn.close()
+
+
+def test_perform_upgrade_5_to_6():
+
+    with tempfile.TemporaryDirectory() as tmpdir:
+        conn = connect(os.path.join(tmpdir, 'temp.db'), version=5)
+
+        assert get_user_version(conn) == 5
+        assert not is_column_in_table(conn, 'runs', 'snapshot_hash')
+
+        perform_db_upgrade_5_to_6(conn)
+
+        assert get_user_version(conn) == 6
+        assert is_column_in_table(conn, 'runs', 'snapshot_hash')
+        assert is_column_in_table(conn, 'snapshots', 'base_hash')
+
+        conn.close()
+
+
 @pytest.mark.usefixtures("empty_temp_db")
 def test_update_existing_guids(caplog):
 
@@ -11,7 +11,7 @@ from qcodes import load_by_id, load_by_counter
 from qcodes.dataset.descriptions import RunDescriber
 from qcodes.dataset.dependencies import InterDependencies
 from qcodes.tests.dataset.test_descriptions import some_paramspecs
-from qcodes.dataset.sqlite_base import _unicode_categories
+from qcodes.dataset.sqlite_base import _unicode_categories, get_setpoints
 from qcodes.dataset.database import get_DB_location
 from qcodes.dataset.data_set import CompletedError, DataSet
 from qcodes.dataset.guids import parse_guid
@@ -88,6 +88,17 @@ def test_load_by_id(dataset):
     assert dataset.path_to_db == ds.path_to_db
 
 
+def test_load_by_id_read_only(dataset):
+    dataset.add_parameter(ParamSpec('x', 'numeric'))
+    dataset.add_result({'x': 1})
+
+    ds = load_by_id(dataset.run_id, read_only=True)
+    assert ds.get_data('x') == [[1]]
+
+    with pytest.raises(RuntimeError):
+        ds.add_result({'x': 2})
+
+
 @pytest.mark.usefixtures('experiment')
 @pytest.mark.parametrize('non_existing_run_id', (1, 0, -1))
 def test_load_by_id_for_nonexisting_run_id(non_existing_run_id):
@@ -526,3 +537,106 @@ def test_get_description(some_paramspecs):
     loaded_ds = DataSet(run_id=1)
 
     assert loaded_ds.description == desc
+
+
+def test_add_results_columnar(dataset):
+    x = ParamSpec("x", paramtype='numeric')
+    y = ParamSpec("y", paramtype='numeric', depends_on=[x])
+    t = ParamSpec("t", paramtype='text')
+    a = ParamSpec("a", paramtype='array')
+
+    for spec in (x, y, t, a):
+        dataset.add_parameter(spec)
+
+    xvals = np.arange(5)
+    yvals = np.array([0.0, 1.5, np.nan, 3.5, 4.0])
+    index = dataset.add_results_columnar({'x': xvals, 'y': yvals,
+                                          't': ['a', 'b', 'c', 'd', 'e']})
+    assert index == 0
+    assert len(dataset) == 5
+
+    index = dataset.add_results_columnar({'a': [np.arange(3)]})
+    assert index == 5
+    assert len(dataset) == 6
+
+    data = dataset.get_data('x', 'y', 't')
+    assert [row[0] for row in data[:5]] == xvals.tolist()
+    assert [row[2] for row in data[:5]] == ['a', 'b', 'c', 'd', 'e']
+    np.testing.assert_array_equal([row[1] for row in data[:5]], yvals)
+    assert data[5] == [None, None, None]
+    np.testing.assert_array_equal(dataset.get_data('a')[5][0], np.arange(3))
+
+    with pytest.raises(ValueError):
+        dataset.add_results_columnar({'x': np.arange(3), 'y': np.arange(4)})
+
+
+def test_get_data_as_arrays(dataset):
+    x = ParamSpec("x", paramtype='numeric')
+    y = ParamSpec("y", paramtype='numeric', depends_on=[x])
+    s = ParamSpec("s", paramtype='numeric')
+    t = ParamSpec("t", paramtype='text')
+    a = ParamSpec("a", paramtype='array')
+
+    for spec in (x, y, s, t, a):
+        dataset.add_parameter(spec)
+
+    dataset.add_results([{'x': 0, 'y': 0.5, 's': 'one', 't': 'a'},
+                         {'x': 1, 'y': np.nan, 's': 2, 't': 'b'},
+                         {'x': 2, 's': 3.5, 't': 'c'},
+                         {'a': np.arange(3)},
+                         {'a': np.arange(3, 6)}])
+
+    data = dataset.get_data_as_arrays('x', 'y', 's', 't', end=3)
+    np.testing.assert_array_equal(data['x'], [0, 1, 2])
+    assert data['x'].dtype.kind == 'i'
+    np.testing.assert_array_equal(data['y'], [0.5, np.nan, np.nan])
+    # a numeric parameter holding strings falls back to the converter
+    assert data['s'].tolist() == ['one', '2', '3.5']
+    assert data['t'].tolist() == ['a', 'b', 'c']
+
+    data = dataset.get_data_as_arrays('y', 'x', not_null='y')
+    np.testing.assert_array_equal(data['y'], [0.5, np.nan])
+    np.testing.assert_array_equal(data['x'], [0, 1])
+
+    data = dataset.get_data_as_arrays('a', start=4)
+    np.testing.assert_array_equal(data['a'], [[0, 1, 2], [3, 4, 5]])
+    data['a'][0, 0] = 7
+
+    # with NULLs the arrays are returned as they are in an object array
+    data = dataset.get_data_as_arrays('a', start=3)
+    assert data['a'][0] is None
+    np.testing.assert_array_equal(data['a'][1], [0, 1, 2])
+    data['a'][1][0] = 7
+
+    with pytest.raises(ValueError):
+        dataset.get_data_as_arrays('x', not_null='z')
+
+
+def test_get_setpoints_uses_cached_layout(dataset):
+    x = ParamSpec("x", paramtype='numeric')
+    y = ParamSpec("y", paramtype='numeric')
+    z = ParamSpec("z", paramtype='numeric', depends_on=[x, y])
+
+    for spec in (x, y, z):
+        dataset.add_parameter(spec)
+    dataset.add_results([{'x': 1, 'y': 2, 'z': 3}, {'x': 4, 'y': 5}])
+
+    loaded_ds = load_by_id(dataset.run_id)
+    assert loaded_ds.paramspecs == dataset.paramspecs
+    assert loaded_ds.get_setpoints('z') == {'x': [[1]], 'y': [[2]]}
+
+    queries = []
+
+    def trace(query):
+        queries.append(query)
+
+    loaded_ds.conn.set_trace_callback(trace)
+    assert loaded_ds.get_setpoints('z') == {'x': [[1]], 'y': [[2]]}
+    loaded_ds.conn.set_trace_callback(None)
+
+    selects = [q for q in queries if 'SELECT' in q]
+    assert len(selects) == 1
+    assert not any('layouts' in q or 'dependencies' in q for q in queries)
+
+    setpoints = get_setpoints(loaded_ds.conn, loaded_ds.table_name, 'z')
+    assert setpoints == {'x': [[1]], 'y': [[2]]}
@@ -0,0 +1,142 @@
+import os
+
+import h5py
+import numpy as np
+import pytest
+
+from qcodes.dataset.data_set import new_data_set
+from qcodes.dataset.hdf5_exporter import export_to_hdf5
+from qcodes.dataset.param_spec import ParamSpec
+# pylint: disable=unused-import
+from qcodes.tests.dataset.temporary_databases import \
+    empty_temp_db, experiment, dataset
+
+
+@pytest.fixture
+def export_path(tmpdir):
+    yield os.path.join(str(tmpdir), 'export.h5')
+
+
+def _add_parameters(dataset):
+    dataset.add_parameters([ParamSpec('x', 'numeric', unit='V'),
+                            ParamSpec('name', 'text'),
+                            ParamSpec('y', 'numeric', label='Current',
+                                      depends_on=['x', 'name']),
+                            ParamSpec('trace', 'array', depends_on=['x'])])
+
+
+def test_export_in_chunks(dataset, export_path):
+    _add_parameters(dataset)
+    dataset.add_results([{'x': i, 'name': f'n{i}', 'y': 2 * i}
+                         for i in range(25)])
+
+    assert export_to_hdf5(dataset, export_path, chunk_size=10) == 25
+
+    with h5py.File(export_path, 'r') as file:
+        assert file.attrs['guid'] == dataset.guid
+        assert file.attrs['exported_rows'] == 25
+        assert np.array_equal(file['x'][:], np.arange(25))
+        assert np.array_equal(file['y'][:], 2 * np.arange(25))
+        # h5py>=3 reads variable length strings as bytes
+        names = [name.decode() if isinstance(name, bytes) else name
+                 for name in file['name'][:]]
+        assert names == [f'n{i}' for i in range(25)]
+        assert file['x'].attrs['unit'] == 'V'
+        assert file['y'].attrs['label'] == 'Current'
+        assert file['y'].attrs['depends_on'] == 'x, name'
+        assert file['y'].compression == 'gzip'
+        assert [list(dim.keys()) for dim in file['y'].dims] == [['x', 'name']]
+        # the values of trace are not known yet, so neither is its shape
+        assert 'trace' not in file
+
+
+def test_export_resumes(dataset, export_path):
+    _add_parameters(dataset)
+    dataset.add_results([{'x': i, 'y': i} for i in range(5)])
+    assert export_to_hdf5(dataset, export_path) == 5
+
+    dataset.add_results([{'x': i, 'trace': np.arange(3) * i}
+                         for i in range(5, 8)])
+    assert export_to_hdf5(dataset, export_path, chunk_size=2) == 8
+    assert export_to_hdf5(dataset, export_path) == 8
+
+    with h5py.File(export_path, 'r') as file:
+        assert np.array_equal(file['x'][:], np.arange(8))
+        np.testing.assert_array_equal(file['y'][:],
+                                      [0, 1, 2, 3, 4] + [np.nan] * 3)
+        assert file['trace'].shape == (8, 3)
+        assert np.isnan(file['trace'][:5]).all()
+        assert np.array_equal(file['trace'][5:],
+                              np.outer(np.arange(5, 8), np.arange(3)))
+        assert list(file['trace'].dims[0].keys()) == ['x']
+
+
+def test_export_discards_unfinished_chunk(dataset, export_path):
+    _add_parameters(dataset)
+    dataset.add_results([{'x': i, 'y': i} for i in range(5)])
+    export_to_hdf5(dataset, export_path)
+
+    # as if an export was interrupted after writing only some of the rows
+    with h5py.File(export_path, 'a') as file:
+        file['x'].resize(7, axis=0)
+        file['x'][5:] = -1
+
+    dataset.add_results([{'x': i, 'y': i} for i in range(5, 7)])
+    assert export_to_hdf5(dataset, export_path) == 7
+
+    with h5py.File(export_path, 'r') as file:
+        assert np.array_equal(file['x'][:], np.arange(7))
+
+
+def test_export_of_other_run_raises(dataset, export_path):
+    _add_parameters(dataset)
+    dataset.add_result({'x': 1})
+    export_to_hdf5(dataset, export_path)
+
+    other_dataset = new_data_set('other-dataset')
+    try:
+        with pytest.raises(ValueError, match='holds the export of run'):
+            export_to_hdf5(other_dataset, export_path)
+    finally:
+        other_dataset.conn.close()
+
+
+def test_export_array_changing_shape_raises(dataset, export_path):
+    _add_parameters(dataset)
+    dataset.add_results([{'x': 0, 'trace': np.arange(3)}])
+    export_to_hdf5(dataset, export_path)
+
+    dataset.add_results([{'x': 1, 'trace': np.arange(4)}])
+    with pytest.raises(ValueError, match='change shape'):
+        export_to_hdf5(dataset, export_path)
+
+
+def test_export_keeps_integers(dataset, export_path):
+    _add_parameters(dataset)
+    big = 2**53 + 1
+    dataset.add_results([{'x': big + i, 'y': i} for i in range(3)])
+    export_to_hdf5(dataset, export_path)
+
+    with h5py.File(export_path, 'r') as file:
+        assert file['x'].dtype == np.int64
+        assert list(file['x'][:]) == [big, big + 1, big + 2]
+
+
+def test_export_converts_integers_to_float_on_missing_value(dataset,
+                                                            export_path):
+    _add_parameters(dataset)
+    dataset.add_results([{'x': i, 'y': i} for i in range(3)])
+    export_to_hdf5(dataset, export_path)
+    with h5py.File(export_path, 'r') as file:
+        assert file['y'].dtype == np.int64
+
+    dataset.add_results([{'x': 3}, {'x': 4.5, 'y': 4}])
+    export_to_hdf5(dataset, export_path)
+
+    with h5py.File(export_path, 'r') as file:
+        assert file['x'].dtype == np.float64
+        assert file['y'].dtype == np.float64
+        np.testing.assert_array_equal(file['x'][:], [0, 1, 2, 3, 4.5])
+        np.testing.assert_array_equal(file['y'][:], [0, 1, 2, np.nan, 4])
+        assert file['y'].attrs['label'] == 'Current'
+        assert [list(dim.keys()) for dim in file['y'].dims] == [['x', 'name']]
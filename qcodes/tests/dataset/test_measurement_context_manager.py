@@ -13,13 +13,14 @@ from qcodes.tests.common import retry_until_does_not_throw
 
 import qcodes as qc
 from qcodes.dataset.data_export import get_data_by_id
-from qcodes.dataset.measurements import Measurement
+from qcodes.dataset.measurements import Measurement, DataWriteError
+import qcodes.dataset.measurements
 from qcodes.dataset.experiment_container import new_experiment
 from qcodes.tests.instrument_mocks import DummyInstrument, \
     DummyChannelInstrument, setpoint_generator
 from qcodes.dataset.param_spec import ParamSpec
 from qcodes.dataset.sqlite_base import atomic_transaction
-from qcodes.instrument.parameter import ArrayParameter
+from qcodes.instrument.parameter import ArrayParameter, Parameter
 from qcodes.dataset.legacy_import import import_dat_file
 from qcodes.dataset.data_set import load_by_id
 # pylint: disable=unused-import
@@ -472,16 +473,14 @@ def test_subscriptions(experiment, DAC, DMM):
             # to database and the "state" object (that is passed to subscriber
             # constructor) has been updated by the corresponding subscriber's
             # callback function. At the moment, there is no robust way to ensure
-            # this. The reason is that the subscribers have internal queue which
-            # is populated via a trigger call from the SQL database, hence from
-            # this "main" thread it is difficult to say whether the queue is
-            # empty because the subscriber callbacks have already been executed
-            # or because the triggers of the SQL database has not been executed
-            # yet.
+            # this. The reason is that the subscriber callbacks are called
+            # from the worker threads of a subscriber pool, hence from this
+            # "main" thread it is difficult to say whether the callbacks have
+            # already been executed.
             #
             # In order to overcome this problem, a special decorator is used
             # to wrap the assertions. This is going to ensure that some time
-            # is given to the Subscriber threads to finish exhausting the queue.
+            # is given to the subscriber pool to finish exhausting the queues.
             @retry_until_does_not_throw(
                 exception_class_to_expect=AssertionError, delay=0.5, tries=10)
             def assert_states_updated_from_callbacks():
@@ -625,6 +624,119 @@ def test_datasaver_scalars(experiment, DAC, DMM, set_values, get_values,
     # More assertions of setpoints, labels and units in the DB!
 
 
+@pytest.mark.usefixtures('set_default_station_to_none')
+def test_datasaver_hardware_sweep(experiment):
+    transactions = []
+    buffer = []
+
+    def load_list(raw_values):
+        transactions.append('LIST')
+        buffer[:] = [2 * value for value in raw_values]
+
+    def read_buffer():
+        transactions.append('BUF?')
+        return np.array(buffer)
+
+    dac = Parameter('dac', set_cmd=None, set_many_cmd=load_list)
+    dmm = Parameter('dmm', get_cmd=read_buffer)
+
+    meas = Measurement()
+    meas.register_parameter(dac)
+    meas.register_parameter(dmm, setpoints=(dac,))
+
+    with meas.run() as datasaver:
+        setpoints = dac.sweep(0, 1, num=10000).to_hardware_list()
+        datasaver.add_result((dac, setpoints), (dmm, dmm.get()))
+
+    assert transactions == ['LIST', 'BUF?']
+    data = datasaver.dataset.get_data_as_arrays('dac', 'dmm')
+    assert_allclose(data['dac'], np.linspace(0, 1, 10000))
+    assert_allclose(data['dmm'], 2 * np.linspace(0, 1, 10000))
+
+
+@pytest.mark.usefixtures('set_default_station_to_none')
+def test_datasaver_get_and_add_result(experiment, DAC, DMM):
+    meas = Measurement()
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DMM.v1, setpoints=(DAC.ch1,))
+    meas.register_parameter(DMM.v2, setpoints=(DAC.ch1,))
+
+    with meas.run() as datasaver:
+        for set_v in range(3):
+            DAC.ch1(set_v)
+            DMM.v1(-set_v)
+            datasaver.get_and_add_result(DMM.v1, DMM.v2,
+                                         setpoints=[(DAC.ch1, set_v)])
+
+    data = datasaver.dataset.get_data_as_arrays('dummy_dac_ch1',
+                                                'dummy_dmm_v1',
+                                                'dummy_dmm_v2')
+    assert_array_equal(data['dummy_dac_ch1'], [0, 1, 2])
+    assert_array_equal(data['dummy_dmm_v1'], [0, -1, -2])
+    assert_array_equal(data['dummy_dmm_v2'], [0, 0, 0])
+
+
+@pytest.mark.usefixtures('set_default_station_to_none')
+def test_datasaver_write_in_background(experiment, DAC, DMM):
+    meas = Measurement()
+    meas.write_period = 0.001
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DMM.v1, setpoints=(DAC.ch1,))
+
+    seen = []
+    meas.add_subscriber(lambda results, length, state: state.extend(results),
+                        state=seen)
+
+    with meas.run(write_in_background=True) as datasaver:
+        for set_v in range(25):
+            datasaver.add_result((DAC.ch1, set_v), (DMM.v1, -set_v))
+        datasaver.add_result((DAC.ch1, np.arange(25, 50)),
+                             (DMM.v1, -np.arange(25, 50)))
+        datasaver.flush_data_to_database()
+        assert datasaver.points_written == 50
+        # the writer owns its own connection to the database
+        assert datasaver._writer.is_alive()
+
+    assert not datasaver._writer.is_alive()
+    assert datasaver.dataset.started
+    data = datasaver.dataset.get_data('dummy_dac_ch1', 'dummy_dmm_v1')
+    assert data == [[v, -v] for v in range(50)]
+
+    @retry_until_does_not_throw(
+        exception_class_to_expect=AssertionError, delay=0.05, tries=20)
+    def assert_all_results_seen():
+        assert seen == [(v, -v) for v in range(50)]
+
+    assert_all_results_seen()
+
+
+@pytest.mark.usefixtures('set_default_station_to_none')
+def test_datasaver_write_in_background_raises(experiment, DAC, DMM,
+                                              monkeypatch):
+    def failing_insert(conn, formatted_name, columns):
+        raise RuntimeError('disk is full')
+
+    monkeypatch.setattr(qcodes.dataset.measurements, 'insert_many_columns',
+                        failing_insert)
+
+    meas = Measurement()
+    meas.write_period = 0.001
+    meas.register_parameter(DAC.ch1)
+    meas.register_parameter(DMM.v1, setpoints=(DAC.ch1,))
+
+    with pytest.raises(DataWriteError, match='disk is full'):
+        with meas.run(write_in_background=True) as datasaver:
+            datasaver.add_result((DAC.ch1, 0), (DMM.v1, 1))
+
+    assert datasaver.dataset.completed
+    assert len(datasaver.dataset.subscribers) == 0
+
+    with pytest.raises(DataWriteError, match='disk is full'):
+        with meas.run(write_in_background=True) as datasaver:
+            datasaver.add_result((DAC.ch1, 0), (DMM.v1, 1))
+            datasaver._writer.drain()
+
+
 @settings(max_examples=10, deadline=None)
 @given(N=hst.integers(min_value=2, max_value=500))
 @pytest.mark.usefixtures("empty_temp_db")
@@ -810,6 +922,24 @@ def test_datasaver_unsized_arrays(N):
     assert datasaver.points_written == N
 
 
+@pytest.mark.usefixtures("experiment")
+def test_datasaver_reused_buffer():
+    meas = Measurement()
+    meas.register_custom_parameter(name='x')
+    meas.register_custom_parameter(name='y', setpoints=('x',))
+
+    xbuffer = np.zeros(3)
+    ybuffer = np.zeros(3)
+    with meas.run() as datasaver:
+        for value in (0, 1):
+            xbuffer[:] = value
+            ybuffer[:] = 2 * value
+            datasaver.add_result(('x', xbuffer), ('y', ybuffer))
+
+    assert datasaver.dataset.get_values('x') == [[0]] * 3 + [[1]] * 3
+    assert datasaver.dataset.get_values('y') == [[0]] * 3 + [[2]] * 3
+
+
 @settings(max_examples=5, deadline=None)
 @given(N=hst.integers(min_value=5, max_value=500),
        M=hst.integers(min_value=4, max_value=250))
@@ -105,3 +105,24 @@ def test_snapshot_creation_for_types_not_supported_by_builtin_json(experiment):
 
     assert False is snapshot['station']['parameters']['p_np_bool']['value']
     assert False is snapshot['station']['parameters']['p_np_bool']['raw_value']
+
+
+@pytest.mark.usefixtures('set_default_station_to_none')
+def test_snapshot_stored_once_for_consecutive_runs(experiment, dac):
+    station = Station(dac)
+    measurement = Measurement(experiment, station)
+
+    datasets = []
+    for _ in range(2):
+        with measurement.run() as data_saver:
+            pass
+        datasets.append(data_saver.dataset)
+
+    n_snapshots = experiment.conn.execute(
+        "SELECT COUNT(*) FROM snapshots").fetchone()[0]
+    assert 1 == n_snapshots
+    assert datasets[0].snapshot_raw == datasets[1].snapshot_raw
+    assert {'station': station.snapshot()} == datasets[1].snapshot
+    # modifying the returned snapshot does not change later reads
+    datasets[1].snapshot['station'].clear()
+    assert {'station': station.snapshot()} == datasets[1].snapshot
@@ -1,7 +1,10 @@
 # Since all other tests of data_set and measurements will inevitably also
 # test the sqlite_base module, we mainly test exceptions here
+import json
+import re
 from sqlite3 import OperationalError
 
+import numpy as np
 import pytest
 import hypothesis.strategies as hst
 from hypothesis import given
@@ -9,6 +12,7 @@ import unicodedata
 
 from qcodes.dataset.descriptions import RunDescriber
 from qcodes.dataset.dependencies import InterDependencies
+import qcodes as qc
 import qcodes.dataset.sqlite_base as mut  # mut: module under test
 from qcodes.dataset.database import get_DB_location
 from qcodes.dataset.guids import generate_guid
@@ -158,3 +162,204 @@ def test_update_runs_description(dataset):
 
     desc = RunDescriber(InterDependencies()).to_json()
     mut.update_run_description(dataset.conn, dataset.run_id, desc)
+
+
+@pytest.mark.parametrize("arr", [np.linspace(0, 1, 11),
+                                 np.arange(12).reshape(3, 4).T,
+                                 np.array(1.5),
+                                 np.zeros((0, 3)),
+                                 np.array([1 + 2j, 3 - 1j]),
+                                 np.array(['ab', 'c']),
+                                 np.arange(5, dtype='>i4')])
+def test_array_codec_roundtrip(arr):
+    blob = bytes(mut._adapt_array(arr))
+    assert blob[:4] == mut._ARRAY_MAGIC
+    converted = mut._convert_array(blob)
+    assert converted.dtype == arr.dtype
+    assert converted.shape == arr.shape
+    np.testing.assert_array_equal(converted, arr)
+
+
+def test_array_codec_converts_to_writeable_arrays():
+    arr = np.linspace(0, 1, 11)
+    converted = mut._convert_array(bytes(mut._adapt_array(arr)))
+    converted[0] = 5
+    assert converted[0] == 5
+
+
+def test_array_codec_stores_structured_arrays_as_npy():
+    arr = np.array([(1, 2.5), (3, -1.0)], dtype=[('a', '<i4'), ('b', '<f8')])
+    blob = bytes(mut._adapt_array(arr))
+    assert blob[:4] != mut._ARRAY_MAGIC
+    converted = mut._convert_array(blob)
+    assert converted.dtype == arr.dtype
+    np.testing.assert_array_equal(converted, arr)
+
+
+def test_array_codec_reads_legacy_npy_blobs():
+    arr = np.linspace(0, 1, 11)
+    blob = bytes(mut._adapt_array_npy(arr))
+    np.testing.assert_array_equal(mut._convert_array(blob), arr)
+
+
+def test_array_stored_and_loaded_with_codec(dataset):
+    dataset.add_parameter(ParamSpec('a', 'array'))
+    arr = np.random.rand(3, 7)
+    dataset.add_result({'a': arr})
+    np.testing.assert_array_equal(dataset.get_data('a')[0][0], arr)
+    # the loaded arrays are not views of the blobs and can be modified
+    dataset.get_data('a')[0][0][0, 0] = 2
+    dataset.get_values('a')[0][0][0, 0] = 2
+
+
+def test_connect_applies_connection_profile(empty_temp_db):
+    conn = mut.connect(get_DB_location())
+    # WAL is opt-in, by default the journal mode of SQLite is kept
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'delete'
+    # FULL, the SQLite default is kept as well
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 2
+    assert conn.execute("PRAGMA cache_size").fetchone()[0] == -20000
+    # MEMORY
+    assert conn.execute("PRAGMA temp_store").fetchone()[0] == 2
+    conn.close()
+
+
+def test_connection_profile_opt_in_to_wal(empty_temp_db):
+    profile = qc.config['core']['db_connection']
+    profile['journal_mode'] = 'WAL'
+    profile['synchronous'] = 'NORMAL'
+    try:
+        conn = mut.connect(get_DB_location())
+    finally:
+        profile['journal_mode'] = None
+        profile['synchronous'] = None
+    assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+    # NORMAL
+    assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1
+    conn.close()
+
+
+def test_apply_connection_profile_raises(empty_temp_db):
+    conn = mut.connect(get_DB_location())
+    with pytest.raises(ValueError):
+        mut.apply_connection_profile(conn, {'synchronous': 'SOMETIMES'})
+    with pytest.raises(ValueError):
+        mut.apply_connection_profile(conn, {'cache_size': '2000'})
+    conn.close()
+
+
+def test_read_only_connection(dataset):
+    conn = mut.connect(get_DB_location(), read_only=True)
+    assert mut.run_exists(conn, dataset.run_id)
+    with pytest.raises(RuntimeError) as excinfo:
+        mut.atomic_transaction(conn, "DELETE FROM runs")
+    assert error_caused_by(excinfo, "readonly database")
+    conn.close()
+
+
+_FULL_SCAN = re.compile(r'^SCAN (TABLE )?(runs|layouts|dependencies)\b')
+
+
+@pytest.mark.parametrize("helper", [
+    lambda ds: mut.get_layout_id(ds.conn, 'y', ds.run_id),
+    lambda ds: mut.get_dependents(ds.conn, ds.run_id),
+    lambda ds: mut.get_dependencies(
+        ds.conn, mut.get_layout_id(ds.conn, 'y', ds.run_id)),
+    lambda ds: mut.get_parameters(ds.conn, ds.run_id),
+    lambda ds: mut.get_setpoints(ds.conn, ds.table_name, 'y'),
+    lambda ds: mut.get_metadata(ds.conn, 'run_timestamp', ds.table_name),
+    lambda ds: mut.add_parameter(ds.conn, ds.table_name,
+                                 ParamSpec('z', 'numeric', depends_on=['x']))
+], ids=['get_layout_id', 'get_dependents', 'get_dependencies',
+        'get_parameters', 'get_setpoints', 'get_metadata', 'add_parameter'])
+def test_metadata_lookups_use_indices(dataset, helper):
+    x = ParamSpec('x', 'numeric')
+    t = ParamSpec('t', 'numeric')
+    y = ParamSpec('y', 'numeric', depends_on=['x', 't'])
+    dataset.add_parameters([x, t, y])
+
+    statements = []
+
+    def trace(statement):
+        statements.append(statement)
+
+    dataset.conn.set_trace_callback(trace)
+    try:
+        helper(dataset)
+    finally:
+        dataset.conn.set_trace_callback(None)
+
+    queries = [statement for statement in statements
+               if re.match(r'\s*(SELECT|UPDATE)', statement, re.IGNORECASE)]
+    assert len(queries) > 0
+    for query in queries:
+        plan = dataset.conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()
+        scans = [row['detail'] for row in plan
+                 if _FULL_SCAN.match(row['detail'])]
+        assert scans == [], query
+
+
+def _snapshot_rows(conn):
+    return mut.atomic_transaction(
+        conn, "SELECT * FROM snapshots ORDER BY rowid").fetchall()
+
+
+@pytest.mark.parametrize("compress", [True, False])
+def test_add_snapshot_stores_identical_snapshots_once(experiment, compress):
+    conn = experiment.conn
+    snapshot = json.dumps({'station': {'instruments': {'dac': {'v': 1}}}})
+    run_ids = [mut.create_run(conn, experiment.exp_id, 'run',
+                              generate_guid())[1] for _ in range(3)]
+
+    hashes = {mut.add_snapshot(conn, run_id, snapshot, compress=compress)
+              for run_id in run_ids}
+
+    assert len(hashes) == 1
+    rows = _snapshot_rows(conn)
+    assert len(rows) == 1
+    assert rows[0]['encoding'] == ('zlib' if compress else 'json')
+    for run_id in run_ids:
+        assert mut.get_snapshot(conn, run_id) == snapshot
+
+
+def test_add_snapshot_as_delta(experiment):
+    conn = experiment.conn
+    base = {'station': {'instruments': {f'dac{n}': {'v': n, 'label': 'V/m'}
+                                        for n in range(50)}}}
+    snapshots = [base]
+    for n in range(1, 4):
+        snapshot = json.loads(json.dumps(snapshots[-1]))
+        snapshot['station']['instruments']['dac0']['v'] = n
+        snapshot['station']['instruments'][f'dac{n}'].pop('label')
+        snapshot['station']['new'] = n
+        snapshots.append(snapshot)
+    # the keys of a reordered snapshot can not be recovered from a patch
+    snapshots.append({'station': dict(reversed(list(
+        snapshots[-1]['station'].items())))})
+
+    run_ids = []
+    for snapshot in snapshots:
+        _, run_id, _ = mut.create_run(conn, experiment.exp_id, 'run',
+                                      generate_guid())
+        mut.add_snapshot(conn, run_id, json.dumps(snapshot), delta=True,
+                         max_delta_depth=2)
+        run_ids.append(run_id)
+
+    rows = _snapshot_rows(conn)
+    assert [row['depth'] for row in rows] == [0, 1, 2, 0, 0]
+    assert rows[1]['base_hash'] == rows[0]['snapshot_hash']
+    assert rows[2]['base_hash'] == rows[1]['snapshot_hash']
+    assert rows[3]['base_hash'] is None
+    assert rows[4]['base_hash'] is None
+    for run_id, snapshot in zip(run_ids, snapshots):
+        assert mut.get_snapshot(conn, run_id) == json.dumps(snapshot)
+
+
+def test_json_patch_escapes_keys():
+    old = {'a/b': {'~c': 1, 'd': [1, 2]}, 'e': 1}
+    new = {'a/b': {'~c': 2, 'd': [1, 3]}, 'f': None}
+
+    patch = mut._json_diff(old, new)
+
+    assert {'op': 'replace', 'path': '/a~1b/~0c', 'value': 2} in patch
+    assert mut._apply_json_patch(json.loads(json.dumps(old)), patch) == new
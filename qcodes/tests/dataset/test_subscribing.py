@@ -6,6 +6,9 @@ import pytest
 from numpy import ndarray
 
 from qcodes.dataset.param_spec import ParamSpec
+from qcodes.dataset.data_set import _SubscriberPool
+from qcodes.dataset.sqlite_base import atomic_transaction
+from qcodes.tests.common import retry_until_does_not_throw
 # pylint: disable=unused-import
 from qcodes.tests.dataset.temporary_databases import (empty_temp_db,
                                                       experiment,
@@ -49,4 +52,92 @@ def test_basic_subscription(dataset, basic_subscriber):
         y = -x**2
         dataset.add_result({'x': x, 'y': y})
         expected_state[x+1] = [(x, y)]
-        assert dataset.subscribers[sub_id].state == expected_state
+
+        @retry_until_does_not_throw(
+            exception_class_to_expect=AssertionError, delay=0.05, tries=20)
+        def assert_expected_state():
+            assert dataset.subscribers[sub_id].state == expected_state
+
+        assert_expected_state()
+
+
+def test_subscription_does_not_use_triggers(dataset, basic_subscriber):
+    xparam = ParamSpec(name='x', paramtype='numeric')
+    dataset.add_parameter(xparam)
+
+    dataset.subscribe(basic_subscriber, state={})
+
+    get_triggers_sql = "SELECT * FROM sqlite_master WHERE TYPE = 'trigger';"
+    triggers = atomic_transaction(dataset.conn, get_triggers_sql).fetchall()
+    assert len(triggers) == 0
+
+
+def test_subscribers_share_a_pool(dataset, basic_subscriber):
+    xparam = ParamSpec(name='x', paramtype='numeric')
+    yparam = ParamSpec(name='y', paramtype='numeric', depends_on=[xparam])
+    dataset.add_parameter(xparam)
+    dataset.add_parameter(yparam)
+
+    pool = _SubscriberPool(n_workers=1)
+    states = [{}, {}, {}]
+    for state in states:
+        dataset.subscribe(basic_subscriber, min_count=5, state=state,
+                          pool=pool)
+
+    dataset.add_results([{'x': x, 'y': 2*x} for x in range(3)])
+    dataset.add_results([{'x': x} for x in range(3, 5)])
+
+    expected_state = {5: [(0, 0), (1, 2), (2, 4), (3, None), (4, None)]}
+
+    @retry_until_does_not_throw(
+        exception_class_to_expect=AssertionError, delay=0.05, tries=20)
+    def assert_expected_states():
+        assert states == [expected_state] * 3
+
+    assert_expected_states()
+    assert len(pool._workers) == 1
+
+    dataset.unsubscribe_all()
+    assert len(dataset.subscribers) == 0
+
+
+def test_unsubscribe_from_callback(dataset):
+    xparam = ParamSpec(name='x', paramtype='numeric')
+    dataset.add_parameter(xparam)
+
+    pool = _SubscriberPool(n_workers=1)
+    state = {'calls': 0}
+
+    def unsubscribing_subscriber(results, length, state):
+        state['calls'] += 1
+        dataset.unsubscribe(state['sub_id'])
+
+    state['sub_id'] = dataset.subscribe(unsubscribing_subscriber,
+                                        state=state, pool=pool)
+
+    dataset.add_result({'x': 0})
+
+    @retry_until_does_not_throw(
+        exception_class_to_expect=AssertionError, delay=0.05, tries=20)
+    def assert_unsubscribed():
+        assert len(dataset.subscribers) == 0
+
+    assert_unsubscribed()
+    assert state['calls'] == 1
+
+    # the worker thread of the pool is not blocked by the unsubscription
+    other_state = {}
+
+    def subscriber(results, length, state):
+        state[length] = results
+
+    dataset.subscribe(subscriber, state=other_state, pool=pool)
+    dataset.add_result({'x': 1})
+
+    @retry_until_does_not_throw(
+        exception_class_to_expect=AssertionError, delay=0.05, tries=20)
+    def assert_other_called():
+        assert other_state == {2: [(1,)]}
+
+    assert_other_called()
+    dataset.unsubscribe_all()
@@ -0,0 +1,99 @@
+from collections import deque
+
+import pytest
+
+from qcodes.instrument_drivers.QDev.QDac_channels import QDac
+
+
+class QDacHandle:
+    """
+    A visa handle that answers the commands of a QDac with a few channels
+    like the instrument does, one response line per command
+    """
+    def __init__(self, num_chans):
+        self.voltages = {chan: 0.5 * chan for chan in range(1, num_chans + 1)}
+        # channel 2 is attenuated (low voltage range) and in the high
+        # current range
+        self.attenuated = {2}
+        self.high_current = {2}
+        self.lines = deque()
+        self.commands = []
+
+    def write(self, cmd):
+        self.commands.append(cmd)
+        if cmd == 'status':
+            self.lines.extend(self._status())
+        elif cmd.startswith('cur '):
+            chan = int(cmd.split()[1])
+            self.lines.append(str(int(chan in self.high_current)))
+        else:
+            self.lines.append('')
+        return len(cmd), 0
+
+    def read(self):
+        return self.lines.popleft()
+
+    def query(self, cmd):
+        self.write(cmd)
+        return self.read()
+
+    def _status(self):
+        lines = ['Software Version: 0.170202',
+                 'Channel\tOut V\t\tVoltage range\tCurrent range', '']
+        for chan, v in self.voltages.items():
+            vrange = 'X 0.1' if chan in self.attenuated else 'X 1'
+            irange = 'hi cur' if chan in self.high_current else 'lo cur'
+            # the status shows the voltage before attenuation
+            if chan in self.attenuated:
+                v *= 10
+            lines.append('{}\t{:.6f}\t\t{}\t\t{}'.format(chan, v, vrange,
+                                                          irange))
+        return lines
+
+    def clear(self):
+        self.lines.clear()
+
+    def close(self):
+        pass
+
+
+class MockQDac(QDac):
+    def set_address(self, address):
+        self.visa_handle = QDacHandle(num_chans=48)
+        self._address = address
+
+
+@pytest.fixture
+def qdac():
+    qdac = MockQDac('qdac', 'ASRL1::INSTR', update_currents=False)
+    try:
+        yield qdac
+    finally:
+        qdac.close()
+
+
+def test_multi_channel_status_parameters(qdac):
+    handle = qdac.visa_handle
+    channels = qdac.channels[:3]
+
+    handle.commands.clear()
+    assert channels.v() == (0.5, 1.0, 1.5)
+    assert channels.vrange() == (0, 1, 0)
+    # both read all channels from one status call each
+    assert handle.commands == ['status', 'status']
+
+    # the values are those of the parameters of the single channels
+    assert channels.vrange() == tuple(chan.vrange() for chan in channels)
+    assert channels.v() == tuple(chan.v() for chan in channels)
+
+
+def test_multi_channel_irange(qdac):
+    handle = qdac.visa_handle
+    channels = qdac.channels[:3]
+
+    handle.commands.clear()
+    # irange is not read from the status, but from its own query, like
+    # the irange parameter of a single channel
+    assert channels.irange() == (0, 1, 0)
+    assert handle.commands == ['cur 1', 'cur 2', 'cur 3']
+    assert channels.irange() == tuple(chan.irange() for chan in channels)
@@ -0,0 +1,97 @@
+import pytest
+import numpy as np
+
+from qcodes.instrument_drivers.stanford_research.SR865 import SR865
+
+
+class SR86xHandle:
+    """
+    A visa handle that answers the queries of an SR86x from a dict of values,
+    including compound queries, and records every message it gets
+    """
+    def __init__(self):
+        self.answers = {'*IDN?': 'Stanford_Research_Systems,SR865,003123,'
+                                 'v1.47',
+                        'IVMD?': '0', 'ISRC?': '0', 'SCAL?': '5',
+                        'FREQ?': '1000.0', 'OUTP? 0': '1.5E-03',
+                        'OUTP? 1': '-2.5E-04', 'CDSP? 0': '2',
+                        'CAPTURERATEMAX?': '1.25E+06'}
+        self.messages = []
+        self._response = ''
+
+    def write(self, cmd):
+        self.messages.append(cmd)
+        queries = cmd.split(';')
+        self._response = ';'.join(self.answers[query] for query in queries
+                                  if query.endswith('?') or '? ' in query)
+        return len(cmd), 0
+
+    def read(self):
+        return self._response
+
+    def query(self, cmd):
+        self.write(cmd)
+        return self.read()
+
+    def clear(self):
+        pass
+
+    def close(self):
+        pass
+
+
+class MockSR865(SR865):
+    def set_address(self, address):
+        self.visa_handle = SR86xHandle()
+        self._address = address
+
+
+@pytest.fixture
+def lockin():
+    lockin = MockSR865('lockin', 'GPIB::1::INSTR')
+    try:
+        yield lockin
+    finally:
+        lockin.close()
+
+
+def test_get_parameters_in_one_query(lockin):
+    handle = lockin.visa_handle
+    handle.messages.clear()
+
+    values = lockin.get_parameters(lockin.X, lockin.Y, lockin.frequency,
+                                   lockin.sensitivity,
+                                   lockin.data_channel_1.assigned_parameter)
+    assert values == [1.5e-3, -2.5e-4, 1000.0, 20e-3, 'R']
+    # the get_parser of the sensitivity asks for the signal input to tell
+    # the unit of the answer, after the compound query
+    assert handle.messages == [
+        'OUTP? 0;OUTP? 1;FREQ?;SCAL?;CDSP? 0', 'IVMD?']
+
+    # the values are those of the single parameters
+    assert values == [lockin.X(), lockin.Y(), lockin.frequency(),
+                      lockin.sensitivity(),
+                      lockin.data_channel_1.assigned_parameter()]
+    assert lockin.X.get_latest() == 1.5e-3
+
+
+def test_raw_capture_data_of_short_blocks(lockin):
+    buffer = lockin.buffer
+    buffer.max_size_per_reading_in_kb = 2
+    lockin.visa_handle.answers['CAPTURELEN?'] = '4'
+    requested = []
+
+    def get_block(size_in_kb, offset_in_kb=0, out=None):
+        requested.append((size_in_kb, offset_in_kb, len(out)))
+        # the first block is one value short
+        n_values = size_in_kb * 256 - (1 if offset_in_kb == 0 else 0)
+        out[:n_values] = offset_in_kb + np.arange(n_values)
+        return out[:n_values]
+
+    buffer._get_raw_capture_data_block = get_block
+    values = buffer._get_raw_capture_data(4)
+
+    assert requested == [(2, 0, 512), (2, 2, 512)]
+    expected = np.concatenate([np.arange(511), 2 + np.arange(512)])
+    np.testing.assert_array_equal(values, expected)
+    assert values.dtype == np.float64
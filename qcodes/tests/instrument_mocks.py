@@ -169,6 +169,53 @@ class DummyChannelInstrument(Instrument):
         self.add_submodule("channels", channels)
 
 
+class DummyLockinChannel(InstrumentChannel):
+    """
+    A dummy lock-in channel with its own SCPI subsystem
+    """
+
+    def __init__(self, parent, name, channel):
+        super().__init__(parent, name)
+        self.add_parameter('phase', get_cmd=f'CH{channel}:PHAS?',
+                           get_parser=float)
+
+
+class DummyLockin(Instrument):
+    """
+    Dummy SCPI lock-in amplifier that answers queries from a dict of values
+    and records every ask, for testing compound queries
+    """
+    batch_query_separator = ';:'
+    batch_response_separator = ';'
+
+    def __init__(self, name, **kwargs):
+        super().__init__(name, **kwargs)
+        self.answers = {'X?': '0.5', 'Y?': '-0.25', 'R?': '0.559',
+                        'THET?': '-26.6', 'SENS?': '3', 'STAT?': 'ON',
+                        'CH1:PHAS?': '45.0'}
+        self.asked = []
+
+        for name in ('X', 'Y', 'R', 'THET'):
+            self.add_parameter(name, get_cmd=f'{name}?', get_parser=float,
+                               unit='V')
+        self.add_parameter('sensitivity', get_cmd='SENS?', get_parser=int,
+                           scale=10, offset=1)
+        self.add_parameter('status', get_cmd='STAT?',
+                           val_mapping={True: 'ON', False: 'OFF'})
+        self.add_parameter('counter', get_cmd=self._count)
+        self.add_submodule('ch1', DummyLockinChannel(self, 'ch1', 1))
+        self._counter = 0
+
+    def _count(self):
+        self._counter += 1
+        return self._counter
+
+    def ask_raw(self, cmd):
+        self.asked.append(cmd)
+        queries = [query.lstrip(':') for query in cmd.split(';')]
+        return ';'.join(self.answers[query] for query in queries)
+
+
 class MultiGetter(MultiParameter):
     """
     Test parameters with complicated return values
@@ -8,7 +8,9 @@ import numpy as np
 from numpy.testing import assert_array_equal, assert_allclose
 import pytest
 
-from qcodes.tests.instrument_mocks import DummyChannelInstrument, DummyChannel
+from qcodes.tests.instrument_mocks import (DummyChannelInstrument,
+                                           DummyChannel, DummyLockin,
+                                           DummyLockinChannel)
 from qcodes.utils.validators import Numbers
 from qcodes.instrument.parameter import Parameter
 from qcodes.instrument.channel import ChannelList
@@ -37,6 +39,34 @@ def test_channels_call_function(dci, caplog):
         assert mssgs == names
 
 
+def test_multi_parameter_is_cached(dci):
+    temperature = dci.channels.temperature
+    assert dci.channels.temperature is temperature
+    assert len(temperature.names) == 6
+
+    # the multi-channel parameter is created again when the channels change
+    dci.channels.append(DummyChannel(dci, 'Chanfoo', 'foo'))
+    new_temperature = dci.channels.temperature
+    assert new_temperature is not temperature
+    assert len(new_temperature.names) == 7
+    dci.channels.lock()
+    assert dci.channels.temperature is not new_temperature
+    assert dci.channels.temperature is dci.channels.temperature
+
+
+def test_multi_parameter_compound_query():
+    lockin = DummyLockin('lockin_channels')
+    try:
+        lockin.answers['CH2:PHAS?'] = '90.0'
+        channels = ChannelList(lockin, 'channels', DummyLockinChannel,
+                               [lockin.ch1,
+                                DummyLockinChannel(lockin, 'ch2', 2)])
+        assert channels.phase() == (45.0, 90.0)
+        assert lockin.asked == ['CH1:PHAS?;:CH2:PHAS?']
+    finally:
+        lockin.close()
+
+
 class TestChannels(TestCase):
 
     def setUp(self):
@@ -278,6 +278,34 @@ class TestDataArray(TestCase):
         data.synced_index = 22
         self.assertEqual(data.fraction_complete(), 23 / 50)
 
+    def test_edit_and_mark_negative_index(self):
+        data = DataArray(preset_data=[[1] * 5] * 6)
+        data.modified_range = None
+
+        data[-1, 1:-1] = 2
+        self.assertEqual(data[5].tolist(), [1, 2, 2, 2, 1])
+        self.assertEqual(data.modified_range, (26, 28))
+
+    def test_get_and_apply_changes(self):
+        data = DataArray(shape=(3, 4))
+        data.init_data()
+        self.assertIsNone(data.get_changes(-1))
+
+        data[0] = [1, 2, 3, 4]
+        data[1, 0] = 5
+        changes = data.get_changes(1)
+        self.assertEqual(changes['start'], 2)
+        self.assertEqual(changes['stop'], 4)
+        self.assertEqual(changes['vals'].tolist(), [3, 4, 5])
+
+        synced = DataArray(shape=(3, 4))
+        synced.init_data()
+        synced.apply_changes(**data.get_changes(-1))
+        self.assertEqual(synced.synced_index, 4)
+        self.assertEqual(synced[:2].tolist()[0], [1, 2, 3, 4])
+        self.assertEqual(synced[1, 0], 5)
+        self.assertTrue(np.isnan(synced[1, 1]))
+
 
 class TestLoadData(TestCase):
 
@@ -564,3 +592,26 @@ class TestDataSet(TestCase):
         m.remove_array('z')
         _ = m.__repr__()
         self.assertFalse('z' in m.arrays)
+
+    def test_store_block(self):
+        x = DataArray(name='x', shape=(2,), is_setpoint=True)
+        y = DataArray(name='y', shape=(2, 3), is_setpoint=True,
+                      set_arrays=(x,))
+        z = DataArray(name='z', shape=(2, 3), set_arrays=(x, y))
+        data = new_data(arrays=(x, y, z), location=False)
+        for array in data.arrays.values():
+            array.init_data()
+
+        data.store((0,), {'x_set': 10})
+        data.store_block((0,), 0, {'y_set': [1, 2, 3], 'z': [4, 5, 6]})
+        data.store((1,), {'x_set': 20})
+        data.store_block((1,), 1, {'y_set': [2, 3], 'z': [7, 8]})
+
+        self.assertEqual(x.tolist(), [10, 20])
+        self.assertEqual(y[0].tolist(), [1, 2, 3])
+        self.assertEqual(z[0].tolist(), [4, 5, 6])
+        self.assertTrue(np.isnan(z[1, 0]))
+        self.assertEqual(z[1, 1:].tolist(), [7, 8])
+        self.assertEqual(z.modified_range, (0, 5))
+        self.assertEqual(y.modified_range, (0, 5))
+        self.assertGreater(data.last_store, 0)
@@ -1,6 +1,8 @@
 from unittest import TestCase
 import os
 
+import numpy as np
+
 from qcodes.data.format import Formatter
 from qcodes.data.gnuplot_format import GNUPlotFormat
 
@@ -400,6 +402,42 @@ class TestGNUPlotFormat(TestCase):
 
         self.assertTrue('ValueError' in logs.value, logs.value)
 
+    def test_read_in_chunks(self):
+        formatter = GNUPlotFormat()
+        formatter.read_chunk_lines = 3
+        location = self.locations[0]
+        data = DataSet(location=location)
+        os.makedirs(location, exist_ok=True)
+        with open(location + '/x_set_y_set.dat', 'w') as f:
+            f.write('\n'.join(['# x_set\ty_set\tz',
+                               '# "X"\t"Y"\t"Z"', '# 3\t2',
+                               '1\t5\t0.5', '# a comment', '1   6 0.25',
+                               '', '2\t5\t-1\t7', '2\t6', '  ',
+                               '3\t5\tnan', '3\t6\t1e3', '', '']))
+        formatter.read(data)
+
+        self.assertEqual(data.x_set.tolist(), [1, 2, 3])
+        self.assertEqual(data.y_set.tolist(), [[5, 6]] * 3)
+        np.testing.assert_array_equal(
+            data.z.ndarray, [[0.5, 0.25], [-1, np.nan], [np.nan, 1e3]])
+        self.assertEqual(data.z.last_saved_index, 5)
+
+    def test_read_inconsistent_setpoints(self):
+        formatter = GNUPlotFormat()
+        location = self.locations[0]
+        data = DataSet(location=location)
+        os.makedirs(location, exist_ok=True)
+        with open(location + '/x_set_y_set.dat', 'w') as f:
+            f.write('\n'.join(['# x_set\ty_set\tz',
+                               '# "X"\t"Y"\t"Z"', '# 2\t2',
+                               '1\t5\t1', '1\t6\t2', '',
+                               '2\t5\t3', '3\t6\t4']))
+        with LogCapture() as logs:
+            formatter.read(data)
+
+        self.assertIn('inconsistent setpoint values', logs.value)
+        self.assertIn('[1, 1]', logs.value)
+
     def test_multifile(self):
         formatter = GNUPlotFormat()
         location = self.locations[1]
@@ -343,3 +343,89 @@ class TestHDF5_Format(TestCase):
         data = DataSet2D(location=self.loc_provider, name='MetaDataTest')
         data.metadata = {'a': ['hi', 'there']}
         self.formatter.write(data, write_metadata=True)
+
+    def test_chunked_compressed_write(self):
+        formatter = HDF5Format(compression='gzip', compression_opts=4)
+        data = DataSet2D(location=self.loc_provider, name='test_chunks')
+        formatter.write(data)
+        dset = data._h5_base_group['Data Arrays']['z']
+        self.assertEqual(dset.compression, 'gzip')
+        self.assertEqual(dset.compression_opts, 4)
+        # chunks hold whole rows of the inner dimension of 4 points
+        self.assertEqual(dset.chunks[0] % 4, 0)
+        self.assertGreaterEqual(dset.chunks[0], formatter.min_chunk_size)
+
+        data2 = DataSet(location=data.location, formatter=formatter)
+        data2.read()
+        self.checkArraysEqual(data2.arrays['z'], data.arrays['z'])
+        formatter.close_file(data)
+        formatter.close_file(data2)
+
+        with self.assertRaises(ValueError):
+            HDF5Format(compression='zip')
+
+    def test_write_modified_range(self):
+        data = DataSet2D(location=self.loc_provider, name='test_modified')
+        self.formatter.write(data)
+        self.assertIsNone(data.z.modified_range)
+        self.assertEqual(data.z.last_saved_index, data.z.size - 1)
+
+        # a change inside the part that was written before is rewritten
+        data.z[2, 1] = -1
+        self.assertEqual(data.z.modified_range, (9, 9))
+        self.formatter.write(data)
+        self.assertIsNone(data.z.modified_range)
+
+        data2 = DataSet(location=data.location, formatter=self.formatter)
+        data2.read()
+        self.checkArraysEqual(data2.arrays['z'], data.arrays['z'])
+        self.assertEqual(data2.z[2, 1], -1)
+        self.formatter.close_file(data)
+        self.formatter.close_file(data2)
+
+    def test_swmr_write(self):
+        formatter = HDF5Format(swmr=True)
+        data = DataSet1D(location=self.loc_provider, name='test_swmr')
+        data.x_set.modified_range = None
+        data.y.modified_range = None
+        data.y[:] = float('nan')
+        data.y.modified_range = (0, 1)
+        data.metadata['stage'] = 'running'
+        formatter.write(data)
+        self.assertTrue(data._h5_base_group.swmr_mode)
+
+        # a reader can follow the file while it is written to
+        filepath = data._h5_base_group.filename
+        with h5py.File(filepath, 'r', libver='latest', swmr=True) as reader:
+            dset = reader['Data Arrays']['y']
+            self.assertEqual(dset.shape, (2, 1))
+
+            data.y[2] = 5
+            data.metadata['stage'] = 'done'
+            formatter.write(data)
+            dset.refresh()
+            np.testing.assert_array_equal(dset[:, 0], [np.nan, np.nan, 5])
+            self.assertEqual(reader['metadata'].attrs['stage'], 'running')
+
+        # metadata written in SWMR mode is written on closing the file
+        formatter.close_file(data)
+        data2 = DataSet(location=data.location, formatter=formatter)
+        data2.read()
+        self.assertEqual(data2.metadata['stage'], 'done')
+        np.testing.assert_array_equal(data2.y, [np.nan, np.nan, 5,
+                                                np.nan, np.nan])
+        formatter.close_file(data2)
+
+    def test_swmr_loop_writing(self):
+        formatter = HDF5Format(swmr=True)
+        station = Station()
+        MockPar = MockParabola(name='Loop_writing_test_swmr')
+        station.add_component(MockPar)
+        loop = Loop(MockPar.x[-100:100:20]).loop(
+            MockPar.y[-50:50:10]).each(MockPar.skewed_parabola)
+        data1 = loop.run(name='MockLoop_hdf5_swmr_test', formatter=formatter)
+        data2 = DataSet(location=data1.location, formatter=formatter)
+        data2.read()
+        for key in data2.arrays.keys():
+            self.checkArraysEqual(data2.arrays[key], data1.arrays[key])
+        formatter.close_file(data2)
@@ -4,7 +4,7 @@ Test suite for  instument.*
 import weakref
 from unittest import TestCase
 from qcodes.instrument.base import Instrument, InstrumentBase, find_or_create_instrument
-from .instrument_mocks import DummyInstrument, MockParabola
+from .instrument_mocks import DummyInstrument, MockParabola, DummyLockin
 from qcodes.instrument.parameter import Parameter
 import gc
 
@@ -212,6 +212,61 @@ class TestFindOrCreateInstrument(TestCase):
         instr_2.close()
 
 
+class TestGetParameters(TestCase):
+
+    def setUp(self):
+        self.lockin = DummyLockin('lockin')
+
+    def tearDown(self):
+        self.lockin.close()
+        del self.lockin
+        gc.collect()
+
+    def test_compound_query(self):
+        lockin = self.lockin
+        values = lockin.get_parameters(lockin.X, lockin.Y, lockin.R,
+                                       lockin.THET, lockin.sensitivity,
+                                       lockin.status, lockin.ch1.phase)
+
+        self.assertEqual(values, [0.5, -0.25, 0.559, -26.6, 0.2, True, 45.0])
+        self.assertEqual(lockin.asked, [
+            'X?;:Y?;:R?;:THET?;:SENS?;:STAT?;:CH1:PHAS?'])
+        # the values are saved just like with get
+        self.assertEqual(lockin.sensitivity.get_latest(), 0.2)
+        self.assertEqual(lockin.sensitivity.raw_value, '3')
+        self.assertEqual(lockin.status.get_latest(), True)
+
+    def test_uncoalescible_parameters_are_read_one_by_one(self):
+        lockin = self.lockin
+        values = lockin.get_parameters(lockin.counter, lockin.X,
+                                       lockin.counter, lockin.Y)
+
+        self.assertEqual(values, [1, 0.5, 2, -0.25])
+        self.assertEqual(lockin.asked, ['X?;:Y?'])
+
+        self.assertEqual(lockin.get_parameters(lockin.X), [0.5])
+        self.assertEqual(lockin.asked[-1], 'X?')
+
+    def test_mismatching_response_falls_back_to_single_queries(self):
+        lockin = self.lockin
+        lockin.answers['STAT?'] = 'ON;REMOTE'
+        lockin.status.val_mapping = None
+        lockin.status.inverse_val_mapping = None
+
+        values = lockin.get_parameters(lockin.X, lockin.status)
+
+        self.assertEqual(values, [0.5, 'ON;REMOTE'])
+        self.assertEqual(lockin.asked, ['X?;:STAT?', 'X?', 'STAT?'])
+
+    def test_no_compound_queries_without_separator(self):
+        lockin = self.lockin
+        lockin.batch_query_separator = None
+
+        self.assertEqual(lockin.get_parameters(lockin.X, lockin.Y),
+                         [0.5, -0.25])
+        self.assertEqual(lockin.asked, ['X?', 'Y?'])
+
+
 class TestInstrumentBase(TestCase):
     """
     This class contains tests that are relevant to the InstrumentBase class.
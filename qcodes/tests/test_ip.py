@@ -0,0 +1,142 @@
+"""
+Test suite for IPInstrument, against a local socket server
+"""
+import socket
+import threading
+import time
+
+import pytest
+
+from qcodes.instrument.ip import IPInstrument
+
+
+class LineServer:
+    """
+    A socket server that answers every line it receives with the reply of
+    ``respond``, which may be a list of packets to send separately.
+    """
+
+    def __init__(self, respond):
+        self.respond = respond
+        self.connections = 0
+        self.received = []
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.bind(('127.0.0.1', 0))
+        self._server.listen(5)
+        self.port = self._server.getsockname()[1]
+        threading.Thread(target=self._serve, daemon=True).start()
+
+    def _serve(self):
+        while True:
+            try:
+                conn, _ = self._server.accept()
+            except OSError:
+                return
+            self.connections += 1
+            threading.Thread(target=self._handle, args=(conn,),
+                             daemon=True).start()
+
+    def _handle(self, conn):
+        data = b''
+        with conn:
+            while True:
+                chunk = conn.recv(1024)
+                if not chunk:
+                    return
+                data += chunk
+                while b'\n' in data:
+                    line, data = data.split(b'\n', 1)
+                    self.received.append(line.decode())
+                    reply = self.respond(line.decode())
+                    if isinstance(reply, bytes):
+                        reply = [reply]
+                    for packet in reply:
+                        conn.sendall(packet)
+                        time.sleep(0.01)
+
+    def close(self):
+        self._server.close()
+
+
+def respond(line):
+    if line == 'SPLIT?':
+        return [b'hel', b'lo\n']
+    if line == 'TWO?':
+        return b'first\nsecond\n'
+    if line == 'BLOCK?':
+        return [b'#15ab\nc', b'd\n']
+    if line == 'EMPTY BLOCK?':
+        return b'#0\n'
+    return line.upper().encode() + b'\n'
+
+
+@pytest.fixture
+def server():
+    server = LineServer(respond)
+    yield server
+    server.close()
+
+
+@pytest.fixture
+def instruments():
+    instruments = []
+
+    def make(*args, **kwargs):
+        instrument = IPInstrument(f'ip{len(instruments)}', *args,
+                                  write_confirmation=False, timeout=2,
+                                  **kwargs)
+        instruments.append(instrument)
+        return instrument
+
+    yield make
+    for instrument in instruments:
+        instrument.close()
+
+
+def test_response_in_several_packets(server, instruments):
+    instr = instruments('127.0.0.1', server.port)
+    assert instr.ask('SPLIT?') == 'hello'
+    assert instr.ask('TWO?') == 'first'
+    # the rest of the data is kept for the next read
+    assert instr._recv() == 'second'
+
+
+def test_shared_connection(server, instruments):
+    instr1 = instruments('127.0.0.1', server.port)
+    instr2 = instruments('127.0.0.1', server.port)
+    assert instr1.ask('a') == 'A'
+    assert instr2.ask('b') == 'B'
+    assert server.connections == 1
+
+    instr1.close()
+    assert instr2.ask('c') == 'C'
+
+
+def test_not_persistent(server, instruments):
+    instr = instruments('127.0.0.1', server.port, persistent=False)
+    assert instr._connection is None
+    assert instr.ask('a') == 'A'
+    assert instr._connection is None
+    assert instr.ask('b') == 'B'
+    assert server.connections == 2
+
+
+def test_ask_pipelined(server, instruments):
+    instr = instruments('127.0.0.1', server.port)
+    assert instr.ask_pipelined(['a', 'SPLIT?', 'b']) == ['A', 'hello', 'B']
+    assert server.received == ['a', 'SPLIT?', 'b']
+
+
+def test_ask_binary_block(server, instruments):
+    instr = instruments('127.0.0.1', server.port)
+    assert instr.ask_binary_block('BLOCK?') == b'ab\ncd'
+    assert instr.ask_binary_block('EMPTY BLOCK?') == b''
+    assert instr.ask('a') == 'A'
+
+    with pytest.raises(ValueError):
+        instr.ask_binary_block('x')
+
+
+def test_unterminated_responses(server, instruments):
+    instr = instruments('127.0.0.1', server.port, read_terminator='')
+    assert instr.ask('a') == 'A\n'
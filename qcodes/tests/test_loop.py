@@ -5,7 +5,7 @@ import numpy as np
 from unittest.mock import patch
 import os
 
-from qcodes.loops import Loop
+from qcodes.loops import Loop, ActiveLoop
 from qcodes.actions import Task, Wait, BreakIf, _QcodesBreak
 from qcodes.station import Station
 from qcodes.data.data_array import DataArray
@@ -13,7 +13,7 @@ from qcodes.instrument.parameter import Parameter, MultiParameter
 from qcodes.utils.validators import Numbers
 from qcodes.utils.helpers import LogCapture
 
-from .instrument_mocks import MultiGetter, DummyInstrument
+from .instrument_mocks import MultiGetter, DummyInstrument, DummyLockin
 
 
 class NanReturningParameter(MultiParameter):
@@ -57,6 +57,23 @@ class TestLoop(TestCase):
         self.assertEqual(data.p2.tolist(), [[[3, 3], [4, 4]]] * 2)
         self.assertEqual(data.p3.tolist(), [[[5, 6]] * 2] * 2)
 
+    def test_actions_compiled_once(self):
+        loop = Loop(self.p1[1:3:1]).loop(
+            self.p2[3:5:1]).loop(
+            self.p3[5:7:1]).each(self.p1, self.p2, self.p3)
+        compile_actions = ActiveLoop._compile_actions
+        with patch.object(ActiveLoop, '_compile_actions', autospec=True,
+                          side_effect=compile_actions) as compile_mock:
+            data = loop.run_temp()
+            # the actions and .then actions of each of the three loops
+            self.assertEqual(compile_mock.call_count, 6)
+
+            data2 = loop.run_temp()
+            self.assertEqual(compile_mock.call_count, 12)
+
+        self.assertEqual(data2.p3.tolist(), data.p3.tolist())
+        self.assertEqual(data2.p3.tolist(), [[[5, 6]] * 2] * 2)
+
     def test_nesting_2(self):
         loop = Loop(self.p1[1:3:1]).each(
             self.p1,
@@ -139,6 +156,21 @@ class TestLoop(TestCase):
         self.assertEqual(data.p2_set.tolist(), [[3, 4], [3, 4]])
         self.assertEqual(data.p3.tolist(), [[5, 5]] * 2)
 
+    def test_measurement_with_compound_query(self):
+        lockin = DummyLockin('lockin')
+        try:
+            data = Loop(self.p1[1:3:1], 0.001).each(
+                lockin.X, self.p2, lockin.Y, lockin.counter,
+                lockin.sensitivity).run_temp()
+
+            self.assertEqual(lockin.asked, ['X?;:Y?;:SENS?'] * 2)
+            self.assertEqual(data.lockin_X.tolist(), [0.5, 0.5])
+            self.assertEqual(data.lockin_Y.tolist(), [-0.25, -0.25])
+            self.assertEqual(data.lockin_sensitivity.tolist(), [0.2, 0.2])
+            self.assertEqual(data.lockin_counter.tolist(), [1, 2])
+        finally:
+            lockin.close()
+
     def test_tasks_callable_arguments(self):
         data = Loop(self.p1[1:3:1], 0.01).each(
             Task(self.p2.set, self.p1),
@@ -423,6 +455,11 @@ class TestLoop(TestCase):
         self.check_snap_ts(default_meas_meta[1], 'ts', (ts1, ts2, None))
         del p1snap['ts'], p2snap['ts'], p3snap['ts']
 
+        # the Wait in the .then actions is the only delay of the loop
+        timing = loopmeta.pop('timing')
+        self.assertEqual(timing['waits'], 1)
+        self.assertGreaterEqual(timing['max_lateness'], 0)
+
         self.assertEqual(data.metadata, {
             'station': {
                 'instruments': {},
@@ -2,8 +2,10 @@
 Test suite for parameter
 """
 from collections import namedtuple
+from datetime import datetime
+import time
 from collections.abc import Iterable
-from unittest import TestCase
+from unittest import TestCase, mock
 from typing import Tuple
 import pytest
 
@@ -474,6 +476,125 @@ class TestParameter(TestCase):
         # afterwards the value should still be the same
         assert a.get() == -10
 
+    def test_changing_transforms(self):
+        raw = 10
+        p = Parameter('p', set_cmd=None, get_cmd=lambda: raw)
+        assert p() == 10
+
+        p.scale = 2
+        p.offset = 1
+        assert p() == 4.5
+        p.set(4.5)
+        assert p.raw_value == 10
+
+        p.get_parser = int
+        p.scale = None
+        raw = '7'
+        assert p() == 6
+
+        p.get_parser = None
+        p.offset = None
+        p.val_mapping = {'off': '7', 'on': '8'}
+        assert p.inverse_val_mapping == {'7': 'off', '8': 'on'}
+        assert p() == 'off'
+        p.set('on')
+        assert p.raw_value == '8'
+
+        p.val_mapping = None
+        assert p.inverse_val_mapping is None
+        assert p() == '7'
+
+    def test_latest_value(self):
+        p = Parameter('p', set_cmd=None, get_cmd=None, scale=2)
+        assert p._latest.timestamp is None
+        assert dict(p._latest) == {'value': None, 'ts': None,
+                                   'raw_value': None}
+
+        before = datetime.now().replace(microsecond=0)
+        p(3)
+        assert p._latest['value'] == 3
+        assert p._latest['raw_value'] == 6
+        assert before <= p._latest['ts'] <= datetime.now()
+        with pytest.raises(KeyError):
+            p._latest['unknown']
+
+        snapshot = p.snapshot()
+        assert snapshot['value'] == 3
+        assert snapshot['raw_value'] == 6
+        assert snapshot['ts'] == p._latest['ts'].strftime('%Y-%m-%d %H:%M:%S')
+
+    def test_max_val_age(self):
+        p = GettableParam('p')
+        p.get_latest.max_val_age = 0.1
+        p.get()
+        assert p._get_count == 1
+        p.get_latest()
+        assert p._get_count == 1
+        time.sleep(0.2)
+        p.get_latest()
+        assert p._get_count == 2
+
+    def test_latest_value_follows_wall_clock(self):
+        # a step of the wall clock, e.g. by NTP or after a suspend, moves
+        # the timestamps of later values but not the age of the value
+        p = GettableParam('p')
+        p.get_latest.max_val_age = 10
+        with mock.patch('time.time', return_value=time.time() + 3600):
+            p.get()
+        assert p._latest['ts'] > datetime.now()
+        p.get_latest()
+        assert p._get_count == 1
+
+        p.get()
+        assert p._latest['ts'] <= datetime.now()
+
+
+class TestSetMany(TestCase):
+
+    def test_set_many_hardware_list(self):
+        loaded = []
+        p = Parameter('p', set_cmd=None, vals=Numbers(0, 10), scale=2,
+                      set_many_cmd=loaded.append)
+
+        p.set_many([1, 2, 3])
+        assert loaded == [[2, 4, 6]]
+        # the instrument has not stepped through the values yet
+        assert p.get_latest() is None
+
+        with pytest.raises(ValueError):
+            p.set_many([1, 11])
+        assert len(loaded) == 1
+
+    def test_set_many_software_fallback(self):
+        set_values = []
+        p = Parameter('p', set_cmd=set_values.append)
+        p.set_many([1, 2, 3])
+        assert set_values == [1, 2, 3]
+        assert p.get_latest() == 3
+
+    def test_set_many_with_step(self):
+        loaded = []
+        set_values = []
+        p = Parameter('p', set_cmd=set_values.append, get_cmd=None,
+                      set_many_cmd=loaded.append, initial_value=0)
+        p.step = 1
+
+        p.set_many([2, 3, 4])
+        # ramp to the start of the list, then load it
+        assert set_values == [0, 1, 2]
+        assert loaded == [[2, 3, 4]]
+
+        with pytest.raises(ValueError, match='more than step'):
+            p.set_many([2, 4])
+
+    def test_sweep_to_hardware_list(self):
+        loaded = []
+        p = Parameter('p', set_cmd=None, set_many_cmd=loaded.append)
+        setpoints = p.sweep(0, 1, num=5).to_hardware_list()
+
+        assert np.array_equal(setpoints, [0, 0.25, 0.5, 0.75, 1])
+        assert loaded == [[0, 0.25, 0.5, 0.75, 1]]
+
 
 class TestValsandParseParameter(TestCase):
 
@@ -1,3 +1,6 @@
+import threading
+from unittest import mock
+
 import pytest
 
 from qcodes import Instrument
@@ -201,3 +204,118 @@ def test_station_after_instrument_is_closed():
     with pytest.raises(KeyError, match='Component bob is not part of the '
                                        'station'):
         station.remove_component('bob')
+
+
+class _FakeClock:
+    """A ``time.perf_counter`` that only advances when told to"""
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    clock = _FakeClock()
+    with mock.patch('time.perf_counter', clock):
+        yield clock
+
+
+@pytest.fixture
+def make_instrument():
+    """
+    Yields a function that makes an instrument with a parameter p<i> for
+    each of the given getters, closing all of them at teardown
+    """
+    instruments = []
+
+    def make(name, getters):
+        instrument = Instrument(name)
+        instruments.append(instrument)
+        for i, getter in enumerate(getters):
+            instrument.add_parameter(f'p{i}', get_cmd=getter)
+        return instrument
+
+    try:
+        yield make
+    finally:
+        for instrument in instruments:
+            instrument.close()
+        Station.default = None
+
+
+def test_parallel_snapshot(make_instrument):
+    # p0 of every instrument can only return once all instruments are
+    # reading it, which they only do if they are snapshotted in parallel
+    barrier = threading.Barrier(4, timeout=5)
+    threads = {}
+
+    def getter(n, i):
+        def get():
+            threads.setdefault(n, set()).add(threading.current_thread())
+            if i == 0:
+                barrier.wait()
+            return i
+        return get
+
+    instruments = [make_instrument(f'slow{n}', [getter(n, i)
+                                                for i in range(2)])
+                   for n in range(4)]
+    station = Station(*instruments, update_snapshot=False,
+                      parallel_snapshot=True)
+
+    snapshot = station.snapshot(update=True)
+
+    assert [f'slow{n}' for n in range(4)] == \
+        list(snapshot['instruments'].keys())
+    for instrument in instruments:
+        parameters = snapshot['instruments'][instrument.name]['parameters']
+        assert [0, 1] == [parameters[f'p{i}']['value'] for i in range(2)]
+    # the parameters of an instrument are read one after the other by the
+    # worker thread of the instrument
+    assert all(len(threads[n]) == 1 for n in range(4))
+    assert len(set.union(*threads.values())) == 4
+
+    assert {f'slow{n}_p{i}' for n in range(4) for i in range(2)} <= \
+        set(station.snapshot_timings)
+
+
+def test_snapshot_timings(make_instrument, clock):
+    durations = [0.3, 0.1, 0.2]
+    instrument = make_instrument('slow', [
+        lambda d=d: clock.advance(d) for d in durations])
+    station = Station(instrument, update_snapshot=False)
+
+    station.snapshot(update=True)
+
+    # IDN takes no time on the clock
+    assert {'slow_IDN': 0, **{f'slow_p{i}': pytest.approx(d)
+                              for i, d in enumerate(durations)}} == \
+        station.snapshot_timings
+    assert ['slow_p0', 'slow_p2'] == [
+        name for name, _ in station.slowest_snapshot_parameters(2)]
+
+
+def test_snapshot_timeout_falls_back_to_latest_values(make_instrument, clock):
+    def getter(i):
+        return lambda: clock.advance(0.1) or i
+
+    instrument = make_instrument('slow', [getter(i) for i in range(4)])
+    instrument.p3._save_val(-1)
+    station = Station(instrument, update_snapshot=False,
+                      snapshot_timeout=0.15)
+
+    parameters = station.snapshot(update=True)['instruments']['slow'][
+        'parameters']
+
+    # p0 and p1 are updated before the budget runs out, the others not
+    assert [0, 1] == [parameters[f'p{i}']['value'] for i in range(2)]
+    assert parameters['p2'].get('value') is None
+    assert -1 == parameters['p3']['value']
+    assert ['slow_p0', 'slow_p1'] == sorted(
+        name for name, duration in station.snapshot_timings.items()
+        if duration > 0)
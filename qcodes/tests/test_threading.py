@@ -1,32 +1,198 @@
+import asyncio
 import gc
+import threading
+import time
 
 from unittest import TestCase
 
+import qcodes
 from qcodes import Loop
-from qcodes.actions import UnsafeThreadingException
+from qcodes.instrument.base import Instrument
+from qcodes.instrument.parameter import Parameter
 from qcodes.tests.instrument_mocks import DummyInstrument
+from qcodes.utils.threading import (get_concurrently, run_coroutine,
+                                    thread_map)
 
 
-class TestUnsafeThreading(TestCase):
+class SlowInstrument(Instrument):
+    """
+    An instrument that takes a while to answer, and that records how many
+    queries it is answering at the same time
+    """
+    def __init__(self, name, delay=0.05, **kwargs):
+        super().__init__(name, **kwargs)
+        self.delay = delay
+        self.busy = 0
+        self.max_busy = 0
+        self.threads = set()
+        for i in range(3):
+            self.add_parameter(f'p{i}', get_cmd=f'P{i}?', get_parser=int,
+                               set_cmd=f'P{i} {{}}')
+
+    def ask_raw(self, cmd):
+        self.busy += 1
+        self.max_busy = max(self.max_busy, self.busy)
+        self.threads.add(threading.current_thread().name)
+        time.sleep(self.delay)
+        self.busy -= 1
+        return cmd[1]
+
+    def write_raw(self, cmd):
+        self.ask_raw(cmd)
+
+
+class TestThreading(TestCase):
 
     def setUp(self):
         self.inst1 = DummyInstrument(name='inst1',
                                      gates=['v1', 'v2'])
         self.inst2 = DummyInstrument(name='inst2',
                                      gates=['v1', 'v2'])
+        self.slow1 = SlowInstrument('slow1')
+        self.slow2 = SlowInstrument('slow2')
 
     def tearDown(self):
-        self.inst1.close()
-        self.inst2.close()
+        for inst in (self.inst1, self.inst2, self.slow1, self.slow2):
+            inst.close()
 
         del self.inst1
         del self.inst2
+        del self.slow1
+        del self.slow2
 
         gc.collect()
 
-    def test_unsafe_exception(self):
+    def test_same_instrument_in_threads(self):
+        self.inst1.v1.set(1)
+        self.inst1.v2.set(2)
         to_meas = (self.inst1.v1, self.inst1.v2)
         loop = Loop(self.inst2.v1.sweep(0, 1, num=10)).each(*to_meas)
 
-        with self.assertRaises(UnsafeThreadingException):
-            loop.run(use_threads=True)
+        data = loop.run(use_threads=True, quiet=True, location=False)
+        self.assertEqual(data.inst1_v1.tolist(), [1] * 10)
+        self.assertEqual(data.inst1_v2.tolist(), [2] * 10)
+
+    def test_get_concurrently(self):
+        params = [self.slow1.p0, self.slow2.p1, self.slow1.p2, self.slow2.p0]
+        t_start = time.perf_counter()
+        self.assertEqual(get_concurrently(params), [0, 1, 2, 0])
+        elapsed = time.perf_counter() - t_start
+
+        # the two instruments are read at the same time, each one only
+        # answers one query at a time
+        self.assertLess(elapsed, 4 * self.slow1.delay)
+        self.assertEqual(self.slow1.max_busy, 1)
+        self.assertEqual(self.slow2.max_busy, 1)
+        self.assertEqual(len(self.slow1.threads), 1)
+        self.assertNotEqual(self.slow1.threads, self.slow2.threads)
+
+    def test_get_concurrently_timeout(self):
+        params = [self.slow1.p0, self.slow1.p1, self.slow1.p2]
+        with self.assertRaises(asyncio.TimeoutError):
+            get_concurrently(params, timeout=self.slow1.delay / 2)
+        time.sleep(2 * self.slow1.delay)
+        # the gets that had not started were cancelled
+        self.assertIsNone(self.slow1.p2.get_latest())
+
+    def test_async_get_and_set(self):
+        async def set_and_get():
+            await self.slow1.async_set('p0', 5)
+            await self.slow1.p1.async_set(7)
+            return await asyncio.gather(self.slow1.async_get('p0'),
+                                        self.slow1.p1.async_get())
+
+        # the instrument answers with the digit of the parameter
+        self.assertEqual(run_coroutine(set_and_get()), [0, 1])
+        # all in the worker thread of the instrument
+        self.assertEqual(len(self.slow1.threads), 1)
+        self.assertTrue(self.slow1.threads.pop().startswith('slow1'))
+
+    def test_async_without_instrument(self):
+        param = Parameter('free', set_cmd=None, get_cmd=None)
+        run_coroutine(param.async_set(3))
+        self.assertEqual(get_concurrently([param]), [3])
+
+    def test_no_run_coroutine_in_event_loop(self):
+        async def nested():
+            return get_concurrently([self.slow1.p0])
+
+        # instead of waiting forever for a coroutine that the loop can not
+        # run while it waits
+        with self.assertRaises(RuntimeError):
+            run_coroutine(nested())
+        self.assertEqual(get_concurrently([self.slow1.p0]), [0])
+
+    def test_instrument_lock(self):
+        slow = self.slow1
+        threads = [threading.Thread(target=slow.ask, args=('P0?',))
+                   for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        self.assertEqual(slow.max_busy, 1)
+
+    def test_thread_map(self):
+        def thread_name(x, y=0):
+            time.sleep(0.01)
+            return x + y, threading.current_thread().name
+
+        outputs = thread_map([thread_name] * 3, args=[(1,), (2,), (3,)],
+                             kwargs=[{}, {'y': 1}, {}])
+        self.assertEqual([value for value, _ in outputs], [1, 3, 3])
+        names = {name for _, name in outputs}
+        self.assertEqual(len(names), 3)
+
+        # the threads of the pool are reused by the next calls
+        for _ in range(5):
+            outputs = thread_map([thread_name] * 3, args=[(1,), (2,), (3,)])
+            names |= {name for _, name in outputs}
+        self.assertLessEqual(len(names),
+                             qcodes.config['core']['thread_pool_size'])
+        self.assertTrue(all(name.startswith('qcodes_thread_map')
+                            for name in names))
+
+    def test_thread_map_exception(self):
+        def fail():
+            raise ValueError('fail')
+
+        with self.assertRaisesRegex(ValueError, 'fail'):
+            thread_map([lambda: 1, fail])
+
+    def test_thread_map_instruments(self):
+        params = [self.slow1.p0, self.slow1.p1, self.slow2.p2]
+        timings = []
+        values = thread_map(
+            [p.get for p in params],
+            instruments=[p.root_instrument for p in params],
+            timing_hook=lambda c, duration: timings.append(duration))
+
+        self.assertEqual(values, [0, 1, 2])
+        self.assertEqual(self.slow1.max_busy, 1)
+        self.assertEqual(len(self.slow1.threads), 1)
+        self.assertTrue(self.slow1.threads.pop().startswith('slow1'))
+        self.assertEqual(len(timings), 3)
+        self.assertTrue(all(t >= self.slow1.delay for t in timings))
+
+        # bound methods of instruments run in their worker by default
+        self.slow2.threads.clear()
+        thread_map([self.slow2.ask], args=[('P0?',)])
+        self.assertTrue(self.slow2.threads.pop().startswith('slow2'))
+
+    def test_thread_map_parameter_affinity(self):
+        # the get and set of a parameter are wrapped functions, not bound
+        # methods, and still run in the worker of their instrument
+        self.slow1.threads.clear()
+        values = thread_map([self.slow1.p0.get, self.slow1.p1.get])
+        self.assertEqual(values, [0, 1])
+        self.assertEqual(self.slow1.max_busy, 1)
+        self.assertEqual(len(self.slow1.threads), 1)
+        self.assertTrue(self.slow1.threads.pop().startswith('slow1'))
+
+        thread_map([self.slow2.p0.set], args=[(3,)])
+        self.assertTrue(self.slow2.threads.pop().startswith('slow2'))
+
+        # parameters without an instrument run in the shared pool
+        free = Parameter('free', set_cmd=None, get_cmd=None)
+        thread_map([free.set], args=[(1,)])
+        self.assertEqual(thread_map([free.get]), [1])
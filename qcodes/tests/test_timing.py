@@ -0,0 +1,153 @@
+import time
+from unittest import mock
+
+import numpy as np
+import pytest
+
+from qcodes.actions import Task
+from qcodes.instrument.parameter import Parameter
+from qcodes.loops import Loop
+from qcodes.utils import timing
+from qcodes.utils.timing import Scheduler, sleep_until
+
+
+def test_sleep_until():
+    deadline = time.perf_counter() + 0.005
+    sleep_until(deadline)
+    assert time.perf_counter() >= deadline
+
+    # a deadline in the past returns at once
+    t0 = time.perf_counter()
+    sleep_until(t0 - 1)
+    assert time.perf_counter() - t0 < 0.001
+
+
+def test_sleep_polls_only_short_delays():
+    with mock.patch('time.sleep') as sleep:
+        timing.sleep(timing.spin_time)
+        sleep.assert_called_once_with(timing.spin_time)
+
+        sleep.reset_mock()
+        t0 = time.perf_counter()
+        timing.sleep(0.0005)
+        assert time.perf_counter() - t0 >= 0.0005
+        sleep.assert_not_called()
+
+
+def test_parameter_delays_do_not_poll():
+    p = Parameter('p', set_cmd=None, inter_delay=0.05, post_delay=0.05)
+    with mock.patch('time.sleep') as sleep:
+        p(1)
+        p(2)
+    # no time passes in the mocked sleep, hence there is an inter_delay
+    # before and a post_delay after each set
+    assert sleep.call_count == 4
+    assert all(0 < call[0][0] <= 0.05 for call in sleep.call_args_list)
+
+
+def test_deadlines_do_not_drift():
+    scheduler = Scheduler(record=True)
+    start = scheduler.epoch
+    for i in range(1, 21):
+        # as if every point took some time before its wait
+        time.sleep(0.0002)
+        scheduler.wait_until(start + i * 0.002)
+
+    intended = scheduler.intended
+    actual = scheduler.actual
+    assert np.allclose(intended, 0.002 * np.arange(1, 21))
+    assert np.all(actual >= intended)
+
+    stats = scheduler.timing_stats()
+    assert stats['waits'] == 20
+    assert 0 <= stats['mean_lateness'] <= stats['max_lateness']
+    assert 'actual' not in stats
+    assert np.array_equal(scheduler.timing_stats(per_wait=True)['actual'],
+                          actual)
+
+
+def test_waits_are_recorded_only_when_asked():
+    scheduler = Scheduler()
+    for _ in range(3):
+        scheduler.wait(0.001)
+
+    assert len(scheduler.intended) == 0
+    stats = scheduler.timing_stats(per_wait=True)
+    assert stats['waits'] == 3
+    assert 0 <= stats['mean_lateness'] <= stats['max_lateness']
+    assert stats['std_lateness'] >= 0
+    assert len(stats['actual']) == 0
+
+
+def test_idle_tasks_run_in_slack():
+    scheduler = Scheduler()
+    calls = []
+    scheduler.add_idle_task(lambda: calls.append(time.perf_counter()))
+
+    deadline = time.perf_counter() + 0.01
+    scheduler.wait_until(deadline)
+    assert len(calls) == 1
+    assert calls[0] < deadline
+
+    # while it fits in the slack, it is not run outside of the waits
+    scheduler.run_idle_tasks()
+    assert len(calls) == 1
+
+    # a task that took longer than the slack of a wait is not run in it,
+    # but outside of the waits instead
+    scheduler._idle_tasks[0].duration = 1
+    scheduler.wait(0.01)
+    assert len(calls) == 1
+
+    scheduler.run_idle_tasks()
+    assert len(calls) == 2
+
+
+def test_late_wait_warns(caplog):
+    scheduler = Scheduler()
+    scheduler.wait_until(time.perf_counter() - 0.1)
+    assert 'negative delay' in caplog.text
+    assert scheduler.timing_stats()['max_lateness'] >= 0.1
+
+
+@pytest.mark.parametrize('delay', [0, 0.005])
+def test_loop_timing(delay):
+    p = Parameter('p', set_cmd=None, get_cmd=None)
+    bg_calls = []
+    loop = Loop(p.sweep(0, 1, num=5), delay=delay).each(p).with_bg_task(
+        lambda: bg_calls.append(1), min_delay=0)
+    data = loop.run(location=False, quiet=True, station=False,
+                    record_timing=True)
+
+    timing = data.metadata['loop']['timing']
+    # the first delay of a loop is only waited for if it is not nested
+    n_waits = 5 if delay else 0
+    assert timing['waits'] == n_waits
+    assert len(timing['intended']) == n_waits
+    assert np.all(timing['actual'] >= timing['intended'])
+    # run in the slack of every delay, or between the points, and once
+    # at the end
+    assert len(bg_calls) == 6
+
+
+def test_loop_period():
+    p = Parameter('p', set_cmd=None, get_cmd=None)
+    period = 0.005
+    # every point takes some time, which does not shift the next points
+    loop = Loop(p.sweep(0, 1, num=6), period=period).each(
+        p, Task(time.sleep, 0.002))
+    data = loop.run(location=False, quiet=True, station=False,
+                    record_timing=True)
+
+    timing = data.metadata['loop']['timing']
+    assert data.metadata['loop']['period'] == period
+    # the first point is set at the start of the loop
+    assert timing['waits'] == 5
+    assert np.allclose(np.diff(timing['intended']), period)
+    assert np.all(timing['actual'] >= timing['intended'])
+
+
+def test_loop_period_must_be_positive():
+    p = Parameter('p', set_cmd=None, get_cmd=None)
+    with pytest.raises(ValueError):
+        Loop(p.sweep(0, 1, num=2), period=0)
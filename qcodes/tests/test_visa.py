@@ -1,7 +1,9 @@
+import threading
 from unittest import TestCase
 from unittest.mock import patch
+import numpy as np
 import visa
-from qcodes.instrument.visa import VisaInstrument
+from qcodes.instrument.visa import VisaInstrument, binary_block_header
 from qcodes.utils.validators import Numbers
 import warnings
 
@@ -69,6 +71,131 @@ class MockVisaHandle:
         return self.state
 
 
+class BinaryVisaHandle(MockVisaHandle):
+    """
+    mock the raw API of a visa handle: the messages written with write_raw
+    are stored, and the bytes of ``response`` are read out by read_bytes
+    and read_raw
+    """
+    def __init__(self):
+        super().__init__()
+        self.written = []
+        self.response = b''
+        self.read_sizes = []
+
+        # called on every read, e.g. to check who may talk to the
+        # instrument meanwhile
+        self.on_read = None
+
+    def write(self, cmd):
+        self.written.append(cmd.encode())
+        return len(cmd), 0
+
+    def write_raw(self, message):
+        self.written.append(bytes(message))
+
+    def read_bytes(self, count):
+        if self.on_read is not None:
+            self.on_read()
+        self.read_sizes.append(count)
+        data, self.response = self.response[:count], self.response[count:]
+        return data
+
+    def read_raw(self):
+        data, _, self.response = self.response.partition(b'\n')
+        return data + b'\n'
+
+
+class MockBinaryVisa(VisaInstrument):
+    def set_address(self, address):
+        self.visa_handle = BinaryVisaHandle()
+
+
+class TestBinaryBlocks(TestCase):
+    def setUp(self):
+        self.instr = MockBinaryVisa('binary', terminator='\n')
+        self.handle = self.instr.visa_handle
+
+    def tearDown(self):
+        self.instr.close()
+
+    def test_header(self):
+        self.assertEqual(binary_block_header(0), b'#10')
+        self.assertEqual(binary_block_header(12), b'#212')
+        self.assertEqual(binary_block_header(123456), b'#6123456')
+
+    def test_write(self):
+        data = np.arange(4, dtype='<u2')
+        self.instr.write_binary_block('WAV:DATA "a",', data)
+        self.assertEqual(self.handle.written,
+                         [b'WAV:DATA "a",#18' + data.tobytes()])
+        self.assertIsNotNone(self.instr.binary_block_throughput)
+
+    def test_read(self):
+        data = np.linspace(0, 1, 100, dtype='<f4')
+        self.handle.response = b'#3400' + data.tobytes() + b'\nnext\n'
+        values = self.instr.read_binary_block(chunk_size=64)
+        np.testing.assert_array_equal(values, data)
+        # the data is read in chunks, and the termination is read as well
+        self.assertEqual(self.handle.read_sizes, [2, 3] + [64] * 6 + [16])
+        self.assertEqual(self.handle.response, b'next\n')
+
+    def test_read_into_preallocated_array(self):
+        out = np.zeros(6, dtype='>i4')
+        first = np.array([1, 2, 3], dtype='>i4').tobytes()
+        second = np.array([4, 5], dtype='>i4').tobytes()
+        self.handle.response = (b'#212' + first + b'#18' + second)
+
+        values = self.instr.read_binary_block('>i4', out=out[:3],
+                                              expect_termination=False)
+        self.assertTrue(np.shares_memory(values, out))
+        self.instr.read_binary_block('>i4', out=out[3:],
+                                     expect_termination=False)
+        np.testing.assert_array_equal(out, [1, 2, 3, 4, 5, 0])
+
+    def test_query_locks_the_instrument(self):
+        data = np.arange(3, dtype='<f4')
+        self.handle.response = b'#212' + data.tobytes()
+
+        # whether another thread can take the lock of the instrument
+        # during each read of the block
+        lock_free = []
+
+        def try_lock():
+            def acquire():
+                free = self.instr._io_lock.acquire(blocking=False)
+                if free:
+                    self.instr._io_lock.release()
+                lock_free.append(free)
+            thread = threading.Thread(target=acquire)
+            thread.start()
+            thread.join()
+
+        self.handle.on_read = try_lock
+        values = self.instr.query_binary_block('CURV?',
+                                               expect_termination=False)
+        np.testing.assert_array_equal(values, data)
+        self.assertEqual(self.handle.written, [b'CURV?'])
+        self.assertEqual(lock_free, [False] * 3)
+
+    def test_read_errors(self):
+        for response in (b'1.0,2.0\n', b'#0' + bytes(8) + b'\n'):
+            self.handle.response = response
+            with self.assertRaises(ValueError):
+                self.instr.read_binary_block()
+
+        # 6 bytes are not a whole number of float32 values
+        self.handle.response = b'#16' + bytes(6) + b'\n'
+        with self.assertRaises(ValueError):
+            self.instr.read_binary_block('<f4')
+
+        for out in (np.empty(1, '<f4'), np.empty(2, '<f8'),
+                    np.empty(4, '<f4')[::2]):
+            self.handle.response = b'#18' + bytes(8) + b'\n'
+            with self.assertRaises(ValueError):
+                self.instr.read_binary_block('<f4', out=out)
+
+
 class TestVisaInstrument(TestCase):
     # error args for set(-10)
     args1 = [
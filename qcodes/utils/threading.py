@@ -2,8 +2,16 @@
 # we want to happen simultaneously within one process (namely getting
 # several parameters in parallel), we can parallelize them with threads.
 # That way the things we call need not be rewritten explicitly async.
+# Parameters do have ``async_get`` and ``async_set`` coroutines, which run
+# the regular ``get`` and ``set`` in the worker thread of their instrument,
+# and ``get_concurrently`` gathers them from synchronous code.
 
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
 import threading
+import time
+
+import qcodes
 
 
 class RespondingThread(threading.Thread):
@@ -48,27 +56,165 @@ class RespondingThread(threading.Thread):
         return self._output
 
 
-def thread_map(callables, args=None, kwargs=None):
+def thread_map(callables, args=None, kwargs=None, instruments=None,
+               timing_hook=None):
     '''
-    Evaluate a sequence of callables in separate threads, returning
+    Evaluate a sequence of callables in worker threads, returning
     a list of their return values.
 
+    The threads are not started for every call, but live on between calls.
+    A callable that talks to an instrument runs in the worker thread of that
+    instrument (see ``Instrument.executor``), after any other callables of
+    the same instrument. All other callables run in a pool of threads that
+    is shared by all calls, with ``config['core']['thread_pool_size']``
+    threads (read when the pool is first used). As with separate threads,
+    if a callable raises, the exception is raised here when its value is
+    collected.
+
+    Callables in the shared pool should not call ``thread_map`` themselves
+    and wait for it, since the pool may have no threads left to run the
+    inner callables.
+
     Args:
         callables: a sequence of callables
         args (optional): a sequence of sequences containing the positional
             arguments for each callable
         kwargs (optional): a sequence of dicts containing the keyword arguments
             for each callable
+        instruments (optional): a sequence with the instrument that each
+            callable talks to, or None. Defaults to the root instrument of
+            a callable that is a parameter, the ``get`` or ``set`` of a
+            parameter, or a bound method of an instrument or parameter.
+        timing_hook (optional): a function that is called with every
+            callable and the time in seconds that it ran, in the calling
+            thread as the values are collected
 
     '''
     if args is None:
         args = ((),) * len(callables)
     if kwargs is None:
         kwargs = ({},) * len(callables)
-    threads = [RespondingThread(target=c, args=a, kwargs=k)
-               for c, a, k in zip(callables, args, kwargs)]
+    if instruments is None:
+        instruments = [_instrument_of(c) for c in callables]
+
+    futures = []
+    for c, a, k, instrument in zip(callables, args, kwargs, instruments):
+        executor = getattr(instrument, 'executor', None) or _shared_pool()
+        futures.append(executor.submit(_timed_call, c, a, k))
+
+    outputs = []
+    for c, future in zip(callables, futures):
+        output, duration = future.result()
+        if timing_hook is not None:
+            timing_hook(c, duration)
+        outputs.append(output)
+    return outputs
+
+
+def _instrument_of(callable_):
+    """The root instrument that a callable talks to, or None."""
+    for owner in (callable_,
+                  getattr(callable_, 'parameter', None),
+                  getattr(callable_, '__self__', None)):
+        instrument = getattr(owner, 'root_instrument', None)
+        if instrument is not None:
+            return instrument
+    return None
+
+
+def _timed_call(callable_, args, kwargs):
+    """Call a callable, and return its output and how long it ran."""
+    t_start = time.perf_counter()
+    output = callable_(*args, **kwargs)
+    return output, time.perf_counter() - t_start
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def _shared_pool():
+    """The pool of threads of thread_map, started on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(
+                max_workers=qcodes.config['core']['thread_pool_size'],
+                thread_name_prefix='qcodes_thread_map')
+    return _pool
+
+
+class _EventLoopThread(threading.Thread):
+    """
+    A daemon thread running an asyncio event loop forever, to run
+    coroutines from synchronous code. The loop has its own thread so that
+    this also works while another event loop is running in the calling
+    thread, as in a Jupyter notebook.
+    """
+    def __init__(self):
+        super().__init__(name='qcodes_event_loop', daemon=True)
+        self.loop = asyncio.new_event_loop()
 
-    for t in threads:
-        t.start()
+    def run(self):
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+
+    def run_coroutine(self, coroutine):
+        return asyncio.run_coroutine_threadsafe(coroutine, self.loop).result()
+
+
+_event_loop_thread = None
+_event_loop_thread_lock = threading.Lock()
+
+
+def run_coroutine(coroutine):
+    """
+    Run a coroutine to completion in the qcodes event loop, which is
+    started on first use, and return its result.
+
+    Raises:
+        RuntimeError: if called from within the qcodes event loop, e.g.
+            from a coroutine run by ``run_coroutine``, where waiting for
+            the coroutine would block the loop that has to run it. Await
+            the coroutine instead.
+    """
+    global _event_loop_thread
+    if threading.current_thread() is _event_loop_thread:
+        coroutine.close()
+        raise RuntimeError('run_coroutine can not be called from within '
+                           'the qcodes event loop, await the coroutine '
+                           'instead')
+    with _event_loop_thread_lock:
+        if _event_loop_thread is None:
+            _event_loop_thread = _EventLoopThread()
+            _event_loop_thread.start()
+    return _event_loop_thread.run_coroutine(coroutine)
+
+
+def get_concurrently(parameters, timeout=None):
+    '''
+    Get a sequence of parameters concurrently, returning a list of their
+    values.
+
+    Every parameter is read with its ``async_get``, so the parameters of
+    different instruments are read at the same time while the parameters
+    of one instrument are read one after the other by the worker thread of
+    the instrument.
+
+    Args:
+        parameters: a sequence of parameters
+        timeout (optional): the time in seconds to wait for all values. When
+            it runs out, the gets that have not started yet are cancelled.
+            A get that is already talking to its instrument is not
+            interrupted, it completes in the background.
+
+    Raises:
+        asyncio.TimeoutError: if not all values arrive within the timeout
+        RuntimeError: if called from within the qcodes event loop. Gather
+            the ``async_get`` of the parameters there instead.
+    '''
+    async def gather():
+        gets = asyncio.gather(*(p.async_get() for p in parameters))
+        return await asyncio.wait_for(gets, timeout)
 
-    return [t.output() for t in threads]
+    return run_coroutine(gather())
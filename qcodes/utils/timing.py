@@ -0,0 +1,237 @@
+"""
+Waiting until points in time with sub-millisecond precision.
+
+``time.sleep`` can oversleep by the timer slack of the operating system,
+from tens of microseconds to (on Windows) more than ten milliseconds, and
+every relative sleep adds its own error to the timing of a measurement.
+Here every wait is for an absolute deadline on the ``time.perf_counter``
+clock instead: most of the wait is slept, and the last ``spin_time`` seconds
+are spent polling the clock, so the wait ends right at the deadline.
+"""
+from array import array
+import logging
+import math
+import sys
+import time
+
+import numpy as np
+
+log = logging.getLogger(__name__)
+
+# the final part of a wait, in seconds, that is spent polling the clock
+# rather than sleeping. The timer resolution of Windows is 15.6 ms.
+spin_time = 0.016 if sys.platform == 'win32' else 0.002
+
+
+def sleep_until(deadline, spin=None):
+    """
+    Wait until ``time.perf_counter()`` reaches deadline, by sleeping and
+    then polling the clock for the final ``spin`` seconds.
+
+    Args:
+        deadline (float): the ``time.perf_counter()`` time to wait for
+        spin (Optional[float]): the number of seconds to poll the clock
+            for. Default ``spin_time``.
+    """
+    if spin is None:
+        spin = spin_time
+    perf_counter = time.perf_counter
+    remaining = deadline - perf_counter()
+    if remaining > spin:
+        time.sleep(remaining - spin)
+    while perf_counter() < deadline:
+        pass
+
+
+def sleep(delay):
+    """
+    Sleep for ``delay`` seconds with ``time.sleep``, unless the delay is
+    shorter than ``spin_time``: then the oversleep of ``time.sleep`` would
+    be a large part of the delay, and the clock is polled instead. Unlike
+    ``sleep_until``, a long delay does not end by holding the GIL for
+    ``spin_time``, which suits delays that are waited for in many places
+    at once, like those of parameters.
+
+    Args:
+        delay (float): the number of seconds to sleep
+    """
+    if delay >= spin_time:
+        time.sleep(delay)
+    elif delay > 0:
+        sleep_until(time.perf_counter() + delay, spin=delay)
+
+
+class _IdleTask:
+    """
+    A task to be run by a ``Scheduler`` in the slack time of its waits,
+    at most once every ``min_interval`` seconds.
+    """
+    def __init__(self, func, min_interval):
+        self.func = func
+        self.min_interval = min_interval
+        self.last_run = time.perf_counter()
+        # how long the task took the last time, to know if it fits in a wait
+        self.duration = 0
+        # whether the task fitted in the slack time of the latest wait that
+        # it was due in
+        self.fits_in_slack = False
+
+    def is_due(self, now):
+        return now - self.last_run >= self.min_interval
+
+    def __call__(self):
+        t0 = time.perf_counter()
+        try:
+            self.func()
+        finally:
+            self.last_run = time.perf_counter()
+            self.duration = self.last_run - t0
+
+
+class Scheduler:
+    """
+    Times the waits of a measurement against absolute deadlines on the
+    ``time.perf_counter`` clock, and keeps statistics of how late the waits
+    ended. If ``record`` is True, it also records when each wait was
+    intended to end and when it actually ended, in seconds since the
+    ``epoch`` of the scheduler.
+
+    Tasks added with ``add_idle_task`` run in the slack time of the waits,
+    as long as a wait leaves enough time to run them before its deadline.
+
+    Args:
+        spin (Optional[float]): the number of seconds to poll the clock
+            for at the end of each wait. Default ``spin_time``.
+        record (bool): record the intended and actual end of every wait.
+            Default False, then the memory used does not grow with the
+            number of waits.
+    """
+    def __init__(self, spin=None, record=False):
+        self.spin = spin_time if spin is None else spin
+        self.epoch = time.perf_counter()
+        self.record = record
+        self._intended = array('d')
+        self._actual = array('d')
+        # running statistics of the lateness of the waits
+        self._n_waits = 0
+        self._mean_lateness = 0.0
+        self._m2_lateness = 0.0
+        self._max_lateness = -float('inf')
+        self._idle_tasks = []
+
+    def add_idle_task(self, func, min_interval=0):
+        """
+        Run a task in the slack time of the waits of this scheduler.
+
+        Args:
+            func (callable): the task, taking no arguments
+            min_interval (float): the minimal number of seconds between the
+                starts of two runs of the task
+        """
+        self._idle_tasks.append(_IdleTask(func, min_interval))
+
+    def run_idle_tasks(self, deadline=None):
+        """
+        Run the idle tasks that are due, and that can finish before
+        ``deadline`` as far as the duration of their previous run tells.
+
+        Without a deadline, e.g. between the points of a measurement, only
+        the tasks that are due and that did not fit in the slack time of
+        the latest wait are run, so tasks do not starve if the waits are
+        too short for them, or if there are no waits at all.
+
+        Args:
+            deadline (Optional[float]): the ``time.perf_counter()`` time the
+                tasks must finish by, or None to run the tasks outside of
+                a wait.
+        """
+        for task in self._idle_tasks:
+            now = time.perf_counter()
+            if not task.is_due(now):
+                continue
+            if deadline is None:
+                if task.fits_in_slack:
+                    continue
+            else:
+                task.fits_in_slack = now + task.duration <= deadline
+                if not task.fits_in_slack:
+                    continue
+            task()
+
+    def wait_until(self, deadline):
+        """
+        Run the idle tasks that fit before the deadline, and wait until
+        ``time.perf_counter()`` reaches it.
+
+        Args:
+            deadline (float): the ``time.perf_counter()`` time to wait for
+        """
+        late = time.perf_counter() - deadline
+        if late > 0:
+            log.warning('negative delay {:.6f} sec'.format(-late))
+        elif self._idle_tasks:
+            self.run_idle_tasks(deadline - self.spin)
+        sleep_until(deadline, self.spin)
+        end = time.perf_counter()
+        self._add_lateness(end - deadline)
+        if self.record:
+            self._intended.append(deadline - self.epoch)
+            self._actual.append(end - self.epoch)
+
+    def _add_lateness(self, lateness):
+        # Welford's algorithm, so no lateness has to be kept
+        self._n_waits += 1
+        delta = lateness - self._mean_lateness
+        self._mean_lateness += delta / self._n_waits
+        self._m2_lateness += delta * (lateness - self._mean_lateness)
+        self._max_lateness = max(self._max_lateness, lateness)
+
+    def wait(self, delay, start=None):
+        """
+        Wait until ``delay`` seconds after ``start``.
+
+        Args:
+            delay (float): the number of seconds to wait
+            start (Optional[float]): the ``time.perf_counter()`` time the
+                delay counts from. Default now.
+        """
+        if start is None:
+            start = time.perf_counter()
+        self.wait_until(start + delay)
+
+    @property
+    def intended(self):
+        """
+        The intended end of every recorded wait, in seconds since the epoch.
+        """
+        return np.frombuffer(self._intended, dtype=float).copy()
+
+    @property
+    def actual(self):
+        """
+        The actual end of every recorded wait, in seconds since the epoch.
+        """
+        return np.frombuffer(self._actual, dtype=float).copy()
+
+    def timing_stats(self, per_wait=False):
+        """
+        The statistics of how late the waits ended.
+
+        Args:
+            per_wait (bool): include the intended and actual end of every
+                recorded wait, as numpy arrays.
+
+        Returns:
+            dict: the number of waits, and the mean, standard deviation and
+                maximum of their lateness in seconds.
+        """
+        stats = {'waits': self._n_waits}
+        if self._n_waits:
+            stats.update({'mean_lateness': self._mean_lateness,
+                          'std_lateness': math.sqrt(self._m2_lateness
+                                                    / self._n_waits),
+                          'max_lateness': self._max_lateness})
+        if per_wait:
+            stats['intended'] = self.intended
+            stats['actual'] = self.actual
+        return stats